@@ -4,7 +4,7 @@ import xml.etree.ElementTree as ET
 from os.path import isfile, join
 
 import mobros.utils.logger as logging
-from mobros.constants import CATKIN_BLACKLIST_FILES
+from mobros.constants import CATKIN_BLACKLIST_FILES, CATKIN_DEPENDENCY_TYPES
 from mobros.utils import utilitary
 
 
@@ -23,37 +23,86 @@ def is_catkin_blacklisted(path):
     return False
 
 
+def read_package_manifest(package_path):
+    """Function that parses a package.xml into what mobros needs of it, so each manifest is parsed only once
+
+    Args:
+        package_path (str): Path to the package.xml file
+
+    Returns:
+        dict: package manifest, with the catkin package name and its dependencies as (catkin name, attributes)
+    """
+    root = ET.parse(package_path).getroot()
+    dependencies = []
+    for dependency_type in CATKIN_DEPENDENCY_TYPES:
+        for child in root.findall(dependency_type):
+            dependencies.append(((child.text).strip(), dict(child.attrib)))
+
+    return {"path": package_path, "name": root.findall("name")[0].text, "dependencies": dependencies}
+
+
+def build_catkin_package_task(package_to_build):
+    """Builds a catkin package from its manifest. Meant to be executed by the workers, so exits are returned instead.
+
+    Args:
+        package_to_build (tuple): package manifest, the catkin packages of the workspace and the rosdep translations
+
+    Returns:
+        tuple: True and the CatkinPackage if successfull. False and the exit code otherwise.
+    """
+    manifest, workspace_pkg_list, translations = package_to_build
+    try:
+        return True, CatkinPackage(manifest["path"], workspace_pkg_list, translations, manifest)
+    except SystemExit as e:
+        return False, e.code
+
+
 class CatkinPackage:
     """Class that represents a catkin package and its dependencies"""
 
-    def __init__(self, package_path, workspace_pkg_list=None):
+    def __init__(self, package_path, workspace_pkg_list=None, translations=None, manifest=None):
+        """Constructor
 
+        Args:
+            package_path (str): Path to the package.xml file
+            workspace_pkg_list (list, optional): catkin packages of the workspace, which are not dependencies to
+                install. Defaults to None.
+            translations (dict, optional): catkin package name to its debian package names, already translated by
+                rosdep. The names missing from it are translated one by one. Defaults to None.
+            manifest (dict, optional): package manifest already read from package_path. Defaults to None.
+        """
         if workspace_pkg_list is None:
             workspace_pkg_list = []
+        if manifest is None:
+            manifest = read_package_manifest(package_path)
 
+        self.translations = translations or {}
         self.build_dependencies = {}
+        self.package_name = manifest["name"]
 
-        tree = ET.parse(package_path)
-        root = tree.getroot()
-        self.package_name = root.findall("name")[0].text
-
-        self._find_dependencies("build_depend", self.build_dependencies, root, workspace_pkg_list)
-        self._find_dependencies("depend", self.build_dependencies, root, workspace_pkg_list)
-        self._find_dependencies("test_depend", self.build_dependencies, root, workspace_pkg_list)
+        self._find_dependencies(manifest["dependencies"], self.build_dependencies, workspace_pkg_list)
 
     @staticmethod
-    def extract_name(package_path):
-        """method to extract the package name from the package.xml file
+    def get_dependency_names(manifest, workspace_pkg_list=None):
+        """method to get the catkin names of the dependencies of a package manifest, to be translated by rosdep all
+        at once
 
         Args:
-            package_path (str): Path to the package.xml file
+            manifest (dict): package manifest
+            workspace_pkg_list (list, optional): catkin packages of the workspace, which are left out.
+                Defaults to None.
 
         Returns:
-            str: Catkin package name
+            list: catkin names of the dependencies
         """
-        tree = ET.parse(package_path)
-        root = tree.getroot()
-        return root.findall("name")[0].text
+        if workspace_pkg_list is None:
+            workspace_pkg_list = []
+
+        dependency_names = []
+        for dependency_name, _ in manifest["dependencies"]:
+            if dependency_name not in workspace_pkg_list and dependency_name not in dependency_names:
+                dependency_names.append(dependency_name)
+        return dependency_names
 
     def get_dependencies(self):
         """Getter function to retrieve the package dependencies. Both depend and build_depend elements.
@@ -71,34 +120,37 @@ class CatkinPackage:
         """
         return self.package_name
 
-    def _find_dependencies(self, dependency_type, dependency_object, xml_root, blacklist):
-        """Function that finds the dependencies of a catkin package by type (depend or build_depend)
+    def _find_dependencies(self, manifest_dependencies, dependency_object, blacklist):
+        """Function that translates the dependencies of a catkin package (depend, build_depend and test_depend)
 
         Args:
-            dependency_type (str): Either 'depend' or 'build_depend' element type
-            dependency_object (xml_obj): xml dependency element
-            xml_root (xml_obj): package xml root element
+            manifest_dependencies (list): (catkin name, attributes) of the dependencies in the package manifest
+            dependency_object (dict): Dictionary to store dependencies
+            blacklist (list): catkin packages that are not dependencies to install
         """
-        for child in xml_root.findall(dependency_type):
-            dependency_name = (child.text).strip()
+        for dependency_name, attributes in manifest_dependencies:
             if dependency_name in blacklist:
                 continue
 
-            deb_names = utilitary.translate_package_name(dependency_name)
-            self._process_deb_names(deb_names, dependency_object, child)
+            if dependency_name in self.translations:
+                deb_names = self.translations[dependency_name]
+            else:
+                deb_names = utilitary.translate_package_name(dependency_name)
+            self._process_deb_names(deb_names, dependency_object, dependency_name, attributes)
 
-    def _process_deb_names(self, deb_names, dependency_object, child):
+    def _process_deb_names(self, deb_names, dependency_object, dependency_name, attributes):
         """Helper function to process debian package names
 
         Args:
             deb_names (list): List of debian package names
             dependency_object (dict): Dictionary to store dependencies
-            child (xml_obj): XML element representing the dependency
+            dependency_name (str): catkin name of the dependency
+            attributes (dict): version attributes of the dependency
         """
         for deb_name in deb_names:
             logging.debug(
                 "[Dependency_Manager - check_colisions] Dependency: "
-                + child.text.strip()
+                + dependency_name
                 + " has been translated to "
                 + deb_name
             )
@@ -106,20 +158,20 @@ class CatkinPackage:
             if deb_name not in dependency_object:
                 dependency_object[deb_name] = []
 
-            self._add_dependency(deb_name, dependency_object, child)
+            self._add_dependency(deb_name, dependency_object, attributes)
 
-    def _add_dependency(self, deb_name, dependency_object, child):
+    def _add_dependency(self, deb_name, dependency_object, attributes):
         """Helper function to add a dependency to the dependency object
 
         Args:
             deb_name (str): Debian package name
             dependency_object (dict): Dictionary to store dependencies
-            child (xml_obj): XML element representing the dependency
+            attributes (dict): version attributes of the dependency
         """
-        if child.attrib:
-            for key in child.attrib:
+        if attributes:
+            for key in attributes:
                 dependency_operator = key
-                dependency_version = child.attrib[key]
+                dependency_version = attributes[key]
 
                 dependency_object[deb_name].append(
                     {
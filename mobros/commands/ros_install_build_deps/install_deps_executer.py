@@ -6,13 +6,55 @@ from os import getcwd
 import mobros.utils.logger as logging
 from mobros.commands.ros_install_build_deps.catkin_package import (
     CatkinPackage,
-    is_catkin_blacklisted,
+    build_catkin_package_task,
+)
+from mobros.commands.ros_install_build_deps.workspace_index import (
+    get_workspace_index_path,
+    read_workspace_manifests,
 )
 from mobros.commands.ros_install_runtime_deps.install_deps_executer import (
     InstallRuntimeDependsExecuter,
 )
+from mobros.constants import DEFAULT_ROSDEP_UPDATE_MAX_AGE, RosdepUpdateMode
 from mobros.dependency_manager.dependency_manager import DependencyManager
-from mobros.utils import apt_utils
+from mobros.types.mobros_global_data import GlobalData
+from mobros.utils import apt_utils, utilitary
+from mobros.utils.rosdep_cache import is_rosdep_update_required
+
+
+def scan_workspace(workspace, index_path=None):
+    """Finds the catkin packages of a workspace and their dependencies. Each package.xml is parsed once, and both the
+    parsing and the building of the packages run in the worker pool. The rosdep keys of the whole workspace are
+    translated with a single rosdep call in between.
+
+    Args:
+        workspace (str): path of the ros workspace
+        index_path (str, optional): path of the workspace index file, to only parse the package.xml files that
+            changed since the last run. Defaults to None.
+
+    Returns:
+        list: CatkinPackage of each package of the workspace, sorted by the path of its package.xml
+    """
+    workspace_packages = {}
+    for manifest in read_workspace_manifests(workspace, index_path):
+        workspace_packages[manifest["name"]] = manifest
+    workspace_pkg_list = set(workspace_packages)
+
+    dependency_names = []
+    for manifest in workspace_packages.values():
+        dependency_names.extend(CatkinPackage.get_dependency_names(manifest, workspace_pkg_list))
+    translations = utilitary.translate_package_names(dependency_names)
+
+    packages = []
+    builds = utilitary.parrallel_execute_function(
+        build_catkin_package_task,
+        [(manifest, workspace_pkg_list, translations) for manifest in workspace_packages.values()],
+    )
+    for success, result in builds:
+        if not success:
+            sys.exit(result)
+        packages.append(result)
+    return packages
 
 
 class InstallBuildDependsExecuter:
@@ -36,22 +78,20 @@ class InstallBuildDependsExecuter:
             )
             sys.exit(1)
 
-        apt_utils.execute_shell_command(
-            ["rosdep", "update"], stop_on_error=True, log_output=True
-        )
-        workspace = args.workspace
-        workspace_packages = {}
-        for path, _, files in os.walk(workspace):
-            for name in files:
-                if name == "package.xml":
-                    if not is_catkin_blacklisted(path):
-
-                        #dependency_manager.register_package(package)
-                        package_path = os.path.join(path, name)
-                        workspace_packages[CatkinPackage.extract_name(package_path)] = package_path
-
-        for _, package_path in workspace_packages.items():
-            package = CatkinPackage(package_path, workspace_packages.keys())
+        rosdep_update_mode = RosdepUpdateMode(getattr(args, "rosdep_update", RosdepUpdateMode.AUTO.value))
+        rosdep_update_max_age = getattr(args, "rosdep_update_max_age", DEFAULT_ROSDEP_UPDATE_MAX_AGE)
+        if is_rosdep_update_required(rosdep_update_mode, rosdep_update_max_age):
+            apt_utils.execute_shell_command(
+                ["rosdep", "update"], stop_on_error=True, log_output=True
+            )
+        GlobalData().set_rosdep_translation_cache(True)
+        jobs = getattr(args, "jobs", None)
+        if jobs is not None and jobs < 1:
+            logging.error("--jobs must be at least 1.")
+            sys.exit(1)
+        GlobalData().set_worker_jobs(jobs)
+
+        for package in scan_workspace(args.workspace, get_workspace_index_path(args.workspace)):
             dependency_manager.register_package(package)
 
         dependency_manager.check_colisions()
@@ -70,7 +110,7 @@ class InstallBuildDependsExecuter:
             sys.exit(0)
 
         argparse_args = argparse.Namespace(
-            y=True, pkg_list=pkgs_to_install, upgrade_installed=True
+            y=True, pkg_list=pkgs_to_install, upgrade_installed=True, jobs=getattr(args, "jobs", None)
         )
 
         executer = InstallRuntimeDependsExecuter()
@@ -95,6 +135,34 @@ class InstallBuildDependsExecuter:
             help="Simulate the list of buildt dependencies that would be installed.",
             required=False,
         )
+        parser.add_argument(
+            "--jobs",
+            "-j",
+            required=False,
+            type=int,
+            default=None,
+            dest="jobs",
+            help="Number of worker processes used to resolve the dependencies. Defaults to the cpus available to mobros.",
+        )
+        parser.add_argument(
+            "--rosdep-update",
+            required=False,
+            choices=[mode.value for mode in RosdepUpdateMode],
+            default=RosdepUpdateMode.AUTO.value,
+            dest="rosdep_update",
+            help="When to update the rosdep sources. 'auto' only updates them if they are older than "
+            + "--rosdep-update-max-age.",
+        )
+        parser.add_argument(
+            "--rosdep-update-max-age",
+            required=False,
+            type=int,
+            default=DEFAULT_ROSDEP_UPDATE_MAX_AGE,
+            dest="rosdep_update_max_age",
+            help="Maximum age, in minutes, of the rosdep sources before 'auto' updates them. Defaults to "
+            + str(DEFAULT_ROSDEP_UPDATE_MAX_AGE)
+            + ".",
+        )
         parser.add_argument("--workspace", help="Ros workspace to scan the build dependencies from from. By default its where you execute mobros.", required=False, default=getcwd())
         return parser.parse_known_args()
 
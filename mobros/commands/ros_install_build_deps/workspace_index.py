@@ -0,0 +1,172 @@
+"""Module to find the catkin package manifests of a ros workspace, and to keep an index of them between runs, not to
+parse again the package.xml files that did not change"""
+import hashlib
+import json
+from os import path, stat, walk
+
+import mobros.utils.logger as logging
+from mobros.commands.ros_install_build_deps.catkin_package import is_catkin_blacklisted, read_package_manifest
+from mobros.constants import (
+    CATKIN_MANIFEST_FILE,
+    MOBROS_CACHE_PATH,
+    WORKSPACE_IGNORED_DIRS,
+    WORKSPACE_INDEX_PREFIX,
+    WORKSPACE_INDEX_SUFFIX,
+)
+from mobros.utils import utilitary
+from mobros.utils.cache_file import load_cache_file, write_cache_file
+
+WORKSPACE_INDEX_VERSION = 1
+WORKSPACE_INDEX_LOG_PREFIX = "[Workspace index]"
+
+
+def find_package_manifests(workspace):
+    """Finds the package.xml files of a workspace. The folders with a catkin blacklist file and the hidden ones are
+    pruned from the walk, instead of walked and discarded. So are the build, devel and install spaces, but only at the
+    root of the workspace, like catkin and colcon do.
+
+    Args:
+        workspace (str): path of the ros workspace
+
+    Returns:
+        list: paths of the package.xml files, sorted
+    """
+    manifest_paths = []
+    for folder, folders, files in walk(workspace):
+        if is_catkin_blacklisted(folder):
+            folders[:] = []
+            continue
+
+        ignored_folders = WORKSPACE_IGNORED_DIRS if folder == workspace else []
+        folders[:] = [name for name in folders if not name.startswith(".") and name not in ignored_folders]
+        if CATKIN_MANIFEST_FILE in files:
+            manifest_paths.append(path.join(folder, CATKIN_MANIFEST_FILE))
+
+    return sorted(manifest_paths)
+
+
+def get_workspace_index_path(workspace):
+    """Get the path where the manifest index of a workspace is stored
+
+    Args:
+        workspace (str): path of the ros workspace
+
+    Returns:
+        str: full path of the workspace index file
+    """
+    workspace_hash = hashlib.sha1(path.realpath(workspace).encode()).hexdigest()
+    return path.join(MOBROS_CACHE_PATH, WORKSPACE_INDEX_PREFIX + workspace_hash + WORKSPACE_INDEX_SUFFIX)
+
+
+def load_workspace_index(index_path):
+    """Loads the manifest index stored by a previous run
+
+    Args:
+        index_path (str): path of the workspace index file
+
+    Returns:
+        dict: package.xml path to its size, modification time and manifest. Empty if nothing valid is stored.
+    """
+    index = load_cache_file(index_path, _read_workspace_index, WORKSPACE_INDEX_LOG_PREFIX, "workspace index")
+    if index is None:
+        return {}
+
+    # malformed entries are left out, so their package.xml is parsed again
+    return {
+        manifest_path: entry for manifest_path, entry in index["manifests"].items() if is_valid_index_entry(entry)
+    }
+
+
+def _read_workspace_index(index_path):
+    """Reads a stored workspace index
+
+    Args:
+        index_path (str): path of the workspace index file
+
+    Returns:
+        dict: the version of the index and its manifests
+
+    Raises:
+        ValueError: if the file is not a workspace index of this version
+    """
+    with open(index_path, encoding="utf-8") as index_file:
+        index = json.load(index_file)
+    if not isinstance(index, dict) or index.get("version") != WORKSPACE_INDEX_VERSION:
+        raise ValueError("Not a workspace index")
+    if not isinstance(index.get("manifests"), dict):
+        raise ValueError("Workspace index without manifests")
+    return index
+
+
+def is_valid_index_entry(entry):
+    """Checks if an entry of a stored workspace index has everything a rescan reads from it
+
+    Args:
+        entry (dict): size, modification time and manifest of a package.xml
+
+    Returns:
+        bool: True if the entry is valid. False otherwise.
+    """
+    if not isinstance(entry, dict) or not isinstance(entry.get("manifest"), dict):
+        return False
+    return all(key in entry for key in ("size", "mtime")) and all(
+        key in entry["manifest"] for key in ("path", "name", "dependencies")
+    )
+
+
+def store_workspace_index(index_path, manifests):
+    """Stores the manifest index for the next runs
+
+    Args:
+        index_path (str): path of the workspace index file
+        manifests (dict): package.xml path to its size, modification time and manifest
+    """
+    write_cache_file(
+        index_path,
+        lambda index_file: json.dump({"version": WORKSPACE_INDEX_VERSION, "manifests": manifests}, index_file),
+        WORKSPACE_INDEX_LOG_PREFIX,
+        "workspace index",
+    )
+
+
+def read_workspace_manifests(workspace, index_path=None):
+    """Reads the manifests of the catkin packages of a workspace. With an index, only the package.xml files whose
+    size or modification time changed since the last run are parsed, in the worker pool, and the index is updated.
+
+    Args:
+        workspace (str): path of the ros workspace
+        index_path (str, optional): path of the workspace index file. Defaults to None, to parse every package.xml.
+
+    Returns:
+        list: package manifest of each package.xml, sorted by its path
+    """
+    manifest_paths = find_package_manifests(workspace)
+    stored_manifests = load_workspace_index(index_path) if index_path else {}
+
+    manifests = {}
+    changed_paths = []
+    for manifest_path in manifest_paths:
+        manifest_stat = stat(manifest_path)
+        entry = stored_manifests.get(manifest_path)
+        if entry and entry["size"] == manifest_stat.st_size and entry["mtime"] == manifest_stat.st_mtime_ns:
+            manifests[manifest_path] = entry
+        else:
+            manifests[manifest_path] = {"size": manifest_stat.st_size, "mtime": manifest_stat.st_mtime_ns}
+            changed_paths.append(manifest_path)
+
+    for manifest_path, manifest in zip(
+        changed_paths, utilitary.parrallel_execute_function(read_package_manifest, changed_paths)
+    ):
+        manifests[manifest_path]["manifest"] = manifest
+
+    logging.debug(
+        "[Workspace index] Found "
+        + str(len(manifest_paths))
+        + " package.xml files, "
+        + str(len(changed_paths))
+        + " of them parsed"
+    )
+    if index_path and (changed_paths or len(manifests) != len(stored_manifests)):
+        store_workspace_index(index_path, manifests)
+
+    return [manifests[manifest_path]["manifest"] for manifest_path in manifest_paths]
@@ -1,13 +1,63 @@
 """Module that contains an implementation of the dependency manager package for debian"""
 from os import path
 import sys
+from mobros.types.candidate_cache import CandidateCache
 from mobros.utils import apt_utils
 from mobros.utils import logger as logging
+from mobros.utils import utilitary
+
+
+def inspect_package_task(package_to_inspect):
+    """Inspects the dependencies of a package. Meant to be executed by the workers, so exits are returned instead.
+
+    Args:
+        package_to_inspect (tuple): package name, version and the upgrade installed option
+
+    Returns:
+        tuple: True and the dependencies of the package if successfull. False and the exit code otherwise. Then the
+            candidate cache hits and misses of the inspection, for the caller to count them.
+    """
+    name, version, upgrade_installed = package_to_inspect
+    candidate_cache = CandidateCache()
+    statistics_before = candidate_cache.get_statistics()
+    try:
+        return True, apt_utils.inspect_package(name, version, upgrade_installed), candidate_cache.take_statistics(
+            statistics_before
+        )
+    except SystemExit as e:
+        return False, e.code, candidate_cache.take_statistics(statistics_before)
+
+
+def inspect_packages(packages_to_inspect, upgrade_installed):
+    """Inspects a wave of packages concurrently, with the workers reading the package index loaded before they forked.
+
+    Args:
+        packages_to_inspect (list): list of (name, version) of the packages
+        upgrade_installed (boolean): upgrade installed option
+
+    Returns:
+        list: DebianPackage of each package, in the same order
+    """
+    packages = [DebianPackage(name, version, upgrade_installed, inspect=False) for name, version in packages_to_inspect]
+    inspections = utilitary.parrallel_execute_function(
+        inspect_package_task,
+        [(package.name, package.package_version, upgrade_installed) for package in packages],
+    )
+
+    for _, _, cache_statistics in inspections:
+        CandidateCache().add_statistics(*cache_statistics)
+
+    for package, (success, result, _) in zip(packages, inspections):
+        if not success:
+            sys.exit(result)
+        package.build_dependencies.update(result)
+    return packages
+
 
 class DebianPackage:
     """Class that inspects and holds the debian package info and dependencies"""
 
-    def __init__(self, name, version, upgrade_installed):
+    def __init__(self, name, version, upgrade_installed, inspect=True):
         self.build_dependencies = {}
         self.name = name
         if apt_utils.is_package_local_file(name):
@@ -22,7 +72,8 @@ class DebianPackage:
 
         self.package_version = version
         self.upgrade_installed = upgrade_installed
-        self._find_dependencies()
+        if inspect:
+            self._find_dependencies()
 
     def get_dependencies(self):
         """Getter function to retrieve the package dependencies..
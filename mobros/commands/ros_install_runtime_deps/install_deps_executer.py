@@ -5,10 +5,9 @@ import queue
 import sys
 import time
 
-from anytree import LevelOrderGroupIter
-
 import mobros.utils.logger as logging
-from mobros.commands.ros_install_runtime_deps.debian_package import DebianPackage
+from mobros.commands.ros_install_runtime_deps.debian_package import inspect_packages
+from mobros.dependency_manager.backtrack_solver import solve_dependency_tree
 from mobros.dependency_manager.dependency_manager import DependencyManager
 from mobros.utils import apt_utils
 from mobros.utils.utilitary import write_to_file, deep_copy_object
@@ -17,12 +16,23 @@ from mobros.commands.ros_install_runtime_deps.install_list_handler import (
 )
 from mobros.types.mobros_global_data import GlobalData
 from mobros.types.apt_cache_singleton import AptCache
+from mobros.types.candidate_cache import CandidateCache
+from mobros.types.worker_pool import WorkerPool
 from mobros.exceptions import AptCacheInitializationException
-from mobros.constants import Commands
+from mobros.constants import (
+    Commands,
+    AptUpdateMode,
+    PackageIndexBackend,
+    SolverMode,
+    DEFAULT_APT_LOCK_TIMEOUT,
+    DEFAULT_APT_UPDATE_MAX_AGE,
+    DEFAULT_SOLVER_TIME_BUDGET,
+)
 
 
 def check_if_requested_packages_are_in_desired_state(install_pkgs):
-    """Quick check if the requested packages are already in the desired state
+    """Quick check if the requested packages are already in the desired state. It only relies on the installed state,
+    so it does not require the apt cache to be loaded.
 
     Args:
         install_pkgs (str []): array of string with package and version seperated by '=' just like in apt.
@@ -47,26 +57,30 @@ def check_if_requested_packages_are_in_desired_state(install_pkgs):
 
             return False
 
-        if not apt_utils.is_virtual_package(name):
-            if not apt_utils.is_package_already_installed(name, version):
-                return False
-        else:
-            logging.warning(
-                "Package: "
-                + name
-                + " is a virtual package. Do not input virtual packages! Skipping!"
-            )
+        if apt_utils.is_package_already_installed(name, version):
+            continue
+
+        if not apt_utils.is_provided_by_installed_package(name):
+            return False
+
+        logging.warning(
+            "Package: "
+            + name
+            + " is a virtual package. Do not input virtual packages! Skipping!"
+        )
 
     return True
 
 
-def register_dependency_tree_roots(install_pkgs, dependency_manager, upgrade_installed):
-    """Register the user requested packages as roots of the tree
+def register_user_packages(install_pkgs, dependency_manager):
+    """Register the user requested packages in the dependency manager, without inspecting them
 
     Args:
         install_pkgs (str []): array of string with package and version seperated by '=' just like in apt.
         dependency_manager (DependencyManager): Dependency manager instance to used through out the process.
-        upgrade_installed (boolean): true if should upgrade all the installed packages the tree touches.
+
+    Returns:
+        dict: user requested package names, as inputed, and their versions
     """
     user_requested_packages = {}
     g_data = GlobalData()
@@ -93,8 +107,19 @@ def register_dependency_tree_roots(install_pkgs, dependency_manager, upgrade_ins
                 + " is a virtual package. Do not input virtual packages! Skipping!"
             )
 
-    for pkg_name, pkg_version in user_requested_packages.items():
-        package = DebianPackage(pkg_name, pkg_version, upgrade_installed)
+    return user_requested_packages
+
+
+def register_dependency_tree_roots(install_pkgs, dependency_manager, upgrade_installed):
+    """Register the user requested packages as roots of the tree
+
+    Args:
+        install_pkgs (str []): array of string with package and version seperated by '=' just like in apt.
+        dependency_manager (DependencyManager): Dependency manager instance to used through out the process.
+        upgrade_installed (boolean): true if should upgrade all the installed packages the tree touches.
+    """
+    user_requested_packages = register_user_packages(install_pkgs, dependency_manager)
+    for package in inspect_packages(user_requested_packages.items(), upgrade_installed):
         dependency_manager.register_package(package, upgrade_installed)
 
 
@@ -105,48 +130,45 @@ def fill_and_calculate_dependency_tree(dependency_manager, upgrade_installed):
         dependency_manager (DependencyManager): Dependency manager instance to used through out the process.
         upgrade_installed (boolean): true if should upgrade all the installed packages the tree touches.
     """
-    first_tree_level = True
+    resolution_round = 0
     packages_uninspected = []
-    known_packages = {}
 
-    while len(packages_uninspected) > 0 or first_tree_level:
-        if first_tree_level:
-            first_tree_level = False
+    while resolution_round == 0 or len(packages_uninspected) > 0:
+        resolution_round += 1
 
-        else:
+        wave = []
+        for package_to_inspect in packages_uninspected:
+            if not apt_utils.is_virtual_package(package_to_inspect["name"]):
+                if not dependency_manager.is_local_package(
+                    package_to_inspect["name"] + "=" + package_to_inspect["version"]
+                ):
+                    wave.append((package_to_inspect["name"], package_to_inspect["version"]))
 
-            for package_to_inspect in packages_uninspected:
-                if not apt_utils.is_virtual_package(package_to_inspect["name"]):
-                    if not dependency_manager.is_local_package(
-                        package_to_inspect["name"] + "=" + package_to_inspect["version"]
-                    ):
-                        package = DebianPackage(
-                            package_to_inspect["name"],
-                            package_to_inspect["version"],
-                            upgrade_installed,
-                        )
-                        dependency_manager.register_package(package, upgrade_installed)
-
-                else:
-                    logging.debug(
-                        "Package: "
-                        + package_to_inspect["name"]
-                        + " is a virtual package. Skipping"
-                    )
+            else:
+                logging.debug(
+                    "Package: "
+                    + package_to_inspect["name"]
+                    + " is a virtual package. Skipping"
+                )
+
+        # inspected concurrently, but registered in the order of the candidates
+        for package in inspect_packages(wave, upgrade_installed):
+            dependency_manager.register_package(package, upgrade_installed)
 
         dependency_manager.check_colisions()
         dependency_manager.calculate_installs()
-        install_list = dependency_manager.get_install_list()
-
-        packages_uninspected = []
 
-        for candidate in install_list:
-            if (
-                candidate["name"] not in known_packages
-                or candidate["version"] != known_packages[candidate["name"]]
-            ):
-                known_packages[candidate["name"]] = candidate["version"]
-                packages_uninspected.append(candidate)
+        # only the candidates whose version changed since they were inspected have new dependencies to register
+        inspected_count = len(packages_uninspected)
+        packages_uninspected = dependency_manager.pop_changed_candidates()
+        statistics = dependency_manager.pop_round_statistics()
+        logging.debug(
+            "[Resolution round " + str(resolution_round) + "] inspected: " + str(inspected_count)
+            + ", colision checks: " + str(statistics["colision_checks"])
+            + ", candidates calculated: " + str(statistics["candidates_calculated"])
+            + ", skipped as unchanged: " + str(statistics["evaluations_skipped"])
+            + ", candidates changed: " + str(len(packages_uninspected))
+        )
 
 
 def fill_install_queue(dependency_manager, known_packages, clean_requested_pkgs):
@@ -162,17 +184,17 @@ def fill_install_queue(dependency_manager, known_packages, clean_requested_pkgs)
     """
     install_queue = queue.PriorityQueue()
     tree_level_id = 0
-    for tree_level in LevelOrderGroupIter(dependency_manager.root):
+    for tree_level in dependency_manager.dependency_graph.level_order():
         tree_level_id += 1
-        for elem in tree_level:
+        for deb_name in tree_level:
 
-            if elem.name not in known_packages:
-                if dependency_manager.has_candidate_calculated(elem.name):
+            if deb_name not in known_packages:
+                if dependency_manager.has_candidate_calculated(deb_name):
                     curr_id = tree_level_id
-                    if elem.name in clean_requested_pkgs:
-                        curr_id += clean_requested_pkgs.index(elem.name) * 0.1
-                    install_queue.put((curr_id, elem.name))
-                    known_packages[elem.name] = None
+                    if deb_name in clean_requested_pkgs:
+                        curr_id += clean_requested_pkgs.index(deb_name) * 0.1
+                    install_queue.put((curr_id, deb_name))
+                    known_packages[deb_name] = None
     return install_queue
 
 
@@ -278,17 +300,12 @@ def calculate_install_order(dependency_manager, upgrade_installed, request_pkg_o
         clean_requested_pkgs.append(package_name)
         ordered_requested_pkgs.put(package_name)
 
-        for dep_name, version_rules in dependency_manager.dependency_bank.items():
-            if (
-                dep_name == package_name
-                and len(version_rules) == 1
-                and version_rules[0]["from"] == "user"
+        version_rules = dependency_manager.dependency_bank.get(package_name, [])
+        if len(version_rules) == 1 and version_rules[0]["from"] == "user":
+            if not dependency_manager.check_if_any_depends_on(
+                package_name, version
             ):
-                if not dependency_manager.check_if_any_depends_on(
-                    package_name, version
-                ):
-                    independent_requested_pkgs.append(package_name)
-                    break
+                independent_requested_pkgs.append(package_name)
 
     list_handler = InstallListHandler(upgrade_installed, dependency_manager)
 
@@ -350,17 +367,28 @@ class InstallRuntimeDependsExecuter:
             logging.userInfo("No packages mentioned. Nothing todo.")
             sys.exit(0)
 
-        try:
-            AptCache()
-        except AptCacheInitializationException:
-            if not args.fail_on_apt_update:
-                input_val = input(
-                    "You want to proceed with your outdated cache? (y/n): "
-                )
-                if input_val.lower() not in ["y", "yes"]:
-                    sys.exit(1)
-            else:
-                sys.exit(1)
+        GlobalData().set_apt_update_policy(
+            AptUpdateMode(getattr(args, "apt_update", AptUpdateMode.AUTO.value)),
+            getattr(args, "update_max_age", DEFAULT_APT_UPDATE_MAX_AGE),
+        )
+        GlobalData().set_apt_lock_timeout(getattr(args, "lock_timeout", DEFAULT_APT_LOCK_TIMEOUT))
+        index_backend = PackageIndexBackend(getattr(args, "index_backend", PackageIndexBackend.APT.value))
+        if index_backend == PackageIndexBackend.FIXTURE and not getattr(args, "index_fixture", None):
+            logging.error("The fixture package index backend requires --index-fixture.")
+            sys.exit(1)
+        GlobalData().set_package_index_backend(index_backend, getattr(args, "index_fixture", None))
+        jobs = getattr(args, "jobs", None)
+        if jobs is not None and jobs < 1:
+            logging.error("--jobs must be at least 1.")
+            sys.exit(1)
+        GlobalData().set_worker_jobs(jobs)
+        solver_time_budget = getattr(args, "solver_time_budget", DEFAULT_SOLVER_TIME_BUDGET)
+        if solver_time_budget < 1:
+            logging.error("--solver-time-budget must be at least 1 second.")
+            sys.exit(1)
+        GlobalData().set_solver(
+            SolverMode(getattr(args, "solver", SolverMode.HEURISTIC.value)), solver_time_budget
+        )
 
         if check_if_requested_packages_are_in_desired_state(install_pkgs):
             logging.userInfo(
@@ -368,6 +396,23 @@ class InstallRuntimeDependsExecuter:
             )
             sys.exit(0)
 
+        try:
+            AptCache()
+        except AptCacheInitializationException as e:
+            logging.warning(e.message)
+            if not getattr(args, "fail_on_apt_update", False):
+                if not args.y:
+                    input_val = input(
+                        "You want to proceed with your outdated cache? (y/n): "
+                    )
+                    if input_val.lower() not in ["y", "yes"]:
+                        sys.exit(1)
+            else:
+                sys.exit(1)
+
+        # built before the workers fork, so they all share it instead of building their own
+        apt_utils.index_installed_reverse_dependencies()
+
         dependency_manager = DependencyManager()
 
         # pkgs_skipped={}
@@ -425,11 +470,25 @@ class InstallRuntimeDependsExecuter:
 
         # sys.exit(1)
 
-        register_dependency_tree_roots(
-            install_pkgs, dependency_manager, args.upgrade_installed
-        )
+        WorkerPool().start()
+        try:
+            solver_mode, solver_time_budget = GlobalData().get_solver()
+            if solver_mode == SolverMode.BACKTRACK:
+                register_user_packages(install_pkgs, dependency_manager)
+                solve_dependency_tree(dependency_manager, args.upgrade_installed, solver_time_budget)
+            else:
+                register_dependency_tree_roots(
+                    install_pkgs, dependency_manager, args.upgrade_installed
+                )
 
-        fill_and_calculate_dependency_tree(dependency_manager, args.upgrade_installed)
+                fill_and_calculate_dependency_tree(dependency_manager, args.upgrade_installed)
+        finally:
+            WorkerPool().stop()
+
+        candidate_hits, candidate_misses = CandidateCache().get_statistics()
+        logging.debug(
+            "[Candidate cache] hits: " + str(candidate_hits) + ", misses: " + str(candidate_misses)
+        )
 
         dependency_manager.render_tree()
         start1 = time.time()
@@ -515,6 +574,88 @@ class InstallRuntimeDependsExecuter:
             action="store_true",
             help="Ensure mobros uses an updated apt cache. If it fails, it will exit with error.",
         )
+        parser.add_argument(
+            "--update",
+            required=False,
+            choices=[mode.value for mode in AptUpdateMode],
+            default=AptUpdateMode.AUTO.value,
+            dest="apt_update",
+            help="When to update the apt cache. 'auto' only updates it if the apt lists are older than --update-max-age.",
+        )
+        parser.add_argument(
+            "--no-update",
+            required=False,
+            action="store_const",
+            const=AptUpdateMode.NEVER.value,
+            dest="apt_update",
+            help="Use the current apt cache without updating it. Same as --update=never.",
+        )
+        parser.add_argument(
+            "--update-max-age",
+            required=False,
+            type=int,
+            default=DEFAULT_APT_UPDATE_MAX_AGE,
+            dest="update_max_age",
+            help="Maximum age, in minutes, of the apt lists before 'auto' updates them. Defaults to "
+            + str(DEFAULT_APT_UPDATE_MAX_AGE)
+            + ".",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            required=False,
+            type=int,
+            default=DEFAULT_APT_LOCK_TIMEOUT,
+            dest="lock_timeout",
+            help="Maximum time, in seconds, to wait for other apt processes and retry failed apt updates. Defaults to "
+            + str(DEFAULT_APT_LOCK_TIMEOUT)
+            + ".",
+        )
+        parser.add_argument(
+            "--index-backend",
+            required=False,
+            choices=[backend.value for backend in PackageIndexBackend],
+            default=PackageIndexBackend.APT.value,
+            dest="index_backend",
+            help="Where the package index is read from. 'apt' uses python-apt, 'packages' parses the apt lists and the dpkg status, "
+            + "'fixture' reads a recorded package universe from --index-fixture.",
+        )
+        parser.add_argument(
+            "--index-fixture",
+            required=False,
+            type=str,
+            default=None,
+            dest="index_fixture",
+            help="Json file with the package universe used by --index-backend=fixture.",
+        )
+        parser.add_argument(
+            "--jobs",
+            "-j",
+            required=False,
+            type=int,
+            default=None,
+            dest="jobs",
+            help="Number of worker processes used to resolve the dependencies. Defaults to the cpus available to mobros, "
+            + "taking in consideration the container cpu quota.",
+        )
+        parser.add_argument(
+            "--solver",
+            required=False,
+            choices=[mode.value for mode in SolverMode],
+            default=SolverMode.HEURISTIC.value,
+            dest="solver",
+            help="How the versions are resolved. 'heuristic' calculates a candidate per package and solves known conflicts, "
+            + "'backtrack' searches the candidate versions for an assignment that fulfills all the dependency rules.",
+        )
+        parser.add_argument(
+            "--solver-time-budget",
+            required=False,
+            type=int,
+            default=DEFAULT_SOLVER_TIME_BUDGET,
+            dest="solver_time_budget",
+            help="Maximum time, in seconds, the backtrack solver searches for a solution. Defaults to "
+            + str(DEFAULT_SOLVER_TIME_BUDGET)
+            + ".",
+        )
         return [parser.parse_args(), None]
 
     @staticmethod
@@ -29,6 +29,18 @@ TEST_RESOURCE_SHELL_SCRIPT = "test.bash"
 SUPPORTED_BUILD_MODES = ["DEBUG", "RELEASE"]
 
 CATKIN_BLACKLIST_FILES = ["AMENT_IGNORE", "CATKIN_IGNORE", "COLCON_IGNORE"]
+CATKIN_DEPENDENCY_TYPES = ["build_depend", "depend", "test_depend"]
+CATKIN_MANIFEST_FILE = "package.xml"
+WORKSPACE_IGNORED_DIRS = [
+    "build",
+    "build_isolated",
+    "devel",
+    "devel_isolated",
+    "install",
+    "install_isolated",
+    "log",
+    "logs",
+]
 
 OPERATION_TRANSLATION_TABLE = {
     "<": "version_lt",
@@ -57,6 +69,71 @@ class Commands(Enum):
     RAISE = "raise"
     PING = "ping"
 
+class AptUpdateMode(Enum):
+    """Apt update policy modes enumerate"""
+    AUTO = "auto"
+    ALWAYS = "always"
+    NEVER = "never"
+
+class RosdepUpdateMode(Enum):
+    """Rosdep update policy modes enumerate"""
+    AUTO = "auto"
+    ALWAYS = "always"
+    NEVER = "never"
+
+class PackageIndexBackend(Enum):
+    """Package index backends enumerate"""
+    APT = "apt"
+    PACKAGES = "packages"
+    FIXTURE = "fixture"
+
+class SolverMode(Enum):
+    """Install conflict resolution modes enumerate"""
+    HEURISTIC = "heuristic"
+    BACKTRACK = "backtrack"
+
+DEFAULT_APT_UPDATE_MAX_AGE = 30
+DEFAULT_ROSDEP_UPDATE_MAX_AGE = 1440
+DEFAULT_APT_LOCK_TIMEOUT = 300
+APT_UPDATE_MAX_ATTEMPTS = 5
+CANDIDATE_CACHE_MAX_SIZE = 8192
+APT_UPDATE_BACKOFF_BASE = 2
+APT_LOCK_POLL_MIN_INTERVAL = 0.02
+APT_LOCK_POLL_MAX_INTERVAL = 0.25
+PARALLEL_MIN_BATCH_SIZE = 16
+PARALLEL_CHUNKS_PER_WORKER = 4
+DEFAULT_SOLVER_TIME_BUDGET = 120
+SOLVER_MAX_LEARNED_CONFLICTS = 10000
+
 MOBROS_CONFIG_PATH = "/etc/mobros/config"
 MOBROS_CONFIG_SECTION = "conflict-solving"
 MOBROS_CONFIG_BLACKLIST_KEY = "blacklistSource"
+MOBROS_CONFIG_APT_UPDATE_SECTION = "apt-update"
+MOBROS_CONFIG_APT_UPDATE_SOURCES_KEY = "sources"
+
+APT_LISTS_PATH = "/var/lib/apt/lists"
+APT_LISTS_LOCK_PATH = "/var/lib/apt/lists/lock"
+APT_SOURCES_LIST_PATH = "/etc/apt/sources.list"
+APT_SOURCES_PARTS_PATH = "/etc/apt/sources.list.d"
+APT_PREFERENCES_PATH = "/etc/apt/preferences"
+APT_PREFERENCES_PARTS_PATH = "/etc/apt/preferences.d"
+DPKG_STATUS_PATH = "/var/lib/dpkg/status"
+DPKG_ARCH_PATH = "/var/lib/dpkg/arch"
+MOBROS_CACHE_PATH = "/var/cache/mobros"
+APT_SNAPSHOT_PREFIX = "apt-index-"
+APT_SNAPSHOT_SUFFIX = ".snapshot"
+APT_UPDATE_STAMP_FILE = "apt-update.stamp"
+ROSDEP_CACHE_PREFIX = "rosdep-translations-"
+ROSDEP_CACHE_SUFFIX = ".json"
+WORKSPACE_INDEX_PREFIX = "workspace-index-"
+WORKSPACE_INDEX_SUFFIX = ".json"
+ROSDEP_SOURCES_LIST_PATH = "/etc/ros/rosdep/sources.list.d"
+ROSDEP_SOURCES_CACHE_DIR = "rosdep/sources.cache"
+OS_RELEASE_PATH = "/etc/os-release"
+APT_RELEASE_FILE_SUFFIXES = ("_Release", "_InRelease")
+APT_PACKAGES_FILE_SUFFIX = "_Packages"
+# compressions of the Packages lists kept by apt with Acquire::GzipIndexes
+APT_PACKAGES_COMPRESSION_SUFFIXES = (".gz", ".xz", ".lzma", ".bz2", ".lz4")
+CGROUP_V2_CPU_MAX_PATH = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA_PATH = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD_PATH = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
@@ -0,0 +1,363 @@
+"""Module with the backtracking version solver. Instead of calculating a candidate per package and solving the conflicts
+afterwards, it searches the versions of the packages for an assignment that fulfills all the version rules."""
+import sys
+import time
+
+import mobros.utils.logger as logging
+from mobros.commands.ros_install_runtime_deps.debian_package import inspect_package_task
+from mobros.constants import SOLVER_MAX_LEARNED_CONFLICTS
+from mobros.exceptions import InstallCandidateNotFoundException, SolverTimeoutException
+from mobros.types.candidate_cache import CandidateCache
+from mobros.types.version_interval import VersionInterval
+from mobros.utils import apt_utils, version_utils
+
+
+class SolverFrame:
+    """Decision of the search: the package being assigned, the versions left to try and the conflicts found so far"""
+
+    def __init__(self, name, domain):
+        """Constructor
+
+        Args:
+            name (str): package name
+            domain (list): candidate versions, in the order they are tried
+        """
+        self.name = name
+        self.domain = domain
+        self.next_index = 0
+        self.version = None
+        self.dependencies = []
+        self.conflict = set()
+
+
+# pylint: disable=R0902
+class BacktrackSolver:
+    """Version solver that searches the candidate versions of the packages depth first.
+
+    The domain of a package is its candidate list from find_candidate_online, filtered by the rules of the packages
+    assigned so far. The package with the fewest candidates is assigned next, newest version first, and the rules of
+    its dependencies are checked right away (forward checking). When a package runs out of candidates, the search
+    jumps back to the latest package responsible for its rules (conflict directed backjumping), and the combination of
+    versions responsible is learned, so it is never tried again.
+    """
+
+    def __init__(self, upgrade_installed, time_budget, fixed_versions=None, package_sources=None):
+        """Constructor
+
+        Args:
+            upgrade_installed (bool): upgrade installed option. If not set, installed versions are preferred and the
+                versions that break installed packages are discarded.
+            time_budget (int): maximum time, in seconds, of the search
+            fixed_versions (dict, optional): packages whose version is already decided, like the local debs.
+                Defaults to None.
+            package_sources (dict, optional): package name to what is inspected instead of it, like the local deb
+                path. Defaults to None.
+        """
+        self.upgrade_installed = upgrade_installed
+        self.time_budget = time_budget
+        self.fixed_versions = fixed_versions or {}
+        self.package_sources = package_sources or {}
+        self.deadline = None
+
+        self.assignment = {}
+        self.rules = {}
+        self.inspected = {}
+        self.nogoods = {}
+        self.last_conflict = None
+        self.statistics = {"decisions": 0, "backjumps": 0, "learned_conflicts": 0}
+
+    def solve(self, requirements):
+        """Searches for a version of each required package, and of their dependencies, fulfilling all the rules
+
+        Args:
+            requirements (dict): package name to the version rules requested for it
+
+        Raises:
+            SolverTimeoutException: if the time budget is exceeded
+
+        Returns:
+            bool: True if a solution was found, kept in the assignment. False otherwise.
+        """
+        self.deadline = time.monotonic() + self.time_budget
+        for name, version_rules in requirements.items():
+            self.rules.setdefault(name, {})[None] = list(version_rules)
+
+        frames = []
+        assigning = False
+        while True:
+            if time.monotonic() > self.deadline:
+                raise SolverTimeoutException(
+                    "The backtrack solver did not find a solution within its time budget of "
+                    + str(self.time_budget)
+                    + " seconds."
+                )
+
+            if assigning:
+                failure = self._assign_next_version(frames[-1])
+                if failure is None:
+                    assigning = False
+                    continue
+            else:
+                frame, failure = self._select()
+                if frame is None and failure is None:
+                    return True
+                if frame is not None:
+                    frames.append(frame)
+                    assigning = True
+                    continue
+
+            if self._backjump(frames, failure) is not None:
+                return False
+            assigning = True
+
+    def get_dependencies(self, name, version):
+        """Get the dependencies of an inspected package version
+
+        Args:
+            name (str): package name
+            version (str): package version
+
+        Returns:
+            dict: dependency name to its version rules
+        """
+        return self.inspected.get((name, version)) or {}
+
+    def _select(self):
+        """Selects the unassigned package with the fewest candidates
+
+        Returns:
+            tuple: frame of the package selected, and the packages responsible if a package has no candidates.
+                Both None if every required package is assigned.
+        """
+        selected = None
+        for name in self.rules:
+            if name in self.assignment:
+                continue
+            domain = self._get_domain(name)
+            if not domain:
+                self.last_conflict = name
+                return None, self._get_origins(name)
+            if selected is None or len(domain) < len(selected.domain):
+                selected = SolverFrame(name, domain)
+        return selected, None
+
+    def _assign_next_version(self, frame):
+        """Assigns the next version of a frame that does not repeat a learned conflict and whose dependencies have
+        candidates.
+
+        Returns:
+            set: packages responsible if no version is left. None if a version was assigned.
+        """
+        while frame.next_index < len(frame.domain):
+            version = frame.domain[frame.next_index]
+            frame.next_index += 1
+
+            learned_conflict = self._find_learned_conflict(frame.name, version)
+            if learned_conflict is not None:
+                frame.conflict |= learned_conflict
+                continue
+
+            dependencies = self._inspect(frame.name, version)
+            if dependencies is None:
+                continue
+
+            self.statistics["decisions"] += 1
+            self.assignment[frame.name] = version
+            frame.version = version
+            for dep_name, version_rules in dependencies.items():
+                if version_rules:
+                    self.rules.setdefault(dep_name, {})[frame.name] = version_rules
+                    frame.dependencies.append(dep_name)
+
+            failure = self._check_dependencies(frame)
+            if failure is None:
+                return None
+
+            self._learn(failure)
+            frame.conflict |= failure
+            self._unassign(frame)
+
+        return (frame.conflict | self._get_origins(frame.name)) - {frame.name}
+
+    def _check_dependencies(self, frame):
+        """Checks the dependencies of the version just assigned still have candidates
+
+        Returns:
+            set: packages responsible if a dependency has no candidates. None otherwise.
+        """
+        for dep_name in frame.dependencies:
+            if dep_name in self.assignment:
+                if self.assignment[dep_name] not in self._get_domain(dep_name):
+                    self.last_conflict = dep_name
+                    return self._get_origins(dep_name) | {dep_name}
+            elif not self._get_domain(dep_name):
+                self.last_conflict = dep_name
+                return self._get_origins(dep_name)
+        return None
+
+    def _backjump(self, frames, failure):
+        """Undoes the decisions up to the latest package responsible for the failure, skipping the ones that are not
+
+        Returns:
+            set: the failure if no package responsible is left to try another version. None otherwise.
+        """
+        while frames:
+            frame = frames[-1]
+            if frame.name in failure:
+                self._learn(failure)
+                self._unassign(frame)
+                frame.conflict |= failure
+                return None
+            self.statistics["backjumps"] += 1
+            self._unassign(frame)
+            frames.pop()
+        return failure
+
+    def _unassign(self, frame):
+        """Removes the version of a frame from the assignment, with the rules it introduced"""
+        if frame.version is None:
+            return
+        for dep_name in frame.dependencies:
+            del self.rules[dep_name][frame.name]
+            if not self.rules[dep_name]:
+                del self.rules[dep_name]
+        frame.dependencies = []
+        frame.version = None
+        del self.assignment[frame.name]
+
+    def _learn(self, failure):
+        """Learns that the current versions of the packages responsible for a failure do not work together"""
+        if not failure or self.statistics["learned_conflicts"] >= SOLVER_MAX_LEARNED_CONFLICTS:
+            return
+        nogood = frozenset((name, self.assignment[name]) for name in failure)
+        for decision in nogood:
+            self.nogoods.setdefault(decision, []).append(nogood)
+        self.statistics["learned_conflicts"] += 1
+
+    def _find_learned_conflict(self, name, version):
+        """Finds a learned conflict that the version would complete with the current assignment
+
+        Returns:
+            set: the other packages of the conflict. None if there is no such conflict.
+        """
+        for nogood in self.nogoods.get((name, version), ()):
+            others = nogood - {(name, version)}
+            if all(self.assignment.get(other_name) == other_version for other_name, other_version in others):
+                return {other_name for other_name, _ in others}
+        return None
+
+    def _get_origins(self, name):
+        """Get the assigned packages that introduced rules of a package"""
+        return {origin for origin in self.rules.get(name, {}) if origin is not None}
+
+    def _get_domain(self, name):
+        """Get the candidate versions of a package that fulfill its current rules, in the order they are tried.
+
+        Returns:
+            list: candidate versions. Empty if none fulfills the rules.
+        """
+        version_rules = [rule for rules in self.rules.get(name, {}).values() for rule in rules]
+        if name in self.fixed_versions:
+            version = self.fixed_versions[name]
+            return [version] if VersionInterval(version_rules).allows(version) else []
+
+        try:
+            candidates = apt_utils.find_candidate_online(name, version_rules)
+        except InstallCandidateNotFoundException:
+            return []
+
+        if not self.upgrade_installed:
+            installed_version = apt_utils.get_package_installed_version(name)
+            if installed_version in candidates:
+                candidates.remove(installed_version)
+                candidates.insert(0, installed_version)
+        return candidates
+
+    def _inspect(self, name, version):
+        """Get the dependencies of a package version, once.
+
+        Returns:
+            dict: dependency name to its version rules. None if the version can not be installed.
+        """
+        if (name, version) not in self.inspected:
+            dependencies = None
+            source = self.package_sources.get(name, name)
+            success, result, cache_statistics = inspect_package_task((source, version, self.upgrade_installed))
+            CandidateCache().add_statistics(*cache_statistics)
+            if success and not self._impacts_installed(name, version):
+                dependencies = dict(result or {})
+            self.inspected[(name, version)] = dependencies
+        return self.inspected[(name, version)]
+
+    def _impacts_installed(self, name, version):
+        """Checks if installing a version breaks an installed package, which is only allowed when upgrading them"""
+        if self.upgrade_installed or name in self.fixed_versions:
+            return False
+        return apt_utils.package_impacts_installed_dependencies((name, {"version": version})) is not None
+
+    def describe_conflict(self):
+        """Describes the last package found without candidates
+
+        Returns:
+            str: the package and its version rules. Empty if there was no such package.
+        """
+        if self.last_conflict is None:
+            return ""
+        version_rules = [rule for rules in self.rules.get(self.last_conflict, {}).values() for rule in rules]
+        return version_utils.pretify_version_conflicts(self.last_conflict, version_rules)
+
+
+def solve_dependency_tree(dependency_manager, upgrade_installed, time_budget):
+    """Solves the versions of the user requested packages and of their dependencies with the backtrack solver, and
+    registers the solution in the dependency manager as its tree and install candidates.
+
+    Args:
+        dependency_manager (DependencyManager): Dependency manager instance with the user requested packages registered
+        upgrade_installed (boolean): true if should upgrade all the installed packages the tree touches.
+        time_budget (int): maximum time, in seconds, of the search
+    """
+    dependency_bank = dependency_manager.dependency_bank
+    requirements = {
+        name: [rule for rule in dependency_bank[name] if rule["from"] == "user"]
+        for name in dependency_bank.get_packages_from("user")
+    }
+    fixed_versions = {name: candidate["version"] for name, candidate in dependency_manager.install_candidates.items()}
+    package_sources = {
+        name_version.split("=")[0]: file_path for name_version, file_path in dependency_manager.local_packages.items()
+    }
+
+    solver = BacktrackSolver(upgrade_installed, time_budget, fixed_versions, package_sources)
+    try:
+        solved = solver.solve(requirements)
+    except SolverTimeoutException as e:
+        logging.error(e.message)
+        sys.exit(1)
+
+    logging.debug(
+        "[Backtrack solver] decisions: " + str(solver.statistics["decisions"])
+        + ", backjumps: " + str(solver.statistics["backjumps"])
+        + ", learned conflicts: " + str(solver.statistics["learned_conflicts"])
+    )
+    if not solved:
+        logging.error("The backtrack solver found no versions that fulfill all the dependency rules.")
+        if solver.describe_conflict():
+            logging.error(solver.describe_conflict())
+        sys.exit(1)
+
+    for deb_name, version in solver.assignment.items():
+        for dep_name, version_rules in solver.get_dependencies(deb_name, version).items():
+            dependency_manager.register_tree_node(deb_name, dep_name)
+            if dep_name not in dependency_bank:
+                dependency_bank[dep_name] = []
+            dependency_bank.add_rules(dep_name, version_rules)
+
+        if deb_name not in dependency_manager.install_candidates:
+            dependency_manager.set_candidate(deb_name, {
+                "name": deb_name,
+                "version": version,
+                "calculation_base": "calculated",
+                "spotOn": True,
+            })
+
+    dependency_manager.possible_colision.clear()
+    dependency_manager.possible_install_candidate_compromised.clear()
@@ -176,11 +176,7 @@ def attempt_conflicts_solving(conflicts_list, dependency_bank, blacklist):
                     else:
                         rule_to_blacklist = version_utils.get_rule_based_on_from(dependency_bank[conflict["name"]], "Installed")
 
-                        dependency_bank[
-                            conflict["name"]
-                        ] = version_utils.remove_rule_based_on_from(
-                            dependency_bank[conflict["name"]], "Installed"
-                        )
+                        dependency_bank.remove_rules_from(conflict["name"], "Installed")
 
                     solved = True
                     if conflict["name"] not in blacklist:
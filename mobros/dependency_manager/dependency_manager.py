@@ -2,16 +2,15 @@
 import sys
 import time
 
-from anytree import DoubleStyle, Node, RenderTree
-from pydpkg import Dpkg
+from anytree import DoubleStyle, RenderTree
 
 from mobros.commands.ros_install_build_deps.catkin_package import CatkinPackage
 from mobros.constants import OPERATION_TRANSLATION_TABLE
 from mobros.dependency_manager import conflict_solver
-from mobros.exceptions import (
-    ColisionDetectedException,
-    InstallCandidateNotFoundException,
-)
+from mobros.exceptions import InstallCandidateNotFoundException
+from mobros.types.candidate_cache import CandidateCache
+from mobros.types.dependency_bank import DependencyBank
+from mobros.types.dependency_graph import DependencyGraph
 from mobros.types.intternal_package import PackageInterface
 from mobros.utils import apt_utils
 from mobros.utils import logger as logging
@@ -19,308 +18,28 @@ from mobros.utils import tree_utils, utilitary, version_utils
 
 UNIDENTIFIED = "undentified"
 INDIRECT_INVOLVEMENT = "stuff"
+ROUND_STATISTICS = ("colision_checks", "candidates_calculated", "evaluations_skipped")
 
 
-def check_for_colisions(deb_name, version_rules):
-    """Function that checks if the version rules list does not collide with eachother
-
-    Args:
-        deb_name (str): debian package name
-        version_rules (list): list of all version rules from the workspace
-    """
-    check_for_multi_equals(version_rules, deb_name)
-    check_if_equals_violates_edges(version_rules, deb_name)
-    check_if_edges_violate_eachother(version_rules, deb_name)
-
-
-def check_for_multi_equals(version_rules, deb_name):
-    """Function that validates if there are rules 'equals' with different versions colliding.
-
-    Args:
-        version_rules (list): list of all version rules from the workspace
-        deb_name (str): debian package name
-    """
-    conflict_detected = False
-    versions_on_rules = []
-    rules_equals_hits = []
-    for rule in version_rules:
-        if "version_eq" in rule["operator"]:
-            if rule["version"] not in versions_on_rules:
-                versions_on_rules.append(rule["version"])
-
-            if len(versions_on_rules) > 1:
-                conflict_detected = True
-
-            logging.debug(
-                "[Check for colisions - check for multi equals] Pkg:"
-                + deb_name
-                + ". Found equals rule!"
-            )
-            logging.debug(
-                "[Check for colisions - check for multi equals] Pkg:"
-                + deb_name
-                + ". Dependency: "
-                + deb_name
-                + " has "
-                + rule["version"]
-                + " ( "
-                + rule["operator"]
-                + " ) from "
-                + str(rule["from"])
-            )
-            rules_equals_hits.append(rule)
-
-    if conflict_detected:
-        msg = "Dependency conflict detected for dependency: " + deb_name + "\n"
-        for conflict in rules_equals_hits:
-            msg += (
-                str(conflict["from"])
-                + " expects: ("
-                + conflict["operator"]
-                + " "
-                + conflict["version"]
-                + ")\n"
-            )
-
-        raise ColisionDetectedException(
-            {"name": deb_name, "rules": rules_equals_hits}
-        )
-
-    logging.debug(
-        "[Check for colisions - check for multi equals] Pkg:"
-        + deb_name
-        + ". No Conflicts detected here!"
-    )
-
-
-def check_if_equals_violates_edges(version_rules, deb_name):
-    """Function that validates if the 'greater than' rules do not collide with the 'lower than' rules.
-
-    Args:
-        version_rules (list): list of all version rules from the workspace
-        deb_name (str): debian package name
-    """
-    found, equals_rule = version_utils.find_equals_rule(version_rules)
-    if not found:
-        logging.debug(
-            "[Check for colisions - check equals violates edges] Pkg:"
-            + deb_name
-            + ". No equals rule found for "
-            + deb_name
-            + "! Skipping validation."
-        )
-        return
-
-    check_if_rule_violates_bottom_edges(equals_rule, version_rules, deb_name)
-    check_if_rule_violates_top_edges(equals_rule, version_rules, deb_name)
-
-
-def check_if_rule_violates_bottom_edges(rule_evaluated, version_rules, deb_name):
-    """Function that validates if a version rule does not go against any of the 'greater than' rules.
-
-    Args:
-        rule_evaluated (Tuple[version,operator]): version rule to be evaluated
-        version_rules (list): list of all version rules from the workspace
-        deb_name (str): debian package name
-    """
-    conflict_detected = False
-    rules_conflict_hits = []
-
-    for rule in version_rules:
-        if "version_eq" != rule["operator"]:
-            if "version_gt" in rule["operator"]:
-                # handle greaters (included and excluded)
-
-                compare_result = Dpkg.compare_versions(
-                    rule_evaluated["version"], rule["version"]
-                )
-
-                if rule["operator"] == "version_gte" and compare_result < 0:
-                    logging.debug(
-                        "[Check for colisions - check equals violates bottom edge] Pkg:"
-                        + deb_name
-                        + ". Colision detected!"
-                    )
-                    logging.debug(
-                        "[Check for colisions - check equals violates bottom edge] Pkg:"
-                        + deb_name
-                        + ". Is "
-                        + rule_evaluated["version"]
-                        + "|"
-                        + rule_evaluated["operator"]
-                        + " coliding with "
-                        + rule["version"]
-                        + "|"
-                        + rule["operator"]
-                        + "?"
-                    )
-                    conflict_detected = True
-                    rules_conflict_hits.append(rule)
-
-                if rule["operator"] == "version_gt" and compare_result < 1:
-                    logging.debug(
-                        "[Check for colisions - check equals violates bottom edge] Pkg:"
-                        + deb_name
-                        + ". Colision detected!"
-                    )
-                    logging.debug(
-                        "[Check for colisions - check equals violates bottom edge] Pkg:"
-                        + deb_name
-                        + ". Is "
-                        + rule_evaluated["version"]
-                        + "|"
-                        + rule_evaluated["operator"]
-                        + " coliding with "
-                        + rule["version"]
-                        + "|"
-                        + rule["operator"]
-                        + "?"
-                    )
-                    conflict_detected = True
-                    rules_conflict_hits.append(rule)
-
-    if conflict_detected:
-        rules_conflict_hits.append(rule_evaluated)
-        msg = "Dependency conflict detected for dependency: " + deb_name + "\n"
-        for conflict in rules_conflict_hits:
-            msg += (
-                conflict["from"]
-                + " expects: ("
-                + conflict["operator"]
-                + " "
-                + conflict["version"]
-                + ")\n"
-            )
-
-        raise ColisionDetectedException(
-            {"name": deb_name, "rules": rules_conflict_hits}
-        )
-
-
-def check_if_rule_violates_top_edges(rule_evaluated, version_rules, deb_name):
-    """Function that validates if a version rule does not go against any of the 'lower than' rules.
-
-    Args:
-        rule_evaluated (Tuple[version,operator]): version rule to be evaluated
-        version_rules (list): list of all version rules from the workspace
-        deb_name (str): debian package name
-    """
-    conflict_detected = False
-    rules_conflict_hits = []
-
-    for rule in version_rules:
-        if "version_eq" != rule["operator"]:
-            # handle lowers (included and excluded)
-            if "version_lt" in rule["operator"]:
-                compare_result = Dpkg.compare_versions(
-                    rule["version"], rule_evaluated["version"]
-                )
-
-                if rule["operator"] == "version_lte" and compare_result < 0:
-                    logging.debug(
-                        "[Check for colisions - check equals violates top edge] Pkg:"
-                        + deb_name
-                        + ". Colision detected!"
-                    )
-                    logging.debug(
-                        "[Check for colisions - check equals violates top edge] Pkg:"
-                        + deb_name
-                        + ". Is "
-                        + rule_evaluated["version"]
-                        + "|"
-                        + rule_evaluated["operator"]
-                        + " coliding with "
-                        + rule["version"]
-                        + "|"
-                        + rule["operator"]
-                        + "?"
-                    )
-                    conflict_detected = True
-                    rules_conflict_hits.append(rule)
-
-                if rule["operator"] == "version_lt" and compare_result < 1:
-                    logging.debug(
-                        "[Check for colisions - check equals violates top edge] Pkg:"
-                        + deb_name
-                        + ". Colision detected!"
-                    )
-                    logging.debug(
-                        "[Check for colisions - check equals violates top edge] Pkg:"
-                        + deb_name
-                        + ". Is "
-                        + rule_evaluated["version"]
-                        + "|"
-                        + rule_evaluated["operator"]
-                        + " coliding with "
-                        + rule["version"]
-                        + "|"
-                        + rule["operator"]
-                        + "?"
-                    )
-
-                    conflict_detected = True
-                    rules_conflict_hits.append(rule)
-
-    if conflict_detected:
-        rules_conflict_hits.append(rule_evaluated)
-        msg = "Dependency conflict detected for dependency: " + deb_name + "\n"
-        for conflict in rules_conflict_hits:
-            msg += (
-                conflict["from"]
-                + " expects: ("
-                + conflict["operator"]
-                + " "
-                + conflict["version"]
-                + ")\n"
-            )
-
-        raise ColisionDetectedException(
-            {"name": deb_name, "rules": rules_conflict_hits}
-        )
-
-
-def check_if_edges_violate_eachother(version_rules, deb_name):
-    """Function that validates if 'lower than's and 'greater than' dependencies rules do not colide
-    within the workspace
-
-    Args:
-        version_rules (list): list of version rules of a dependency (contains the operators and versions).
-        deb_name (str): debian package name
-    """
-    for rule in version_rules:
-        if "version_eq" != rule["operator"]:
-            if "version_lt" in rule["operator"]:
-                check_if_rule_violates_bottom_edges(rule, version_rules, deb_name)
-
-            if "version_gt" in rule["operator"]:
-                check_if_rule_violates_top_edges(rule, version_rules, deb_name)
-
-
-def check_colision(dependency):
-    """Function that analyses the version rules of a dependency for colission between them.
+def calculate_install(dependency):
+    """Calculates the install candidate of a package. Meant to be executed by the workers, so the candidate cache hits
+    and misses of the calculation are returned in the execution status too, for the main process to count them.
 
     Args:
         dependency (list): dependency information. First item is the package name, second item is the version rules.
 
     Returns:
-        dict: dictionary that contains the execution status and error messages(in case of conflicts).
+        dict: dictionary that contains the execution status, error message, candidate cache statistics and version
+            candidate if successfull.
     """
-    # if deb_name in self._possible_colision:
-    version_rules = dependency[1]
-    deb_name = dependency[0]
-
-    try:
-        if version_rules:
-            check_for_colisions(deb_name, version_rules)
-        return {"executionStatus": True, "message": None}
-    except ColisionDetectedException as e:
-        return {
-            "executionStatus": False,
-            "conflicts": e.get_conflicts(),
-        }
+    candidate_cache = CandidateCache()
+    statistics_before = candidate_cache.get_statistics()
+    execution, candidates = find_install_candidate(dependency)
+    execution["cacheStatistics"] = candidate_cache.take_statistics(statistics_before)
+    return execution, candidates
 
 
-def calculate_install(dependency):
+def find_install_candidate(dependency):
     """functin that calculates a install candidate version for this package/dependnecy
 
     Args:
@@ -375,20 +94,34 @@ class DependencyManager:
     # pylint: disable=R0902
     def __init__(self):
         """Constructor"""
-        self.dependency_bank = {}
+        self.dependency_bank = DependencyBank()
         self.conflict_solving = False
         self.skip_installed = False
         self.install_candidates = {}
-        self.possible_colision = []
-        self.possible_install_candidate_compromised = []
+        self.changed_candidates = set()
+        self.inspected_versions = {}
+        self.checked_revisions = {}
+        self.calculated_revisions = {}
+        self.round_statistics = dict.fromkeys(ROUND_STATISTICS, 0)
         self.local_packages = {}
         self.blacklist = {}
         self.outside_tree_analyzed_packages = {}
 
-        self.root = Node("/")
-        self.node_map = {}
-        self.lost_nodes_group = Node(UNIDENTIFIED, self.root)
-        self.involved_nodes = Node(INDIRECT_INVOLVEMENT, self.root)
+        self.dependency_graph = DependencyGraph()
+        self.lost_nodes_group = UNIDENTIFIED
+        self.involved_nodes = INDIRECT_INVOLVEMENT
+        self.dependency_graph.add_edge(self.dependency_graph.root, self.lost_nodes_group)
+        self.dependency_graph.add_edge(self.dependency_graph.root, self.involved_nodes)
+
+    @property
+    def possible_colision(self):
+        """Packages whose version rules changed since the last colision check"""
+        return self.dependency_bank.colision_dirty
+
+    @property
+    def possible_install_candidate_compromised(self):
+        """Packages whose install candidate needs to be calculated"""
+        return self.dependency_bank.candidate_dirty
 
     def _version_rules_already_registered(self, deb_name, version_rules):
         """Checks if the version rules for this package are already registered in the dependency bank
@@ -403,16 +136,7 @@ class DependencyManager:
         if deb_name not in self.dependency_bank:
             return False
 
-        found_existing_rule = 0
-        for version_rule in version_rules:
-            for known_version_rule in self.dependency_bank[deb_name]:
-                if (
-                    version_rule["operator"] == known_version_rule["operator"]
-                    and version_rule["version"] == known_version_rule["version"]
-                ):
-                    found_existing_rule = found_existing_rule + 1
-
-        return found_existing_rule == len(version_rules)
+        return self.dependency_bank.count_registered_constraints(deb_name, version_rules) == len(version_rules)
 
     def is_user_requested_package(self, dep_name):
         """Check if a node/package is one of the requested by the user
@@ -423,11 +147,7 @@ class DependencyManager:
         Returns:
             bool: True if it was requested by the user. False otherwise.
         """
-        if dep_name in self.dependency_bank:
-            for rules in self.dependency_bank[dep_name]:
-                if rules["from"] == "user":
-                    return True
-        return False
+        return self.dependency_bank.has_rule_from(dep_name, "user")
 
     def register_local_package(self, file_path, package_name, version):
         """Register package as local package
@@ -446,18 +166,10 @@ class DependencyManager:
             package (str): package name
             version_rules (version_rules): package version rules
         """
-        if package_name not in self.node_map:
-            self.node_map[package_name] = []
-            self.node_map[package_name].append(
-                Node(package_name, self.involved_nodes)
-            )
-        if package_name not in self.dependency_bank:
-            self.dependency_bank[package_name] = []
-
-        version_utils.append_new_rules(self.dependency_bank, version_rules, package_name)
-
-        self.possible_colision.append(package_name)
-        self.possible_install_candidate_compromised.append(package_name)
+        if package_name not in self.dependency_graph:
+            self.dependency_graph.add_edge(self.involved_nodes, package_name)
+        self.dependency_bank.add_rules(package_name, version_rules)
+        self.dependency_bank.mark_dirty(package_name)
 
     # pylint: disable=R0912
     def register_root_package(self, package, version, author):
@@ -488,21 +200,18 @@ class DependencyManager:
                         "from": author,
                     }
                 ]
-                version_utils.append_new_rules(self.dependency_bank, version_rules, package)
+                self.dependency_bank.add_rules(package, version_rules)
 
                 if package not in self.install_candidates:
-                    self.install_candidates[package] = {
+                    self.set_candidate(package, {
                         "name": package,
                         "version": version,
                         "calculation_base": "calculated",
                         "spotOn": True,
-                    }
+                    })
                     return
             # If the package registered is from user, override the installed rules.
-            if package in self.dependency_bank:
-                for version_rule in self.dependency_bank[package]:
-                    if version_rule["from"] == "Installed":
-                        self.dependency_bank[package].remove(version_rule)
+            self.dependency_bank.remove_rules_from(package, "Installed")
 
             tree_utils.register_sub_root_node(self, package)
 
@@ -525,22 +234,22 @@ class DependencyManager:
             if package in self.install_candidates:
                 return
         else:
-            version_utils.append_new_rules(self.dependency_bank, version_rules, package)
+            self.dependency_bank.add_rules(package, version_rules)
 
-        self.possible_colision.append(package)
+        self.possible_colision.add(package)
 
         if package + "=" + version in self.local_packages:
             if package not in self.install_candidates:
 
                 # register local deb in calculated candidates. We cant calculate it as it might be locally generated and not yet avaiable in the apt cache.
-                self.install_candidates[package] = {
+                self.set_candidate(package, {
                 "name": package,
                 "version": version,
                 "calculation_base": "calculated",
                 "spotOn": True,
-            }
+            })
         else:
-            self.possible_install_candidate_compromised.append(package)
+            self.possible_install_candidate_compromised.add(package)
 
     # pylint: disable=R1702,R0912
     def _analyze_package_dependencies(self, package, dependencies, skip_installed):
@@ -580,9 +289,7 @@ class DependencyManager:
                 )
             else:
                 # even if no calc is done, we register the rules
-                version_utils.append_new_rules(
-                    self.dependency_bank, version_rules, dep_name
-                )
+                self.dependency_bank.add_rules(dep_name, version_rules)
 
             if dep_name in self.install_candidates:
                 if tree_utils.check_if_needs_recalc_tree_branch(
@@ -591,11 +298,7 @@ class DependencyManager:
                     tree_utils.schedule_recalc_subtree(dep_name, self)
 
             if dep_name not in self.install_candidates:
-                if dep_name not in self.possible_colision:
-                    self.possible_colision.append(dep_name)
-
-                if dep_name not in self.possible_install_candidate_compromised:
-                    self.possible_install_candidate_compromised.append(dep_name)
+                self.dependency_bank.mark_dirty(dep_name)
 
                 logging.debug(
                     "[Dependency_Manager - register package] Identified new dependencies "
@@ -635,35 +338,16 @@ class DependencyManager:
         logging.debug("[Register package] i took " + str(end - start))
 
     def register_tree_node(self, package_name, dep_name):
-        """Register new tree entry
+        """Register new dependency edge in the dependency graph
 
         Args:
             package_name (str): package name, to be used as parent
             dep_name (str): dependency name, to be used as current node
         """
-        if dep_name not in self.node_map:
-            self.node_map[dep_name] = []
-
-        if package_name not in self.node_map:
-            self.node_map[package_name] = []
-            self.node_map[package_name].append(
-                Node(package_name, self.lost_nodes_group)
-            )
+        if package_name not in self.dependency_graph:
+            self.dependency_graph.add_edge(self.lost_nodes_group, package_name)
 
-        if package_name in self.node_map:
-            for e in self.node_map[package_name]:
-                if not tree_utils.exists_in_tree_with_parent(
-                    dep_name, package_name, self.node_map
-                ):
-                    new_node = Node(dep_name, e)
-                    if len(self.node_map[dep_name]) > 0:
-                        for node in self.node_map[dep_name]:
-                            if node.children:
-                                tree_utils.clone_subtree(
-                                    self.node_map, node, new_node, overwrite=True
-                                )
-                                break
-                    self.node_map[dep_name].append(new_node)
+        self.dependency_graph.add_edge(package_name, dep_name)
 
     def exclude_package(self, package_name):
         """Function to remove dependencies from the dependency bank
@@ -680,32 +364,30 @@ class DependencyManager:
         Args:
             print_tree (bool, optional): True if tree should be printed in terminal. Defaults to False.
         """
+        rendered_tree = RenderTree(self.dependency_graph.to_tree(), style=DoubleStyle()).by_attr()
         if print_tree:
-            print(RenderTree(self.root, style=DoubleStyle()).by_attr())
-        utilitary.write_to_file(
-            "./tree.mobtree", RenderTree(self.root, style=DoubleStyle()).by_attr()
-        )
+            print(rendered_tree)
+        utilitary.write_to_file("./tree.mobtree", rendered_tree)
 
     def check_colisions(self):
         """Function that checks if the dependencies' version ruling does't colide within them"""
         start = time.time()
 
-
-        subthreads_colision_reports = utilitary.parrallel_execute_function(check_colision,
-                                             list(
-                                                filter(
-                                                    lambda x: (x[0] in self.possible_colision),
-                                                    self.dependency_bank.items(),
-                                                )
-                                            ))
-
         problem_found = False
         conflicts_list = []
-        for execution in subthreads_colision_reports:
-            if not execution["executionStatus"]:
-                logging.warning(version_utils.pretify_version_conflicts(execution["conflicts"]["name"], execution["conflicts"]["rules"]))
+        for deb_name, _ in self.dependency_bank.dirty_items(self.possible_colision):
+            revision = self.dependency_bank.get_revision(deb_name)
+            if self.checked_revisions.get(deb_name) == revision:
+                self.round_statistics["evaluations_skipped"] += 1
+                continue
+            self.checked_revisions[deb_name] = revision
+            self.round_statistics["colision_checks"] += 1
+
+            conflict = self.dependency_bank.get_conflict(deb_name)
+            if conflict:
+                logging.warning(version_utils.pretify_version_conflicts(conflict["name"], conflict["rules"]))
                 problem_found = True
-                conflicts_list.append(execution["conflicts"])
+                conflicts_list.append(conflict)
 
         if problem_found:
             self.render_tree()
@@ -717,7 +399,7 @@ class DependencyManager:
             else:
                 sys.exit(1)
 
-        self.possible_colision = []
+        self.possible_colision.clear()
 
         end = time.time()
         logging.debug("[check colisions] i took " + str(end - start))
@@ -727,22 +409,28 @@ class DependencyManager:
         debian packages candidates for installation.
         """
 
-        subthreads_candidates = utilitary.parrallel_execute_function(calculate_install,
-                                             list(
-                                                filter(
-                                                    lambda x: (x[0] in self.possible_install_candidate_compromised),
-                                                    self.dependency_bank.items(),
-                                                ),
-                                            ))
+        pending_calculation = []
+        for deb_name, version_rules in self.dependency_bank.dirty_items(self.possible_install_candidate_compromised):
+            # the candidate is a function of the rules only, so it is still valid if they did not change
+            if (
+                deb_name in self.install_candidates
+                and self.calculated_revisions.get(deb_name) == self.dependency_bank.get_revision(deb_name)
+            ):
+                self.round_statistics["evaluations_skipped"] += 1
+                continue
+            pending_calculation.append((deb_name, version_rules))
+        self.round_statistics["candidates_calculated"] += len(pending_calculation)
+
+        subthreads_candidates = utilitary.parrallel_execute_function(calculate_install, pending_calculation)
 
         problem_found = False
 
         for execution, sub_candidates in subthreads_candidates:
+            CandidateCache().add_statistics(*execution["cacheStatistics"])
             if execution["executionStatus"]:
                 for new_candidate in sub_candidates.keys():
-                    self.install_candidates[new_candidate] = sub_candidates[
-                        new_candidate
-                    ]
+                    self.set_candidate(new_candidate, sub_candidates[new_candidate])
+                    self.calculated_revisions[new_candidate] = self.dependency_bank.get_revision(new_candidate)
             else:
                 logging.error(execution["message"])
                 problem_found = True
@@ -752,18 +440,22 @@ class DependencyManager:
             sys.exit(1)
 
         if self.skip_installed:
-            self.possible_install_candidate_compromised = []
+            self.possible_install_candidate_compromised.clear()
             return
 
+        calculated_names = {deb_name for deb_name, _ in pending_calculation}
+        compromised_candidates = [
+            candidate
+            for candidate in self.install_candidates.items()
+            if candidate[0] in calculated_names
+        ]
+        if compromised_candidates:
+            apt_utils.index_installed_reverse_dependencies()
+
         subthreads_colision_reports = utilitary.parrallel_execute_function(apt_utils.package_impacts_installed_dependencies,
-                                             list(
-                                                filter(
-                                                    lambda x: (x[0] in self.possible_install_candidate_compromised),
-                                                    self.install_candidates.items(),
-                                                ),
-                                            ))
+                                                                           compromised_candidates)
 
-        self.possible_install_candidate_compromised = []
+        self.possible_install_candidate_compromised.clear()
 
         registered_packages = False
         for colision in subthreads_colision_reports:
@@ -793,6 +485,43 @@ class DependencyManager:
         if registered_packages:
             self.calculate_installs()
 
+    def set_candidate(self, deb_name, candidate):
+        """Sets the install candidate of a package, tracking it as changed
+
+        Args:
+            deb_name (str): package name
+            candidate (dict): install candidate, with the name, version, calculation base and spotOn
+        """
+        self.install_candidates[deb_name] = candidate
+        self.changed_candidates.add(deb_name)
+
+    def pop_changed_candidates(self):
+        """Get the candidates whose version changed since they were last popped, to have their dependencies inspected
+
+        Returns:
+            list: candidates (name,version), in the order of the install candidates
+        """
+        changed = []
+        if self.changed_candidates:
+            for deb_name, candidate in self.install_candidates.items():
+                if deb_name not in self.changed_candidates:
+                    continue
+                if self.inspected_versions.get(deb_name) != candidate["version"]:
+                    self.inspected_versions[deb_name] = candidate["version"]
+                    changed.append(candidate)
+            self.changed_candidates.clear()
+        return changed
+
+    def pop_round_statistics(self):
+        """Get the evaluations done since the statistics were last popped
+
+        Returns:
+            dict: number of colision checks, candidates calculated and evaluations skipped for unchanged rules
+        """
+        statistics = self.round_statistics
+        self.round_statistics = dict.fromkeys(ROUND_STATISTICS, 0)
+        return statistics
+
     def get_install_list(self):
         """Getter function to retrieve the calculated install list
 
@@ -811,12 +540,7 @@ class DependencyManager:
         Returns:
             boolean: True if there is any package depending on provided one.
         """
-        for _, version_rules in self.dependency_bank.items():
-            for rule in version_rules:
-                if rule["from"] == deb_name + "=" + deb_version:
-                    return True
-
-        return False
+        return len(self.dependency_bank.get_packages_from(deb_name + "=" + deb_version)) > 0
 
     def get_version_of_candidate(self, deb_name):
         """Get the version of a candidate from the dependency manager
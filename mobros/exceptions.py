@@ -30,3 +30,19 @@ class AptCacheInitializationException(Exception):
     def __init__(self, message):
         super().__init__(message)
         self.message = message
+
+
+class SolverTimeoutException(Exception):
+    """Exception when the version solver exceeds its time budget"""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+class PackageIndexException(Exception):
+    """Exception when the package index can not be read from the host"""
+
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
@@ -1,12 +1,204 @@
 """Module defining the apt cache singleton not to be constantly requesting apt for his cache"""
+import errno
+import fcntl
 import os
+import sys
+import tempfile
+import time
+from subprocess import CalledProcessError
 from time import sleep
-import apt
 
 import mobros.utils.logger as logging
-from mobros.utils.utilitary import execute_shell_command
+from mobros.constants import (
+    APT_LISTS_LOCK_PATH,
+    APT_LISTS_PATH,
+    APT_LOCK_POLL_MAX_INTERVAL,
+    APT_LOCK_POLL_MIN_INTERVAL,
+    APT_RELEASE_FILE_SUFFIXES,
+    APT_UPDATE_BACKOFF_BASE,
+    APT_UPDATE_MAX_ATTEMPTS,
+    APT_UPDATE_STAMP_FILE,
+    MOBROS_CACHE_PATH,
+    AptUpdateMode,
+    PackageIndexBackend,
+)
+from mobros.exceptions import AptCacheInitializationException, PackageIndexException
+from mobros.types.mobros_global_data import GlobalData
+from mobros.types.apt_snapshot import (
+    AptSnapshot,
+    compute_index_fingerprint,
+    find_snapshot,
+    store_snapshot,
+)
+from mobros.types.package_index import load_fixture_index, load_packages_lists_index
+from mobros.utils.apt_sources import filter_source_entries, read_source_entries
+from mobros.utils.utilitary import execute_command
+
+
+def get_apt_update_stamp_path():
+    """Get the path of the file whose modification time records the last apt update done by mobros
+
+    Returns:
+        str: full path of the apt update stamp
+    """
+    return os.path.join(MOBROS_CACHE_PATH, APT_UPDATE_STAMP_FILE)
+
+
+def stamp_apt_update():
+    """Records that the apt lists were just updated. apt keeps the Release files untouched when a repository did not
+    change, and dates the downloaded ones with the publication time, so they do not tell when apt update ran.
+    """
+    stamp_path = get_apt_update_stamp_path()
+    try:
+        os.makedirs(MOBROS_CACHE_PATH, exist_ok=True)
+        with open(stamp_path, "a", encoding="utf8"):
+            pass
+        os.utime(stamp_path)
+    except OSError as e:
+        logging.debug("[AptCache] Unable to record the apt update. " + str(e))
+
+
+def get_apt_lists_age(lists_path=APT_LISTS_PATH):
+    """Computes how long ago the apt lists were updated, based on the apt update stamp and the newest Release file.
+
+    Args:
+        lists_path (str, optional): apt lists folder. Defaults to APT_LISTS_PATH.
+
+    Returns:
+        float: age in minutes of the apt lists. None if there are no Release files.
+    """
+    if not os.path.isdir(lists_path):
+        return None
+
+    newest_release = None
+    for list_file in os.listdir(lists_path):
+        if list_file.endswith(APT_RELEASE_FILE_SUFFIXES):
+            release_mtime = os.path.getmtime(os.path.join(lists_path, list_file))
+            if newest_release is None or release_mtime > newest_release:
+                newest_release = release_mtime
+
+    if newest_release is None:
+        return None
+
+    stamp_path = get_apt_update_stamp_path()
+    if os.path.isfile(stamp_path):
+        newest_release = max(newest_release, os.path.getmtime(stamp_path))
+
+    return (time.time() - newest_release) / 60
+
+
+def is_apt_update_required(update_mode, max_age, lists_path=APT_LISTS_PATH):
+    """Decides if the apt lists need to be updated based on the update policy
+
+    Args:
+        update_mode (AptUpdateMode): apt update mode
+        max_age (int): maximum age, in minutes, of the apt lists in auto mode
+        lists_path (str, optional): apt lists folder. Defaults to APT_LISTS_PATH.
+
+    Returns:
+        bool: True if apt update should be executed. False otherwise.
+    """
+    if update_mode == AptUpdateMode.ALWAYS:
+        return True
+
+    if update_mode == AptUpdateMode.NEVER:
+        logging.debug("[AptCache] Apt update disabled. Using the current apt lists.")
+        return False
+
+    lists_age = get_apt_lists_age(lists_path)
+    if lists_age is None:
+        logging.debug("[AptCache] No Release files found in " + lists_path + ". Apt update required.")
+        return True
+
+    if lists_age < max_age:
+        logging.debug(
+            "[AptCache] Apt lists were updated "
+            + str(int(lists_age))
+            + " minutes ago (max age "
+            + str(max_age)
+            + "). Skipping apt update."
+        )
+        return False
+
+    return True
 
 # pylint: disable=R0903,W0107
+def wait_for_apt_lock(timeout, lock_path=APT_LISTS_LOCK_PATH):
+    """Waits until no other process holds the apt lists lock. The lock file is polled with a short
+    growing interval, so the wait ends right after the lock is released.
+
+    Args:
+        timeout (float): maximum time to wait, in seconds
+        lock_path (str, optional): apt lock file. Defaults to APT_LISTS_LOCK_PATH.
+
+    Raises:
+        AptCacheInitializationException: if the lock is not released within the timeout
+        PermissionError: if the lock file can not be opened by the current user
+
+    Returns:
+        float: time waited for the lock, in seconds
+    """
+    start = time.monotonic()
+    poll_interval = APT_LOCK_POLL_MIN_INTERVAL
+
+    with open(lock_path, "a", encoding="utf8") as lock_file:
+        while True:
+            try:
+                fcntl.lockf(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.lockf(lock_file, fcntl.LOCK_UN)
+                return time.monotonic() - start
+            except OSError as e:
+                if e.errno not in (errno.EACCES, errno.EAGAIN):
+                    raise
+
+            waited = time.monotonic() - start
+            if waited >= timeout:
+                raise AptCacheInitializationException(
+                    "Timed out after " + str(int(waited)) + " seconds waiting for the apt lock " + lock_path
+                )
+
+            sleep(min(poll_interval, timeout - waited))
+            poll_interval = min(poll_interval * 2, APT_LOCK_POLL_MAX_INTERVAL)
+
+
+def write_selected_sources_list(source_patterns):
+    """Writes a temporary sources list with only the apt sources matching the patterns
+
+    Args:
+        source_patterns (list): uri patterns of the apt sources to update. Empty means all sources.
+
+    Returns:
+        str: path of the temporary sources list. None if all the sources should be updated.
+    """
+    if not source_patterns:
+        return None
+
+    selected_entries = filter_source_entries(read_source_entries(), source_patterns)
+    if not selected_entries:
+        logging.warning(
+            "None of the apt sources match the configured apt update sources "
+            + str(source_patterns)
+            + ". Updating all sources."
+        )
+        return None
+
+    logging.debug("[AptCache] Updating only the apt sources: " + str(selected_entries))
+    with tempfile.NamedTemporaryFile("w", prefix="mobros-", suffix=".list", delete=False) as sources_file:
+        sources_file.write("\n".join(selected_entries) + "\n")
+    return sources_file.name
+
+
+def open_apt_cache():
+    """Opens the apt cache through python-apt, which is only imported by the apt backend
+
+    Returns:
+        apt.Cache: opened apt cache
+    """
+    import apt  # pylint: disable=C0415
+
+    return apt.Cache()
+
+
 class AptCache:
     """Apt cache singleton"""
 
@@ -18,47 +210,165 @@ class AptCache:
         """Singleton lock of instance"""
         if cls._instance is None:
             cls._instance = super(AptCache, cls).__new__(cls)
-            cls._cache = apt.Cache()
+            backend, fixture_path = GlobalData().get_package_index_backend()
+            if backend == PackageIndexBackend.FIXTURE:
+                # a recorded package universe, there is nothing to update
+                cls._cache = load_fixture_index(fixture_path)
+                return cls._instance
+
+            apt_cache = None
+
+            update_mode, max_age = GlobalData().get_apt_update_policy()
+            try:
+                if is_apt_update_required(update_mode, max_age):
+                    apt_cache = open_apt_cache()
+                    cls._update(apt_cache, GlobalData().get_apt_lock_timeout())
+            finally:
+                # even if the update failed, the current index is loaded for the ones proceeding with it
+                cls._cache = cls._load_index(apt_cache, backend)
+
+        return cls._instance
+
+    @staticmethod
+    def _update(apt_cache, timeout):
+        """Updates the apt lists, the equivalent of apt update. If apt update sources are configured,
+        only their lists are refreshed and the lists of the other sources are kept as they are.
+
+        Waits for the apt lock if another process holds it, and retries failed fetches with exponential
+        backoff, as long as the total time spent stays within the timeout.
+
+        Args:
+            apt_cache (apt.Cache): apt cache used for the update
+            timeout (float): maximum time, in seconds, spent waiting for the lock and between retries
+
+        Raises:
+            AptCacheInitializationException: if the apt lock is not released within the timeout
+        """
+        import apt  # pylint: disable=C0415
 
+        sources_list = write_selected_sources_list(GlobalData().get_apt_update_sources())
+        deadline = time.monotonic() + timeout
+        lock_wait = 0
+        try:
             attempt = 0
-            max_attempts = 5
-            while attempt < max_attempts:
+            while True:
                 try:
-                    cls._cache.update()
-                    cls._cache.open()
-                    break
-                except apt.cache.LockFailedException:
+                    lock_wait += wait_for_apt_lock(max(deadline - time.monotonic(), 0))
+                except PermissionError:
                     logging.warning(
                         "Unable to do apt update. Please run as sudo, or execute it before mobros!"
                     )
+                    AptCache._update_with_shell(sources_list)
+                    return
+
+                try:
+                    apt_cache.update(sources_list=sources_list)
+                    stamp_apt_update()
+                    break
+                except apt.cache.LockFailedException:
+                    # another process took the lock in between, wait for it again while attempts and time are left
+                    attempt += 1
+                    if attempt >= APT_UPDATE_MAX_ATTEMPTS or time.monotonic() >= deadline:
+                        logging.warning("Unable to take the apt lock to update the apt cache.")
+                        AptCache._update_with_shell(sources_list)
+                        return
+                    continue
                 except apt.cache.FetchFailedException:
                     logging.warning("Unable to fetch apt cache. Please check your internet connection!")
 
                 attempt += 1
-                logging.warning("Trying again in 15 seconds (" + str(attempt) +  " of " + str(max_attempts) + ") ...")
-                sleep(5)
+                backoff = APT_UPDATE_BACKOFF_BASE ** attempt
+                if attempt == APT_UPDATE_MAX_ATTEMPTS or time.monotonic() + backoff > deadline:
+                    AptCache._update_with_shell(sources_list)
+                    return
 
-            if attempt == max_attempts:
-                apt_cmd = ["apt", "update"]
-                if os.geteuid() != 0:
-                    apt_cmd = ["sudo"] + apt_cmd
-                execute_shell_command(apt_cmd, log_output=True)
+                logging.warning(
+                    "Trying again in "
+                    + str(backoff)
+                    + " seconds ("
+                    + str(attempt)
+                    + " of "
+                    + str(APT_UPDATE_MAX_ATTEMPTS - 1)
+                    + ") ..."
+                )
+                sleep(backoff)
+        finally:
+            if lock_wait >= APT_LOCK_POLL_MIN_INTERVAL:
+                logging.info("Waited " + "{:.2f}".format(lock_wait) + " seconds for the apt lock to be released.")
+            if sources_list:
+                os.remove(sources_list)
 
-            cls._installed_cache = []
-            for cached_pkg in cls._cache: # pylint: disable=not-an-iterable
-                if cached_pkg.is_installed:
-                    cls._installed_cache.append(cached_pkg)
+    @staticmethod
+    def _update_with_shell(sources_list):
+        """Updates the apt lists calling apt update, with sudo when not running as root.
 
-        return cls._instance
+        Args:
+            sources_list (str): path of the sources list to update. None to update all sources.
+        """
+        apt_cmd = ["apt", "update"]
+        if sources_list:
+            apt_cmd += [
+                "-o", "Dir::Etc::sourcelist=" + sources_list,
+                "-o", "Dir::Etc::sourceparts=-",
+                "-o", "APT::Get::List-Cleanup=0",
+            ]
+        if os.geteuid() != 0:
+            apt_cmd = ["sudo"] + apt_cmd
+        try:
+            execute_command(apt_cmd)
+            stamp_apt_update()
+        except CalledProcessError:
+            logging.warning("Unable to do apt update. Proceeding with the current apt lists.")
+
+    @staticmethod
+    def _load_index(apt_cache, backend=PackageIndexBackend.APT):
+        """Loads the package index from the stored snapshot. If the apt lists or the dpkg status changed
+        since it was stored, the apt cache is reopened and a new snapshot is stored for the next runs.
+        With the packages backend, the index is parsed from the apt lists and the dpkg status instead.
+
+        Args:
+            apt_cache (apt.Cache): apt cache used for the update. None if no update was done.
+            backend (PackageIndexBackend, optional): package index backend. Defaults to PackageIndexBackend.APT.
+
+        Returns:
+            PackageIndex: package index of the backend
+        """
+        start = time.time()
+        if backend == PackageIndexBackend.PACKAGES:
+            try:
+                snapshot = load_packages_lists_index()
+            except PackageIndexException as exception:
+                logging.error(exception.message)
+                sys.exit(1)
+            logging.debug("[AptCache] Parsed package index from the apt lists in " + str(time.time() - start))
+            return snapshot
+
+        fingerprint = compute_index_fingerprint()
+        snapshot = find_snapshot(fingerprint)
+
+        if snapshot is None:
+            if apt_cache is None:
+                apt_cache = open_apt_cache()
+            else:
+                apt_cache.open()
+            snapshot = AptSnapshot.from_apt_cache(apt_cache)
+            store_snapshot(snapshot, fingerprint)
+            logging.debug("[AptCache] Built package index snapshot in " + str(time.time() - start))
+        else:
+            logging.debug("[AptCache] Loaded package index snapshot in " + str(time.time() - start))
+
+        return snapshot
 
     def get_cache(self):
-        """Singleton get instance of apt cache
+        """Singleton get instance of the package index. Exposes the same lookups as the apt cache.
 
         Returns:
-            dict: apt cache dict
+            PackageIndex: package index
         """
         return self._cache
 
     def get_installed_cache(self):
         """Getter function to get the cache installed only"""
+        if self._installed_cache is None:
+            AptCache._installed_cache = self._cache.get_installed_packages()
         return self._installed_cache
@@ -0,0 +1,457 @@
+"""Module defining a persistent snapshot of the apt package index, not to reload the whole apt cache on every run"""
+import hashlib
+import marshal
+import mmap
+import struct
+from os import listdir, path
+
+from mobros.constants import (
+    APT_LISTS_PATH,
+    APT_PREFERENCES_PARTS_PATH,
+    APT_PREFERENCES_PATH,
+    APT_SNAPSHOT_PREFIX,
+    APT_SNAPSHOT_SUFFIX,
+    APT_SOURCES_LIST_PATH,
+    APT_SOURCES_PARTS_PATH,
+    DPKG_ARCH_PATH,
+    DPKG_STATUS_PATH,
+    MOBROS_CACHE_PATH,
+)
+from mobros.types.package_index_interface import PackageIndex
+from mobros.utils.cache_file import load_cache_file, remove_cache_file, update_files_fingerprint, write_cache_file
+from mobros.utils.deb_control import get_apt_architectures
+from mobros.utils.version_compare import version_key
+
+SNAPSHOT_MAGIC = b"MOBSNAP1"
+SNAPSHOT_HEADER = struct.Struct("<8sQ")
+SNAPSHOT_DEPENDENCY_TYPES = ["PreDepends", "Depends", "Conflicts"]
+APT_LISTS_IGNORED_FILES = ["lock", "partial", "auxfiles"]
+APT_SNAPSHOT_LOG_PREFIX = "[Apt snapshot]"
+# apt configuration changing the candidates and the packages apt.Cache exposes, without touching the lists
+APT_INDEX_CONFIG_PATHS = (
+    APT_PREFERENCES_PATH,
+    APT_PREFERENCES_PARTS_PATH,
+    APT_SOURCES_LIST_PATH,
+    APT_SOURCES_PARTS_PATH,
+    DPKG_ARCH_PATH,
+)
+
+
+def compute_index_fingerprint(
+    lists_path=APT_LISTS_PATH, status_path=DPKG_STATUS_PATH, config_paths=APT_INDEX_CONFIG_PATHS
+):
+    """Computes a fingerprint of the apt lists, the dpkg status, the apt pinning and sources and the apt architectures.
+    It changes whenever apt update, dpkg or a change in the apt configuration touch them.
+
+    Args:
+        lists_path (str, optional): apt lists folder. Defaults to APT_LISTS_PATH.
+        status_path (str, optional): dpkg status file. Defaults to DPKG_STATUS_PATH.
+        config_paths (tuple, optional): apt configuration files and folders. Defaults to APT_INDEX_CONFIG_PATHS.
+
+    Returns:
+        str: hex digest identifying the current state of the package index
+    """
+    fingerprint = hashlib.sha1()
+    fingerprint.update(SNAPSHOT_MAGIC + str(marshal.version).encode())
+    fingerprint.update(("|".join(get_apt_architectures())).encode())
+
+    tracked_files = [status_path]
+    if path.isdir(lists_path):
+        for list_file in sorted(listdir(lists_path)):
+            if list_file not in APT_LISTS_IGNORED_FILES:
+                tracked_files.append(path.join(lists_path, list_file))
+    for config_path in config_paths:
+        if path.isdir(config_path):
+            tracked_files += [path.join(config_path, config_file) for config_file in sorted(listdir(config_path))]
+        else:
+            tracked_files.append(config_path)
+
+    update_files_fingerprint(fingerprint, tracked_files)
+    return fingerprint.hexdigest()
+
+
+def get_snapshot_path(fingerprint):
+    """Get the path where the snapshot of a given package index fingerprint is stored
+
+    Args:
+        fingerprint (str): package index fingerprint
+
+    Returns:
+        str: full path of the snapshot file
+    """
+    return path.join(MOBROS_CACHE_PATH, APT_SNAPSHOT_PREFIX + fingerprint + APT_SNAPSHOT_SUFFIX)
+
+
+def find_snapshot(fingerprint):
+    """Loads the snapshot matching the fingerprint, if one was stored by a previous run.
+
+    Args:
+        fingerprint (str): package index fingerprint
+
+    Returns:
+        AptSnapshot: the stored snapshot or None if there is no valid one.
+    """
+    return load_cache_file(
+        get_snapshot_path(fingerprint),
+        AptSnapshot.load,
+        APT_SNAPSHOT_LOG_PREFIX,
+        "snapshot",
+        errors=(OSError, ValueError, EOFError, TypeError, struct.error),
+    )
+
+
+def store_snapshot(snapshot, fingerprint):
+    """Persists the snapshot for the next runs and removes the ones from older package indexes.
+
+    Args:
+        snapshot (AptSnapshot): snapshot to be stored
+        fingerprint (str): package index fingerprint
+    """
+    remove_stale_snapshots(fingerprint)
+    snapshot.save(get_snapshot_path(fingerprint))
+
+
+def remove_stale_snapshots(fingerprint):
+    """Removes all stored snapshots except the one of the given fingerprint
+
+    Args:
+        fingerprint (str): package index fingerprint to keep.
+    """
+    if not path.isdir(MOBROS_CACHE_PATH):
+        return
+
+    for snapshot_file in listdir(MOBROS_CACHE_PATH):
+        snapshot_path = path.join(MOBROS_CACHE_PATH, snapshot_file)
+        if (
+            snapshot_file.startswith(APT_SNAPSHOT_PREFIX)
+            and snapshot_path != get_snapshot_path(fingerprint)
+        ):
+            remove_cache_file(snapshot_path, APT_SNAPSHOT_LOG_PREFIX, "stale snapshot")
+
+
+class SnapshotDependency:
+    """Class that abstracts a dependency stored in the snapshot, like apt's BaseDependency"""
+
+    def __init__(self, name, relation, version, rawtype):
+        self.name = name
+        self.relation = relation
+        self.version = version
+        self.rawtype = rawtype
+
+    def __repr__(self):
+        """ToString method that returns a string representation of the object
+
+        Returns:
+            str: string representation of the object.
+        """
+        return "{" + self.name + ", " + self.version + ", " + self.relation + "}"
+
+
+class SnapshotVersion:
+    """Class that abstracts a package version stored in the snapshot, like apt's Version"""
+
+    def __init__(self, package, version, dependencies, uri):
+        self.package = package
+        self.version = version
+        self.uri = uri
+        self._dependencies = dependencies
+
+    def __str__(self):
+        return self.package.name + "=" + self.version
+
+    def __repr__(self):
+        return self.package.name + "=" + self.version
+
+    def get_dependencies(self, *types):
+        """Return the list of or dependencies for the given dependency types.
+
+        Returns:
+            list: list of or dependencies (list of SnapshotDependency)
+        """
+        dependencies = []
+        for dep_type in types:
+            for rawtype, or_group in self._dependencies:
+                if rawtype == dep_type:
+                    dependencies.append(
+                        [SnapshotDependency(name, relation, version, rawtype) for name, relation, version in or_group]
+                    )
+        return dependencies
+
+    @property
+    def dependencies(self):
+        """Return the dependencies of the package version."""
+        return self.get_dependencies("PreDepends", "Depends")
+
+
+class SnapshotVersionList:
+    """Class that abstracts the versions of a package stored in the snapshot, ordered from the newest."""
+
+    def __init__(self, versions):
+        self._versions = versions
+
+    def __iter__(self):
+        return iter(self._versions)
+
+    def __len__(self):
+        return len(self._versions)
+
+    def __getitem__(self, index):
+        return self._versions[index]
+
+    def __repr__(self):
+        return str(self._versions)
+
+    def get(self, version, default=None):
+        """Get a specific version of the package
+
+        Args:
+            version (str): package version
+
+        Returns:
+            SnapshotVersion: The package version or default if not found
+        """
+        for snapshot_version in self._versions:
+            if snapshot_version.version == version:
+                return snapshot_version
+        return default
+
+
+# pylint: disable=R0903
+class SnapshotPackage:
+    """Class that abstracts a package stored in the snapshot, like apt's Package"""
+
+    def __init__(self, name, record):
+        package_id, installed_version, installed_uri, versions = record
+        self.name = name
+        self.id = package_id  # pylint: disable=C0103
+        self.installed = None
+
+        snapshot_versions = []
+        for version, dependencies in versions:
+            uri = installed_uri if version == installed_version else None
+            snapshot_version = SnapshotVersion(self, version, dependencies, uri)
+            snapshot_versions.append(snapshot_version)
+            if version == installed_version:
+                self.installed = snapshot_version
+
+        self.versions = SnapshotVersionList(snapshot_versions)
+        self.is_installed = self.installed is not None
+
+
+class AptSnapshot(PackageIndex):
+    """Compact snapshot of the apt package index. Exposes the subset of the apt cache that mobros reads.
+
+    The packages are stored as marshalled records behind an offset table, and only decoded when requested.
+    """
+
+    def __init__(self, buffer):
+        magic, index_size = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not an apt snapshot")
+
+        index_end = SNAPSHOT_HEADER.size + index_size
+        index = marshal.loads(buffer[SNAPSHOT_HEADER.size:index_end])
+
+        self._buffer = buffer
+        self._data_offset = index_end
+        self._offsets = index["packages"]
+        self._installed = index["installed"]
+        self._provides = index["provides"]
+        self._packages = {}
+        self._installed_names = None
+        self._installed_providers = None
+
+    @staticmethod
+    def serialize(records, installed, provides):
+        """Serializes the package records into the snapshot binary format
+
+        Args:
+            records (dict): package name to package record
+            installed (list): names of the installed packages
+            provides (dict): virtual package name to list of (provider name, provider id)
+
+        Returns:
+            bytes: serialized snapshot
+        """
+        offsets = {}
+        data = []
+        data_size = 0
+        for name, record in records.items():
+            blob = marshal.dumps(record)
+            offsets[name] = (data_size, len(blob))
+            data.append(blob)
+            data_size += len(blob)
+
+        index = marshal.dumps({"packages": offsets, "installed": tuple(installed), "provides": provides})
+        return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(index)) + index + b"".join(data)
+
+    @staticmethod
+    def load(snapshot_path):
+        """Memory maps a stored snapshot
+
+        Args:
+            snapshot_path (str): path of the stored snapshot
+
+        Returns:
+            AptSnapshot: the loaded snapshot
+        """
+        with open(snapshot_path, "rb") as snapshot_file:
+            buffer = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return AptSnapshot(buffer)
+
+    # pylint: disable=W0212
+    @staticmethod
+    def from_apt_cache(cache):
+        """Builds a snapshot from an opened apt cache
+
+        Args:
+            cache (apt.Cache): opened apt cache
+
+        Returns:
+            AptSnapshot: snapshot with the package index information
+        """
+        get_candidate_ver = cache._depcache.get_candidate_ver
+        records = {}
+        installed = []
+        provides = {}
+
+        for raw_pkg in cache._cache.packages:
+            name = raw_pkg.get_fullname(True)
+
+            if not raw_pkg.has_versions:
+                if raw_pkg.has_provides:
+                    providers = {}
+                    for _, _, provider_ver in raw_pkg.provides_list:
+                        provider_pkg = provider_ver.parent_pkg
+                        if provider_ver == get_candidate_ver(provider_pkg):
+                            providers[provider_pkg.get_fullname(True)] = provider_pkg.id
+                    provides[name] = tuple(providers.items())
+                continue
+
+            versions = []
+            for raw_ver in raw_pkg.version_list:
+                dependencies = []
+                depends_list = raw_ver.depends_list
+                for dep_type in SNAPSHOT_DEPENDENCY_TYPES:
+                    for or_group in depends_list.get(dep_type, []):
+                        dependencies.append(
+                            (dep_type, tuple((dep.target_pkg.name, dep.comp_type, dep.target_ver) for dep in or_group))
+                        )
+                versions.append((raw_ver.ver_str, tuple(dependencies)))
+            versions.sort(key=lambda version: version_key(version[0]), reverse=True)
+
+            installed_version = installed_uri = None
+            if raw_pkg.current_ver is not None:
+                installed.append(name)
+                installed_version = raw_pkg.current_ver.ver_str
+                installed_uri = cache[name].installed.uri
+
+            records[name] = (raw_pkg.id, installed_version, installed_uri, tuple(versions))
+
+        return AptSnapshot(AptSnapshot.serialize(records, installed, provides))
+
+    def save(self, snapshot_path):
+        """Stores the snapshot in disk
+
+        Args:
+            snapshot_path (str): path where to store the snapshot
+
+        Returns:
+            bool: True if the snapshot was stored. False otherwise.
+        """
+        return write_cache_file(
+            snapshot_path,
+            lambda snapshot_file: snapshot_file.write(self._buffer),
+            APT_SNAPSHOT_LOG_PREFIX,
+            "snapshot",
+            binary=True,
+        )
+
+    def get(self, name, default=None):
+        """Get a package from the snapshot
+
+        Args:
+            name (str): package name
+
+        Returns:
+            SnapshotPackage: the package or default if not found
+        """
+        if name in self._packages:
+            return self._packages[name]
+
+        if name not in self._offsets:
+            return default
+
+        start, size = self._offsets[name]
+        start += self._data_offset
+        package = SnapshotPackage(name, marshal.loads(self._buffer[start:start + size]))
+        self._packages[name] = package
+        return package
+
+    def __contains__(self, name):
+        return name in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def is_virtual_package(self, name):
+        """Checks if a package is virtual
+
+        Args:
+            name (str): package name
+
+        Returns:
+            bool: True if the package is virtual. False otherwise.
+        """
+        return name in self._provides
+
+    def get_providing_packages(self, name):
+        """Get the packages whose candidate version provides a virtual package
+
+        Args:
+            name (str): virtual package name
+
+        Returns:
+            list: list of providing SnapshotPackage
+        """
+        return [self.get(provider) for provider, _ in self._provides.get(name, ())]
+
+    def is_installed(self, name):
+        """Checks if a package is installed, without decoding its record
+
+        Args:
+            name (str): package name
+
+        Returns:
+            bool: True if the package is installed. False otherwise.
+        """
+        if self._installed_names is None:
+            self._installed_names = frozenset(self._installed)
+        return name in self._installed_names
+
+    def get_installed_provider(self, name):
+        """Get the installed package providing a virtual package. The lookup is built on the first call.
+
+        Args:
+            name (str): virtual package name
+
+        Returns:
+            str: name of the installed providing package or None if no provider is installed
+        """
+        if self._installed_providers is None:
+            self._installed_providers = {}
+            for virtual_name, providers in self._provides.items():
+                for provider, _ in providers:
+                    if self.is_installed(provider):
+                        self._installed_providers[virtual_name] = provider
+
+        return self._installed_providers.get(name)
+
+    def get_installed_packages(self):
+        """Get all the installed packages
+
+        Returns:
+            list: list of installed SnapshotPackage
+        """
+        return [self.get(name) for name in self._installed]
+
@@ -0,0 +1,113 @@
+"""Module defining the per run cache of the candidate lookups, not to filter the same versions by the same rules again"""
+from collections import OrderedDict
+
+from mobros.constants import CANDIDATE_CACHE_MAX_SIZE
+
+
+def canonicalize_version_rules(version_rules):
+    """Puts the version rules in a canonical order, without duplicates. The same rules in any order give the same result.
+
+    Args:
+        version_rules (list): list of version rules
+
+    Returns:
+        tuple: fingerprint of the rules (tuple of (operator, version, from)) and the rules in the canonical order
+    """
+    canonical_rules = {}
+    for rule in version_rules:
+        canonical_rules.setdefault((rule["operator"], rule["version"], rule["from"]), rule)
+
+    # version and from may be None, they are sorted as empty strings
+    fingerprint = tuple(sorted(canonical_rules, key=lambda rule_key: tuple(field or "" for field in rule_key)))
+    return fingerprint, [canonical_rules[rule_key] for rule_key in fingerprint]
+
+
+class CandidateCache:
+    """Per run bounded cache of the candidates found for a package and its version rules.
+
+    Failed lookups are cached too, with the message of their InstallCandidateNotFoundException. An entry is only valid
+    for the version index it was computed from, so it is recomputed once the available versions of the package change.
+    """
+
+    _instance = None
+    _entries = OrderedDict()
+    _hits = 0
+    _misses = 0
+
+    def __new__(cls):
+        """Singleton lock of instance"""
+        if cls._instance is None:
+            cls._instance = super(CandidateCache, cls).__new__(cls)
+
+        return cls._instance
+
+    def get(self, deb_name, rules_fingerprint, version_index):
+        """Get the cached outcome of a candidate lookup
+
+        Args:
+            deb_name (str): package name
+            rules_fingerprint (tuple): fingerprint of the version rules
+            version_index (PackageVersionIndex): index of the available versions of the package
+
+        Returns:
+            tuple: candidates (list) and error message (str, None if successful), or None if not cached
+        """
+        key = (deb_name, rules_fingerprint)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not version_index:
+            CandidateCache._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        CandidateCache._hits += 1
+        return entry[1], entry[2]
+
+    def store(self, deb_name, rules_fingerprint, version_index, candidates, error_message=None):
+        """Caches the outcome of a candidate lookup, evicting the least recently used one when full
+
+        Args:
+            deb_name (str): package name
+            rules_fingerprint (tuple): fingerprint of the version rules
+            version_index (PackageVersionIndex): index of the available versions of the package
+            candidates (list): candidate versions found
+            error_message (str, optional): message of the lookup failure. Defaults to None.
+        """
+        key = (deb_name, rules_fingerprint)
+        self._entries[key] = (version_index, tuple(candidates), error_message)
+        self._entries.move_to_end(key)
+        if len(self._entries) > CANDIDATE_CACHE_MAX_SIZE:
+            self._entries.popitem(last=False)
+
+    def get_statistics(self):
+        """Get the hits and misses of the cache
+
+        Returns:
+            tuple: number of hits and number of misses
+        """
+        return self._hits, self._misses
+
+    def take_statistics(self, since):
+        """Takes the hits and misses counted since a previous get_statistics out of the counters, for the caller to
+        return them. Workers are forked processes, so their lookups only count once added back in the main process.
+
+        Args:
+            since (tuple): hits and misses returned by get_statistics
+
+        Returns:
+            tuple: number of hits and number of misses since then
+        """
+        hits = CandidateCache._hits - since[0]
+        misses = CandidateCache._misses - since[1]
+        CandidateCache._hits = since[0]
+        CandidateCache._misses = since[1]
+        return hits, misses
+
+    def add_statistics(self, hits, misses):
+        """Adds the hits and misses taken by take_statistics, in a worker or in this process, to the counters
+
+        Args:
+            hits (int): number of hits
+            misses (int): number of misses
+        """
+        CandidateCache._hits += hits
+        CandidateCache._misses += misses
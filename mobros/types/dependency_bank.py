@@ -0,0 +1,243 @@
+"""Module defining the dependency bank, the version rules registered for each package during the dependency analysis"""
+from collections import Counter
+
+from mobros.types.version_interval import VersionInterval, find_conflicting_rules
+
+
+def _rule_key(rule):
+    return (rule["operator"], rule["version"], rule["from"])
+
+
+def _constraint_key(rule):
+    return (rule["operator"], rule["version"])
+
+
+class DependencyBank:
+    """Version rules of each package, indexed by the rule, by the constraint and by the origin (from) of the rules.
+    The rules of each package are also kept as a version interval, so conflicts are known as soon as they are registered.
+    Each change to the rules of a package bumps its revision. It also tracks the packages whose rules changed since
+    they were last checked for colisions and candidates.
+
+    The rules lists are owned by the bank. They must only be changed through its methods, to keep the indexes in sync.
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self._rules = {}
+        self._rule_keys = {}
+        self._constraints = {}
+        self._origins = {}
+        self._intervals = {}
+        self._revisions = {}
+        self.colision_dirty = set()
+        self.candidate_dirty = set()
+
+    def __contains__(self, deb_name):
+        return deb_name in self._rules
+
+    def __getitem__(self, deb_name):
+        return self._rules[deb_name]
+
+    def __setitem__(self, deb_name, version_rules):
+        for rule in self._rules.get(deb_name, []):
+            self._unindex_origin(deb_name, rule["from"])
+        self._rules[deb_name] = []
+        self._rule_keys[deb_name] = Counter()
+        self._constraints[deb_name] = Counter()
+        self._intervals[deb_name] = VersionInterval()
+        self._bump_revision(deb_name)
+        for rule in version_rules:
+            self._index_rule(deb_name, rule)
+
+    def __delitem__(self, deb_name):
+        for rule in self._rules[deb_name]:
+            self._unindex_origin(deb_name, rule["from"])
+        del self._rules[deb_name]
+        del self._rule_keys[deb_name]
+        del self._constraints[deb_name]
+        del self._intervals[deb_name]
+
+    def __iter__(self):
+        return iter(self._rules)
+
+    def __len__(self):
+        return len(self._rules)
+
+    def get(self, deb_name, default=None):
+        """Get the version rules of a package
+
+        Args:
+            deb_name (str): package name
+            default (any, optional): value returned if the package is not registered. Defaults to None.
+
+        Returns:
+            list: list of version rules
+        """
+        return self._rules.get(deb_name, default)
+
+    def items(self):
+        """Get the packages and their version rules, in registration order
+
+        Returns:
+            dict_items: (package name, version rules) pairs
+        """
+        return self._rules.items()
+
+    def keys(self):
+        """Get the registered packages, in registration order
+
+        Returns:
+            dict_keys: package names
+        """
+        return self._rules.keys()
+
+    def dirty_items(self, dirty):
+        """Get the packages of a dirty set and their version rules, in registration order
+
+        Args:
+            dirty (set): either colision_dirty or candidate_dirty
+
+        Returns:
+            list: (package name, version rules) pairs
+        """
+        return [(deb_name, rules) for deb_name, rules in self._rules.items() if deb_name in dirty]
+
+    def mark_dirty(self, deb_name):
+        """Marks a package to be checked for colisions and to have its install candidate calculated
+
+        Args:
+            deb_name (str): package name
+        """
+        self.colision_dirty.add(deb_name)
+        self.candidate_dirty.add(deb_name)
+
+    def _index_rule(self, deb_name, rule):
+        self._rules[deb_name].append(rule)
+        self._rule_keys[deb_name][_rule_key(rule)] += 1
+        self._constraints[deb_name][_constraint_key(rule)] += 1
+        self._origins.setdefault(rule["from"], Counter())[deb_name] += 1
+        self._intervals[deb_name].add(rule)
+        self._bump_revision(deb_name)
+
+    def _bump_revision(self, deb_name):
+        self._revisions[deb_name] = self._revisions.get(deb_name, 0) + 1
+
+    def get_revision(self, deb_name):
+        """Get the revision of the rules of a package. It changes every time its rules change, even if excluded and
+        registered again.
+
+        Args:
+            deb_name (str): package name
+
+        Returns:
+            int: revision of the rules. None if the package was never registered.
+        """
+        return self._revisions.get(deb_name)
+
+    def _unindex_origin(self, deb_name, origin):
+        dependents = self._origins[origin]
+        dependents[deb_name] -= 1
+        if dependents[deb_name] <= 0:
+            del dependents[deb_name]
+            if not dependents:
+                del self._origins[origin]
+
+    def add_rules(self, deb_name, version_rules):
+        """Registers the version rules of a package that are not yet registered
+
+        Args:
+            deb_name (str): package name
+            version_rules (list): list of version rules
+        """
+        if deb_name not in self._rules:
+            self[deb_name] = []
+
+        for rule in version_rules:
+            if _rule_key(rule) not in self._rule_keys[deb_name]:
+                self._index_rule(deb_name, rule)
+
+    def remove_rule(self, deb_name, rule):
+        """Removes a version rule of a package
+
+        Args:
+            deb_name (str): package name
+            rule (dict): version rule
+        """
+        self._rules[deb_name].remove(rule)
+        keys = self._rule_keys[deb_name]
+        keys[_rule_key(rule)] -= 1
+        if keys[_rule_key(rule)] <= 0:
+            del keys[_rule_key(rule)]
+        constraints = self._constraints[deb_name]
+        constraints[_constraint_key(rule)] -= 1
+        if constraints[_constraint_key(rule)] <= 0:
+            del constraints[_constraint_key(rule)]
+        self._unindex_origin(deb_name, rule["from"])
+        # removing a rule can only widen the interval, which is rebuilt from the remaining rules
+        self._intervals[deb_name] = VersionInterval(self._rules[deb_name])
+        self._bump_revision(deb_name)
+
+    def remove_rules_from(self, deb_name, origin):
+        """Removes all version rules of a package that come from an origin
+
+        Args:
+            deb_name (str): package name
+            origin (str): origin of the rules, like user, Installed or the requiring package
+        """
+        if deb_name not in self._origins.get(origin, ()):
+            return
+        for rule in [rule for rule in self._rules[deb_name] if rule["from"] == origin]:
+            self.remove_rule(deb_name, rule)
+
+    def count_registered_constraints(self, deb_name, version_rules):
+        """Counts the registered rules of a package that match the operator and version of the inputed rules
+
+        Args:
+            deb_name (str): package name
+            version_rules (list): list of version rules
+
+        Returns:
+            int: number of matches of each inputed rule, summed
+        """
+        constraints = self._constraints.get(deb_name)
+        if constraints is None:
+            return 0
+        return sum(constraints.get(_constraint_key(rule), 0) for rule in version_rules)
+
+    def has_rule_from(self, deb_name, origin):
+        """Checks if a package has any version rule from an origin
+
+        Args:
+            deb_name (str): package name
+            origin (str): origin of the rules, like user, Installed or the requiring package
+
+        Returns:
+            bool: True if the package has a rule from the origin. False otherwise.
+        """
+        return deb_name in self._origins.get(origin, ())
+
+    def get_packages_from(self, origin):
+        """Get the packages that have version rules from an origin. With the origin being a package=version,
+        these are the packages it depends on.
+
+        Args:
+            origin (str): origin of the rules
+
+        Returns:
+            list: package names
+        """
+        return list(self._origins.get(origin, ()))
+
+    def get_conflict(self, deb_name):
+        """Get the conflict between the version rules of a package, if any
+
+        Args:
+            deb_name (str): package name
+
+        Returns:
+            dict: conflict with the package name and the conflicting version rules. None if there is no conflict.
+        """
+        interval = self._intervals.get(deb_name)
+        if interval is None or not interval.empty:
+            return None
+        return {"name": deb_name, "rules": find_conflicting_rules(self._rules[deb_name])}
@@ -0,0 +1,229 @@
+"""Module defining the dependency graph, the structure of which package depends on which"""
+from anytree import Node
+
+ROOT = "/"
+REPEATED_SUBTREE_MARK = " (...)"
+
+
+class DependencyGraph:
+    """Directed graph of the packages, kept as adjacency maps of parents and children. Each package is a single node,
+    no matter how many packages depend on it, so shared dependencies are stored once instead of once per path.
+
+    The children and parents of a node are dicts used as ordered sets, so the graph is walked in registration order.
+    The descendants of a node are cached once queried. An edge change drops only the cache of the nodes upstream of it.
+    """
+
+    def __init__(self):
+        """Constructor"""
+        self.root = ROOT
+        self._children = {ROOT: {}}
+        self._parents = {ROOT: {}}
+        self._descendants = {}
+
+    def __contains__(self, name):
+        return name in self._children
+
+    def __len__(self):
+        return len(self._children)
+
+    def count_edges(self):
+        """Get the number of dependency edges of the graph
+
+        Returns:
+            int: number of edges
+        """
+        return sum(len(children) for children in self._children.values())
+
+    def add_node(self, name):
+        """Adds a node without any edge, if it is not already in the graph
+
+        Args:
+            name (str): package name
+        """
+        if name not in self._children:
+            self._children[name] = {}
+            self._parents[name] = {}
+
+    def add_edge(self, parent, child):
+        """Adds a dependency edge, adding the nodes if they are not already in the graph
+
+        Args:
+            parent (str): name of the package that depends on child
+            child (str): name of the dependency
+        """
+        self.add_node(parent)
+        self.add_node(child)
+        if child not in self._children[parent]:
+            self._invalidate_descendants(parent)
+        self._children[parent][child] = None
+        self._parents[child][parent] = None
+
+    def remove_edge(self, parent, child):
+        """Removes a dependency edge, if it exists. The nodes are kept.
+
+        Args:
+            parent (str): name of the package that depends on child
+            child (str): name of the dependency
+        """
+        if self.has_edge(parent, child):
+            self._invalidate_descendants(parent)
+            del self._children[parent][child]
+            del self._parents[child][parent]
+
+    def _invalidate_descendants(self, name):
+        """Drops the cached descendants of a node and of every node upstream of it. The upstream nodes are the
+        ones whose cached descendants contain the node, so only the cache is scanned, not the graph."""
+        stale = [cached for cached, descendants in self._descendants.items() if cached == name or name in descendants]
+        for cached in stale:
+            del self._descendants[cached]
+
+    def has_edge(self, parent, child):
+        """Checks if a package depends directly on other
+
+        Args:
+            parent (str): name of the package
+            child (str): name of the dependency
+
+        Returns:
+            bool: True if the edge exists. False otherwise.
+        """
+        return parent in self._children and child in self._children[parent]
+
+    def get_children(self, name):
+        """Get the direct dependencies of a package
+
+        Args:
+            name (str): package name
+
+        Returns:
+            list: names of the children, in registration order. Empty if the package is not in the graph.
+        """
+        return list(self._children.get(name, ()))
+
+    def get_parents(self, name):
+        """Get the packages that depend directly on a package
+
+        Args:
+            name (str): package name
+
+        Returns:
+            list: names of the parents, in registration order. Empty if the package is not in the graph.
+        """
+        return list(self._parents.get(name, ()))
+
+    def get_ancestors(self, name):
+        """Get the packages that depend on a package, directly or indirectly
+
+        Args:
+            name (str): package name
+
+        Returns:
+            set: names of the ancestors. It contains the package itself only if it is in a cycle.
+        """
+        ancestors = set()
+        stack = [name]
+        while stack:
+            for parent in self._parents.get(stack.pop(), ()):
+                if parent not in ancestors:
+                    ancestors.add(parent)
+                    stack.append(parent)
+        return ancestors
+
+    def get_descendants(self, name):
+        """Get the packages a package depends on, directly or indirectly
+
+        Args:
+            name (str): package name
+
+        Returns:
+            frozenset: names of the descendants. It contains the package itself only if it is in a cycle.
+        """
+        if name not in self._descendants:
+            descendants = set()
+            stack = [name]
+            while stack:
+                for child in self._children.get(stack.pop(), ()):
+                    if child not in descendants:
+                        descendants.add(child)
+                        stack.append(child)
+            self._descendants[name] = frozenset(descendants)
+        return self._descendants[name]
+
+    def is_upstream(self, ancestor, name):
+        """Checks if a package depends, directly or indirectly, on other
+
+        Args:
+            ancestor (str): name of the package that would be upstream
+            name (str): name of the package that would be downstream
+
+        Returns:
+            bool: True if ancestor depends on name. False otherwise.
+        """
+        return name in self.get_descendants(ancestor)
+
+    def walk(self, name):
+        """Get a package and everything it depends on, directly or indirectly, depth first
+
+        Args:
+            name (str): package name
+
+        Returns:
+            list: names of the package and its descendants, each one once. Empty if the package is not in the graph.
+        """
+        if name not in self._children:
+            return []
+
+        visited = {name}
+        descendants = []
+        stack = [name]
+        while stack:
+            current = stack.pop()
+            descendants.append(current)
+            for child in reversed(self._children[current]):
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(child)
+        return descendants
+
+    def level_order(self):
+        """Walks the graph breadth first from the root. Each package is in the level of its shortest path from the
+        root, so the ones reached by several paths are yielded once.
+
+        Yields:
+            list: names of the packages of each level, starting with the root
+        """
+        visited = {ROOT}
+        level = [ROOT]
+        while level:
+            yield level
+            next_level = []
+            for name in level:
+                for child in self._children[name]:
+                    if child not in visited:
+                        visited.add(child)
+                        next_level.append(child)
+            level = next_level
+
+    def to_tree(self):
+        """Derives a tree from the graph, to be rendered. The dependencies of a package are expanded only where it is
+        first reached breadth first. Anywhere else it is a leaf, marked as repeated if it has dependencies.
+
+        Returns:
+            Node: root of the tree
+        """
+        tree_root = Node(ROOT)
+        expanded = {ROOT}
+        level = [tree_root]
+        while level:
+            next_level = []
+            for tree_node in level:
+                for child in self._children[tree_node.name]:
+                    child_node = Node(child, tree_node)
+                    if child in expanded:
+                        if self._children[child]:
+                            child_node.name = child + REPEATED_SUBTREE_MARK
+                        continue
+                    expanded.add(child)
+                    next_level.append(child_node)
+            level = next_level
+        return tree_root
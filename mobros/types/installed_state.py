@@ -0,0 +1,152 @@
+"""Module defining the installed state of the system, streamed from the dpkg status file without loading the apt cache"""
+from os import stat
+
+from mobros.constants import DPKG_STATUS_PATH, PackageIndexBackend
+from mobros.types.mobros_global_data import GlobalData
+from mobros.types.package_index import read_index_fixture
+from mobros.utils.deb_control import (
+    get_native_architecture,
+    get_package_fullname,
+    get_stanza_provides,
+    is_installed_stanza,
+    parse_depends,
+    read_stanzas,
+)
+
+DPKG_STATUS_TRACKED_FIELDS = ("Package", "Status", "Architecture", "Multi-Arch", "Version", "Pre-Depends", "Depends", "Provides")
+
+
+def parse_installed_stanzas(stanzas, native_architecture=None):
+    """Builds the installed state from the stanzas of the installed packages
+
+    Args:
+        stanzas (iterable): dpkg status stanzas
+        native_architecture (str, optional): native architecture of the system. Defaults to None.
+
+    Returns:
+        tuple: dict of package name to (version, depends) and dict of virtual package name to its installed providers
+    """
+    packages = {}
+    providers = {}
+    for stanza in stanzas:
+        if "Package" not in stanza or not is_installed_stanza(stanza):
+            continue
+
+        name = get_package_fullname(stanza, native_architecture)
+        depends = ", ".join(stanza[field] for field in ("Pre-Depends", "Depends") if field in stanza)
+        packages[name] = (stanza.get("Version"), depends)
+
+        for provided_name in get_stanza_provides(stanza):
+            providers.setdefault(provided_name, []).append(name)
+
+    return packages, providers
+
+
+def parse_dpkg_status(status_path=DPKG_STATUS_PATH, native_architecture=None):
+    """Streams the dpkg status file, line by line, keeping only the installed packages.
+
+    Args:
+        status_path (str, optional): dpkg status file. Defaults to DPKG_STATUS_PATH.
+        native_architecture (str, optional): native architecture of the system. Defaults to None.
+
+    Returns:
+        tuple: dict of package name to (version, depends) and dict of virtual package name to its installed providers
+    """
+    with open(status_path, encoding="utf-8", errors="replace") as status_file:
+        return parse_installed_stanzas(read_stanzas(status_file, DPKG_STATUS_TRACKED_FIELDS), native_architecture)
+
+
+class InstalledState:
+    """Per run installed state of the system. It is reloaded only when the dpkg status file changes"""
+
+    _instance = None
+    _source = None
+    _packages = {}
+    _providers = {}
+
+    def __new__(cls):
+        """Singleton lock of instance"""
+        if cls._instance is None:
+            cls._instance = super(InstalledState, cls).__new__(cls)
+
+        return cls._instance
+
+    def _load(self):
+        """Parses the installed state source if it changed since the last parse. The source is the dpkg status
+        file, or the package index fixture when the fixture backend is selected."""
+        backend, fixture_path = GlobalData().get_package_index_backend()
+        status_path = fixture_path if backend == PackageIndexBackend.FIXTURE else DPKG_STATUS_PATH
+        try:
+            status_stat = stat(status_path)
+        except FileNotFoundError:
+            InstalledState._packages, InstalledState._providers = {}, {}
+            InstalledState._source = None
+            return
+
+        source = (status_path, status_stat.st_size, status_stat.st_mtime_ns)
+        if source == self._source:
+            return
+
+        if backend == PackageIndexBackend.FIXTURE:
+            fixture = read_index_fixture(fixture_path)
+            InstalledState._packages, InstalledState._providers = parse_installed_stanzas(
+                fixture.get("installed", []), fixture.get("architecture")
+            )
+        else:
+            InstalledState._packages, InstalledState._providers = parse_dpkg_status(
+                status_path, get_native_architecture()
+            )
+        InstalledState._source = source
+
+    def get_installed_version(self, deb_name):
+        """Get the installed version of a package
+
+        Args:
+            deb_name (str): package name
+
+        Returns:
+            str: installed version or None if the package is not installed
+        """
+        self._load()
+        installed = self._packages.get(deb_name)
+        return installed[0] if installed else None
+
+    def is_installed(self, deb_name, version=None):
+        """Checks if a package is installed. If the version is also specified, checks that specific version is installed.
+
+        Args:
+            deb_name (str): package name
+            version (str, optional): package version. Defaults to None.
+
+        Returns:
+            bool: True if the package is installed. False otherwise
+        """
+        installed_version = self.get_installed_version(deb_name)
+        if installed_version is None:
+            return False
+        return version is None or installed_version == version
+
+    def get_dependencies(self, deb_name):
+        """Get the dependencies of an installed package
+
+        Args:
+            deb_name (str): package name
+
+        Returns:
+            list: list of or groups, each being a list of (name, relation, version). Empty if not installed.
+        """
+        self._load()
+        installed = self._packages.get(deb_name)
+        return parse_depends(installed[1]) if installed else []
+
+    def get_installed_providers(self, deb_name):
+        """Get the installed packages that provide a virtual package
+
+        Args:
+            deb_name (str): virtual package name
+
+        Returns:
+            list: names of the installed providers
+        """
+        self._load()
+        return list(self._providers.get(deb_name, []))
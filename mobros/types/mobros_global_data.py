@@ -1,4 +1,12 @@
 """Module defining the global data singleton to share data between modules"""
+from mobros.constants import (
+    DEFAULT_APT_LOCK_TIMEOUT,
+    DEFAULT_APT_UPDATE_MAX_AGE,
+    DEFAULT_SOLVER_TIME_BUDGET,
+    AptUpdateMode,
+    PackageIndexBackend,
+    SolverMode,
+)
 
 # pylint: disable=R0903,W0107
 class GlobalData:
@@ -7,6 +15,16 @@ class GlobalData:
     _instance = None
     _pkg_list = {}
     _pkg_source_blacklist_patterns = []
+    _apt_update_mode = AptUpdateMode.AUTO
+    _apt_update_max_age = DEFAULT_APT_UPDATE_MAX_AGE
+    _apt_update_source_patterns = []
+    _apt_lock_timeout = DEFAULT_APT_LOCK_TIMEOUT
+    _package_index_backend = PackageIndexBackend.APT
+    _package_index_fixture = None
+    _worker_jobs = None
+    _solver_mode = SolverMode.HEURISTIC
+    _solver_time_budget = DEFAULT_SOLVER_TIME_BUDGET
+    _rosdep_translation_cache = False
 
     def __new__(cls):
         """Singleton lock of instance"""
@@ -51,3 +69,121 @@ class GlobalData:
             list: package source blacklist patterns
         """
         return self._pkg_source_blacklist_patterns
+
+    def set_apt_update_policy(self, update_mode, max_age):
+        """Set the policy used to decide if the apt cache should be updated
+
+        Args:
+            update_mode (AptUpdateMode): apt update mode
+            max_age (int): maximum age, in minutes, of the apt lists before updating them in auto mode
+        """
+        GlobalData._apt_update_mode = update_mode
+        GlobalData._apt_update_max_age = max_age
+
+    def get_apt_update_policy(self):
+        """Get the policy used to decide if the apt cache should be updated
+
+        Returns:
+            (AptUpdateMode, int): apt update mode and maximum age in minutes of the apt lists
+        """
+        return self._apt_update_mode, self._apt_update_max_age
+
+    def set_apt_update_sources(self, source_patterns):
+        """Set the apt sources that are refreshed when the apt cache is updated
+
+        Args:
+            source_patterns (list): apt source uri patterns. Empty means all sources.
+        """
+        GlobalData._apt_update_source_patterns = source_patterns
+
+    def get_apt_update_sources(self):
+        """Get the apt sources that are refreshed when the apt cache is updated
+
+        Returns:
+            list: apt source uri patterns. Empty means all sources.
+        """
+        return self._apt_update_source_patterns
+
+    def set_apt_lock_timeout(self, timeout):
+        """Set the maximum time spent waiting for the apt lock and retrying failed apt updates
+
+        Args:
+            timeout (int): timeout in seconds
+        """
+        GlobalData._apt_lock_timeout = timeout
+
+    def get_apt_lock_timeout(self):
+        """Get the maximum time spent waiting for the apt lock and retrying failed apt updates
+
+        Returns:
+            int: timeout in seconds
+        """
+        return self._apt_lock_timeout
+
+    def set_package_index_backend(self, backend, fixture_path=None):
+        """Set the backend the package index is read from
+
+        Args:
+            backend (PackageIndexBackend): package index backend
+            fixture_path (str, optional): package index fixture, used by the fixture backend. Defaults to None.
+        """
+        GlobalData._package_index_backend = backend
+        GlobalData._package_index_fixture = fixture_path
+
+    def get_package_index_backend(self):
+        """Get the backend the package index is read from
+
+        Returns:
+            tuple: package index backend (PackageIndexBackend) and the fixture path, if any
+        """
+        return self._package_index_backend, self._package_index_fixture
+
+    def set_worker_jobs(self, jobs):
+        """Set the number of worker processes used to parallelize the dependency resolution
+
+        Args:
+            jobs (int): number of worker processes. None to size it from the available cpus.
+        """
+        GlobalData._worker_jobs = jobs
+
+    def get_worker_jobs(self):
+        """Get the number of worker processes used to parallelize the dependency resolution
+
+        Returns:
+            int: number of worker processes. None to size it from the available cpus.
+        """
+        return self._worker_jobs
+
+    def set_solver(self, solver_mode, time_budget):
+        """Set how the install conflicts are resolved
+
+        Args:
+            solver_mode (SolverMode): solver mode
+            time_budget (int): maximum time, in seconds, the backtrack solver searches for a solution
+        """
+        GlobalData._solver_mode = solver_mode
+        GlobalData._solver_time_budget = time_budget
+
+    def get_solver(self):
+        """Get how the install conflicts are resolved
+
+        Returns:
+            (SolverMode, int): solver mode and the time budget, in seconds, of the backtrack solver
+        """
+        return self._solver_mode, self._solver_time_budget
+
+    def set_rosdep_translation_cache(self, enabled):
+        """Set if the rosdep translations are persisted between runs
+
+        Args:
+            enabled (bool): True to read and store the rosdep translations in the mobros cache
+        """
+        GlobalData._rosdep_translation_cache = enabled
+
+    def get_rosdep_translation_cache(self):
+        """Get if the rosdep translations are persisted between runs
+
+        Returns:
+            bool: True if the rosdep translations are read and stored in the mobros cache
+        """
+        return self._rosdep_translation_cache
@@ -0,0 +1,491 @@
+"""Module defining the package index backends.
+
+Every backend implements the PackageIndex interface, so the resolver reads them all the same way. Each package exposes
+its versions, the dependencies of each version, the installed version and the origin (uri) of the installed version.
+- apt: built from python-apt's apt.Cache (see AptSnapshot.from_apt_cache). Only this backend needs python-apt.
+- packages: read lazily from the memory mapped apt Packages lists and the dpkg status file, without python-apt. The
+  lists apt keeps compressed (Acquire::GzipIndexes) are decompressed in memory instead.
+- fixture: read from a json file with a recorded package universe, to run the resolver offline.
+"""
+import bz2
+import gzip
+import json
+import lzma
+import mmap
+import re
+from os import fstat, listdir, path
+from urllib.parse import unquote
+
+import mobros.utils.logger as logging
+from mobros.constants import (
+    APT_LISTS_PATH,
+    APT_PACKAGES_COMPRESSION_SUFFIXES,
+    APT_PACKAGES_FILE_SUFFIX,
+    DPKG_STATUS_PATH,
+)
+from mobros.exceptions import PackageIndexException
+from mobros.types.apt_snapshot import SNAPSHOT_DEPENDENCY_TYPES, AptSnapshot, SnapshotPackage
+from mobros.types.package_index_interface import PackageIndex
+from mobros.utils.deb_control import (
+    get_native_architecture,
+    get_package_fullname,
+    get_stanza_provides,
+    is_installed_stanza,
+    parse_depends,
+    read_stanzas,
+)
+from mobros.utils.version_compare import version_key
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+# control file field of each dependency type stored in the snapshot
+DEPENDENCY_TYPE_FIELDS = {"PreDepends": "Pre-Depends", "Depends": "Depends", "Conflicts": "Conflicts"}
+PACKAGE_INDEX_TRACKED_FIELDS = ("Package", "Status", "Architecture", "Multi-Arch", "Version", "Filename", "Provides") + tuple(
+    DEPENDENCY_TYPE_FIELDS.values()
+)
+# matched from the line break before the field, a literal prefix the regex engine searches much faster than ^
+PACKAGE_LINE_PATTERN = re.compile(rb"\nPackage: *(\S+)")
+PROVIDES_LINE_PATTERN = re.compile(rb"\n(?:Provides:|Multi-Arch: *allowed)")
+PACKAGE_LINE_MAX_LENGTH = 512
+# decompression of the compressed Packages lists, by their suffix
+PACKAGES_LIST_DECOMPRESSORS = {".gz": gzip.decompress, ".xz": lzma.decompress, ".lzma": lzma.decompress,
+                               ".bz2": bz2.decompress}
+# package ids are the position of their first stanza, the list index in the high bits
+PACKAGE_ID_LIST_SHIFT = 40
+
+
+def _stanza_dependencies(stanza):
+    """Get the dependencies of a stanza in the snapshot record format
+
+    Args:
+        stanza (dict): fields of the stanza
+
+    Returns:
+        tuple: tuple of (dependency type, or group of (name, relation, version))
+    """
+    dependencies = []
+    for dep_type in SNAPSHOT_DEPENDENCY_TYPES:
+        field = DEPENDENCY_TYPE_FIELDS[dep_type]
+        if field in stanza:
+            for or_group in parse_depends(stanza[field]):
+                dependencies.append((dep_type, tuple(or_group)))
+    return tuple(dependencies)
+
+
+def _register_version(package_versions, stanza, uri):
+    """Registers the version of a stanza in the versions of its package, if not registered yet
+
+    Args:
+        package_versions (dict): version to (dependencies, provides, uri) of the package
+        stanza (dict): fields of the stanza
+        uri (str): uri of the version
+    """
+    if stanza["Version"] not in package_versions:
+        package_versions[stanza["Version"]] = (_stanza_dependencies(stanza), get_stanza_provides(stanza), uri)
+
+
+def _build_record(package_id, package_versions, installed_version):
+    """Builds the snapshot record of a package
+
+    Args:
+        package_id (int): package id, the order of the package in the index
+        package_versions (dict): version to (dependencies, provides, uri) of the package
+        installed_version (str): installed version, None if not installed
+
+    Returns:
+        tuple: snapshot record of the package
+    """
+    ordered_versions = sorted(package_versions, key=version_key, reverse=True)
+    installed_uri = package_versions[installed_version][2] if installed_version else None
+    return (
+        package_id,
+        installed_version,
+        installed_uri,
+        tuple((version, package_versions[version][0]) for version in ordered_versions),
+    )
+
+
+def build_package_index(available, installed_stanzas, native_architecture=None):
+    """Builds the package index from the stanzas of the available and of the installed packages
+
+    Args:
+        available (iterable): (stanza, uri) of the available package versions
+        installed_stanzas (iterable): stanzas of the installed packages
+        native_architecture (str, optional): native architecture of the system. Defaults to None.
+
+    Returns:
+        AptSnapshot: package index
+    """
+    ids = {}
+    versions = {}
+    installed = {}
+
+    def register(stanza, uri):
+        name = get_package_fullname(stanza, native_architecture)
+        if name not in ids:
+            ids[name] = len(ids)
+            versions[name] = {}
+        _register_version(versions[name], stanza, uri)
+        return name
+
+    for stanza, uri in available:
+        if "Package" in stanza and "Version" in stanza:
+            register(stanza, uri)
+
+    for stanza in installed_stanzas:
+        if "Package" in stanza and "Version" in stanza:
+            installed[register(stanza, None)] = stanza["Version"]
+
+    records = {}
+    providers = {}
+    for name, package_versions in versions.items():
+        records[name] = _build_record(ids[name], package_versions, installed.get(name))
+
+        # the candidate is the newest version, like apt does without pinning
+        candidate_version = records[name][3][0][0]
+        for provided in package_versions[candidate_version][1]:
+            providers.setdefault(provided, []).append((name, ids[name]))
+
+    provides = {virtual: tuple(providing) for virtual, providing in providers.items() if virtual not in records}
+    return AptSnapshot(AptSnapshot.serialize(records, list(installed), provides))
+
+
+def get_packages_list_uri(list_file):
+    """Get the repository uri of an apt Packages list from its file name, without the uri scheme.
+
+    Args:
+        list_file (str): list file name, like deb.debian.org_debian_dists_bookworm_main_binary-amd64_Packages
+
+    Returns:
+        str: repository uri, like deb.debian.org/debian
+    """
+    return unquote(list_file.split("_dists_")[0].replace("_", "/"))
+
+
+def get_packages_list_compression(list_file):
+    """Get the compression of an apt Packages list from its file name
+
+    Args:
+        list_file (str): list file name, like deb.debian.org_debian_dists_bookworm_main_binary-amd64_Packages.lz4
+
+    Returns:
+        str: compression suffix, like .lz4. Empty if the list is not compressed. None if the file is not a Packages list.
+    """
+    if list_file.endswith(APT_PACKAGES_FILE_SUFFIX):
+        return ""
+    for suffix in APT_PACKAGES_COMPRESSION_SUFFIXES:
+        if list_file.endswith(APT_PACKAGES_FILE_SUFFIX + suffix):
+            return suffix
+    return None
+
+
+def _get_decompressor(compression):
+    """Get the function decompressing the Packages lists of a compression
+
+    Args:
+        compression (str): compression suffix, like .gz
+
+    Returns:
+        function: decompression function of the list content. None if the list is not compressed or if the compression
+        is not supported.
+    """
+    if compression == ".lz4":
+        return lz4.frame.decompress if lz4 is not None else None
+    return PACKAGES_LIST_DECOMPRESSORS.get(compression)
+
+
+class PackagesListsIndex(PackageIndex):
+    """Package index read from the apt Packages lists and the dpkg status file.
+
+    The lists are memory mapped and only scanned for the position of each stanza. A stanza is decoded the first time
+    its package is requested, so a resolution only decodes the packages it touches. The provides are only gathered
+    when a virtual package is first looked up.
+    """
+
+    def __init__(self, lists_path=APT_LISTS_PATH, status_path=DPKG_STATUS_PATH, native_architecture=None):
+        self._native_architecture = native_architecture
+        self._lists = []
+        self._offsets = {}
+        self._installed = {}
+        self._installed_positions = {}
+        self._packages = {}
+        self._provides = None
+        self._installed_providers = None
+
+        if path.isdir(lists_path):
+            self._load_lists(lists_path)
+
+        if path.isfile(status_path):
+            with open(status_path, encoding="utf-8", errors="replace") as status_file:
+                for stanza in read_stanzas(status_file, PACKAGE_INDEX_TRACKED_FIELDS):
+                    if "Package" in stanza and "Version" in stanza and is_installed_stanza(stanza):
+                        fullname = get_package_fullname(stanza, native_architecture)
+                        self._installed[fullname] = stanza
+                        # the position in the status file is the id of the packages that are only installed
+                        self._installed_positions.setdefault(fullname, len(self._installed_positions))
+
+    def _load_lists(self, lists_path):
+        """Loads the Packages lists of the apt lists folder. The compressed lists are decompressed in memory.
+
+        Args:
+            lists_path (str): path of the apt lists folder
+
+        Raises:
+            PackageIndexException: if the folder has Packages lists but none of them can be read
+        """
+        skipped_lists = []
+        loaded_lists = 0
+        for list_file in sorted(listdir(lists_path)):
+            compression = get_packages_list_compression(list_file)
+            if compression is None:
+                continue
+
+            list_path = path.join(lists_path, list_file)
+            decompress = _get_decompressor(compression)
+            if not compression:
+                self._map_list(list_path, get_packages_list_uri(list_file))
+            elif decompress is not None:
+                with open(list_path, "rb") as list_stream:
+                    self._register_list(decompress(list_stream.read()), get_packages_list_uri(list_file))
+            else:
+                logging.warning("Unable to read the apt list " + list_file + ". Install the lz4 python package to read "
+                                + compression + " compressed lists.")
+                skipped_lists.append(list_file)
+                continue
+            loaded_lists += 1
+
+        if skipped_lists and not loaded_lists:
+            raise PackageIndexException(
+                "No usable apt Packages list found in " + lists_path + ". Unsupported compressed lists: "
+                + ", ".join(skipped_lists) + ". Install the lz4 python package or use the apt package index backend."
+            )
+
+    def _map_list(self, list_path, repository_uri):
+        """Memory maps a Packages list and registers the position of its stanzas
+
+        Args:
+            list_path (str): path of the Packages list
+            repository_uri (str): uri of the repository of the list
+        """
+        with open(list_path, "rb") as list_file:
+            if fstat(list_file.fileno()).st_size == 0:
+                return
+            buffer = mmap.mmap(list_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._register_list(buffer, repository_uri)
+
+    def _register_list(self, buffer, repository_uri):
+        """Registers the position of the stanzas of a Packages list
+
+        Args:
+            buffer (bytes): content of the Packages list, memory mapped or decompressed
+            repository_uri (str): uri of the repository of the list
+        """
+        if not buffer:
+            return
+
+        list_id = len(self._lists)
+        self._lists.append((buffer, repository_uri))
+        # the pattern includes the line break, the first stanza is matched from the start of the list
+        first_match = PACKAGE_LINE_PATTERN.match(b"\n" + buffer[:PACKAGE_LINE_MAX_LENGTH])
+        if first_match:
+            self._offsets.setdefault(first_match.group(1).decode(), []).append((list_id, 0))
+        for match in PACKAGE_LINE_PATTERN.finditer(buffer):
+            self._offsets.setdefault(match.group(1).decode(), []).append((list_id, match.start() + 1))
+
+    def _decode(self, list_id, start):
+        """Decodes the stanza starting at a position of a Packages list
+
+        Args:
+            list_id (int): index of the Packages list
+            start (int): position of the stanza in the list
+
+        Returns:
+            tuple: the stanza fields and the uri of the package version
+        """
+        buffer, repository_uri = self._lists[list_id]
+        end = buffer.find(b"\n\n", start)
+        if end < 0:
+            end = len(buffer)
+        lines = buffer[start:end].decode("utf-8", errors="replace").splitlines(True)
+        stanza = next(read_stanzas(lines, PACKAGE_INDEX_TRACKED_FIELDS), {})
+        uri = repository_uri + "/" + stanza["Filename"] if "Filename" in stanza else None
+        return stanza, uri
+
+    def get(self, name, default=None):
+        """Get a package from the index, decoding its stanzas on the first request
+
+        Args:
+            name (str): package name
+
+        Returns:
+            SnapshotPackage: the package or default if not found
+        """
+        if name not in self._packages:
+            package_id = None
+            package_versions = {}
+            for list_id, start in self._offsets.get(name.split(":")[0], ()):
+                stanza, uri = self._decode(list_id, start)
+                if "Version" in stanza and get_package_fullname(stanza, self._native_architecture) == name:
+                    if package_id is None:
+                        package_id = (list_id << PACKAGE_ID_LIST_SHIFT) + start
+                    _register_version(package_versions, stanza, uri)
+
+            installed_stanza = self._installed.get(name)
+            if installed_stanza is not None:
+                if package_id is None:
+                    package_id = (len(self._lists) << PACKAGE_ID_LIST_SHIFT) + self._installed_positions[name]
+                _register_version(package_versions, installed_stanza, None)
+
+            self._packages[name] = None
+            if package_versions:
+                installed_version = installed_stanza["Version"] if installed_stanza is not None else None
+                self._packages[name] = SnapshotPackage(
+                    name, _build_record(package_id, package_versions, installed_version)
+                )
+
+        package = self._packages[name]
+        return default if package is None else package
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __len__(self):
+        return len(set(self._offsets).union(name.split(":")[0] for name in self._installed))
+
+    def _get_provides(self):
+        """Gathers the provides of the candidate versions, decoding only the stanzas that provide packages.
+
+        Returns:
+            dict: virtual package name to the names of the providing packages
+        """
+        if self._provides is not None:
+            return self._provides
+
+        stanzas = []
+        for list_id, (buffer, _) in enumerate(self._lists):
+            starts = set()
+            for match in PROVIDES_LINE_PATTERN.finditer(buffer):
+                previous_end = buffer.rfind(b"\n\n", 0, match.start() + 1)
+                starts.add(previous_end + 2 if previous_end >= 0 else 0)
+            stanzas.extend(self._decode(list_id, start)[0] for start in sorted(starts))
+        stanzas.extend(self._installed.values())
+
+        providers = {}
+        for stanza in stanzas:
+            name = get_package_fullname(stanza, self._native_architecture)
+            package = self.get(name)
+            # the candidate is the newest version, like apt does without pinning
+            if package is None or package.versions[0].version != stanza.get("Version"):
+                continue
+            for provided in get_stanza_provides(stanza):
+                if name not in providers.setdefault(provided, []):
+                    providers[provided].append(name)
+
+        self._provides = {virtual: providing for virtual, providing in providers.items() if self.get(virtual) is None}
+        return self._provides
+
+    def is_virtual_package(self, name):
+        """Checks if a package is virtual
+
+        Args:
+            name (str): package name
+
+        Returns:
+            bool: True if the package is virtual. False otherwise.
+        """
+        return name in self._get_provides()
+
+    def get_providing_packages(self, name):
+        """Get the packages whose candidate version provides a virtual package
+
+        Args:
+            name (str): virtual package name
+
+        Returns:
+            list: list of providing SnapshotPackage
+        """
+        return [self.get(provider) for provider in self._get_provides().get(name, ())]
+
+    def is_installed(self, name):
+        """Checks if a package is installed, without decoding its stanzas
+
+        Args:
+            name (str): package name
+
+        Returns:
+            bool: True if the package is installed. False otherwise.
+        """
+        return name in self._installed
+
+    def get_installed_provider(self, name):
+        """Get the installed package providing a virtual package. The lookup is built on the first call.
+
+        Args:
+            name (str): virtual package name
+
+        Returns:
+            str: name of the installed providing package or None if no provider is installed
+        """
+        if self._installed_providers is None:
+            self._installed_providers = {}
+            for virtual_name, providers in self._get_provides().items():
+                for provider in providers:
+                    if self.is_installed(provider):
+                        self._installed_providers[virtual_name] = provider
+
+        return self._installed_providers.get(name)
+
+    def get_installed_packages(self):
+        """Get all the installed packages
+
+        Returns:
+            list: list of installed SnapshotPackage
+        """
+        return [self.get(name) for name in self._installed]
+
+
+def load_packages_lists_index(lists_path=APT_LISTS_PATH, status_path=DPKG_STATUS_PATH):
+    """Loads the package index from the apt Packages lists and the dpkg status file
+
+    Args:
+        lists_path (str, optional): apt lists folder. Defaults to APT_LISTS_PATH.
+        status_path (str, optional): dpkg status file. Defaults to DPKG_STATUS_PATH.
+
+    Returns:
+        PackagesListsIndex: package index
+    """
+    return PackagesListsIndex(lists_path, status_path, get_native_architecture())
+
+
+def read_index_fixture(fixture_path):
+    """Reads a package index fixture. It is a json object with the stanzas of the available and installed packages,
+    using the control file field names, like:
+    {"architecture": "amd64",
+     "available": [{"Package": "a", "Version": "1.0-1", "Depends": "b (>= 1.0)", "Uri": "repository/pool/a.deb"}],
+     "installed": [{"Package": "b", "Version": "1.0-1"}]}
+
+    Args:
+        fixture_path (str): path of the json fixture
+
+    Returns:
+        dict: the fixture content
+    """
+    with open(fixture_path, encoding="utf-8") as fixture_file:
+        return json.load(fixture_file)
+
+
+def load_fixture_index(fixture_path):
+    """Builds the package index from a package index fixture
+
+    Args:
+        fixture_path (str): path of the json fixture
+
+    Returns:
+        AptSnapshot: package index
+    """
+    fixture = read_index_fixture(fixture_path)
+    available = [(stanza, stanza.get("Uri")) for stanza in fixture.get("available", [])]
+    return build_package_index(available, fixture.get("installed", []), fixture.get("architecture"))
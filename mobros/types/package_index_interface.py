@@ -0,0 +1,96 @@
+"""Module defining the interface of the package index backends"""
+from abc import ABC, abstractmethod
+
+
+class PackageIndex(ABC):
+    """Interface of the package index backends, the only way the resolver reads the package universe.
+
+    The packages are returned as SnapshotPackage: their versions, the dependencies of each version, and the installed
+    version with the uri it was installed from. The virtual packages are resolved through the provides of the candidate
+    versions, like apt does.
+    """
+
+    @abstractmethod
+    def get(self, name, default=None):
+        """Get a package from the index
+
+        Args:
+            name (str): package name
+            default (optional): returned if the package is not found. Defaults to None.
+
+        Returns:
+            SnapshotPackage: the package or default if not found
+        """
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    @abstractmethod
+    def is_virtual_package(self, name):
+        """Checks if a package is virtual
+
+        Args:
+            name (str): package name
+
+        Returns:
+            bool: True if the package is virtual. False otherwise.
+        """
+
+    @abstractmethod
+    def get_providing_packages(self, name):
+        """Get the packages whose candidate version provides a virtual package
+
+        Args:
+            name (str): virtual package name
+
+        Returns:
+            list: list of providing SnapshotPackage
+        """
+
+    @abstractmethod
+    def is_installed(self, name):
+        """Checks if a package is installed
+
+        Args:
+            name (str): package name
+
+        Returns:
+            bool: True if the package is installed. False otherwise.
+        """
+
+    @abstractmethod
+    def get_installed_provider(self, name):
+        """Get the installed package providing a virtual package
+
+        Args:
+            name (str): virtual package name
+
+        Returns:
+            str: name of the installed providing package or None if no provider is installed
+        """
+
+    @abstractmethod
+    def get_installed_packages(self):
+        """Get all the installed packages
+
+        Returns:
+            list: list of installed SnapshotPackage
+        """
+
+    def get_installed_origin(self, name):
+        """Get the uri the installed version of a package was installed from
+
+        Args:
+            name (str): package name
+
+        Returns:
+            str: uri of the installed version, empty if unknown. None if the package is not installed.
+        """
+        package = self.get(name)
+        if package is None or not package.is_installed:
+            return None
+        return package.installed.uri or ""
@@ -0,0 +1,76 @@
+"""Module defining the per run index of the installed packages by the packages they depend on"""
+
+
+# pylint: disable=R0903
+class ReverseDependency:
+    """Class that abstracts an installed package depending on another package"""
+
+    def __init__(self, name, version, relation, dependency_version):
+        self.name = name
+        self.version = version
+        self.relation = relation
+        self.dependency_version = dependency_version
+
+    def __repr__(self):
+        """ToString method that returns a string representation of the object
+
+        Returns:
+            str: string representation of the object.
+        """
+        return "{" + self.name + "=" + self.version + ", " + self.relation + " " + self.dependency_version + "}"
+
+
+class ReverseDependencyIndex:
+    """Per run index that maps each package to the installed packages that depend on it"""
+
+    _instance = None
+    _source = None
+    _reverse_dependencies = {}
+
+    def __new__(cls):
+        """Singleton lock of instance"""
+        if cls._instance is None:
+            cls._instance = super(ReverseDependencyIndex, cls).__new__(cls)
+
+        return cls._instance
+
+    def get_reverse_dependencies(self, installed_packages, deb_name):
+        """Get the installed packages that depend on a package. The index is built once per installed packages list.
+
+        Args:
+            installed_packages (list): installed packages of the apt cache
+            deb_name (str): package name
+
+        Returns:
+            list: list of ReverseDependency, in the order of the installed packages
+        """
+        if installed_packages is not self._source:
+            ReverseDependencyIndex._reverse_dependencies = self.build(installed_packages)
+            ReverseDependencyIndex._source = installed_packages
+
+        return self._reverse_dependencies.get(deb_name, [])
+
+    @staticmethod
+    def build(installed_packages):
+        """Builds the reverse dependencies of the installed packages
+
+        Args:
+            installed_packages (list): installed packages of the apt cache
+
+        Returns:
+            dict: package name to list of ReverseDependency
+        """
+        reverse_dependencies = {}
+        for installed_pkg in installed_packages:
+            if not installed_pkg.is_installed:
+                continue
+
+            for dependency in installed_pkg.installed.dependencies:
+                for dep in dependency:
+                    if dep.name not in reverse_dependencies:
+                        reverse_dependencies[dep.name] = []
+
+                    reverse_dependencies[dep.name].append(
+                        ReverseDependency(installed_pkg.name, installed_pkg.installed.version, str(dep.relation), dep.version)
+                    )
+        return reverse_dependencies
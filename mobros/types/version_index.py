@@ -0,0 +1,122 @@
+"""Module defining the per run index of the package versions, not to order them on every lookup"""
+from mobros.utils.version_compare import compare_versions_by_key
+
+
+class PackageVersionIndex:
+    """Versions of a package ordered from the newest, with their dpkg ordering rank"""
+
+    def __init__(self, ordered_versions):
+        self.versions = list(ordered_versions)
+        self._ranks = {}
+        for position, version in enumerate(self.versions):
+            self._ranks[version] = len(self.versions) - 1 - position
+
+    def __contains__(self, version):
+        return version in self._ranks
+
+    def __len__(self):
+        return len(self.versions)
+
+    def rank(self, version):
+        """Get the dpkg ordering rank of a version. The higher the rank, the newer the version.
+
+        Args:
+            version (str): package version
+
+        Returns:
+            int: rank of the version or None if it's not a version of the package
+        """
+        return self._ranks.get(version)
+
+    def count_newer(self, version, included=False):
+        """Counts the versions of the package that are newer than the given version.
+
+        Args:
+            version (str): version to compare with. It does not need to be a version of the package.
+            included (bool, optional): also count the versions equal to it. Defaults to False.
+
+        Returns:
+            int: number of versions, from the start of the ordered list, newer (or equal) than the version
+        """
+        rank = self._ranks.get(version)
+        if rank is not None:
+            position = len(self.versions) - 1 - rank
+            return position + 1 if included else position
+
+        low = 0
+        high = len(self.versions)
+        while low < high:
+            middle = (low + high) // 2
+            compare_result = compare_versions_by_key(self.versions[middle], version)
+            if compare_result > 0 or (included and compare_result == 0):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def filter_by_limits(self, bottom_limit_rule, top_limit_rule):
+        """Filters the versions of the package through a 'greater than' and a 'lower than' rule.
+
+        Args:
+            bottom_limit_rule (dict): version and inclusion of the 'greater than' rule. None if there is no rule.
+            top_limit_rule (dict): version and inclusion of the 'lower than' rule. None if there is no rule.
+
+        Returns:
+            list: versions within the limits, ordered from the newest
+        """
+        start = 0
+        end = len(self.versions)
+        if top_limit_rule:
+            start = self.count_newer(top_limit_rule["version"], not top_limit_rule["included"])
+        if bottom_limit_rule:
+            end = self.count_newer(bottom_limit_rule["version"], bottom_limit_rule["included"])
+
+        return self.versions[start:end]
+
+
+# pylint: disable=R0903
+class VersionIndex:
+    """Per run index of the package versions"""
+
+    _instance = None
+    _packages = {}
+
+    def __new__(cls):
+        """Singleton lock of instance"""
+        if cls._instance is None:
+            cls._instance = super(VersionIndex, cls).__new__(cls)
+
+        return cls._instance
+
+    def get_index(self, deb_name, apt_versions, clean_function):
+        """Get the index of a package from its apt cache versions. They are only ordered the first time.
+
+        Args:
+            deb_name (str): package name
+            apt_versions (list): versions of the package in the apt cache format
+            clean_function (function): function that strips and orders the apt cache versions from the newest
+
+        Returns:
+            PackageVersionIndex: index of the package versions
+        """
+        source, index = self._packages.get(deb_name, (None, None))
+        if index is None or source is not apt_versions:
+            index = PackageVersionIndex(clean_function(apt_versions))
+            self._packages[deb_name] = (apt_versions, index)
+        return index
+
+    def get_ordered_index(self, deb_name, ordered_versions):
+        """Get the index of a package from a list of its versions, already ordered from the newest.
+
+        Args:
+            deb_name (str): package name
+            ordered_versions (list): package versions ordered from the newest
+
+        Returns:
+            PackageVersionIndex: index of the package versions
+        """
+        _, index = self._packages.get(deb_name, (None, None))
+        if index is None or index.versions != ordered_versions:
+            index = PackageVersionIndex(ordered_versions)
+            self._packages[deb_name] = (ordered_versions, index)
+        return index
@@ -0,0 +1,160 @@
+"""Module defining the version interval, the normalized form of the version rules of a package"""
+from mobros.utils.version_compare import compare_versions
+
+BOTTOM_OPERATORS = ("version_gte", "version_gt")
+TOP_OPERATORS = ("version_lte", "version_lt")
+
+
+def violates_bottom(version, bottom_rule):
+    """Checks if a version is below a 'greater than' rule
+
+    Args:
+        version (str): debian version
+        bottom_rule (version_rule): version_gte or version_gt rule
+
+    Returns:
+        bool: True if the version does not fulfill the rule. False otherwise.
+    """
+    compare_result = compare_versions(version, bottom_rule["version"])
+    if bottom_rule["operator"] == "version_gte":
+        return compare_result < 0
+    return compare_result < 1
+
+
+def violates_top(version, top_rule):
+    """Checks if a version is above a 'lower than' rule
+
+    Args:
+        version (str): debian version
+        top_rule (version_rule): version_lte or version_lt rule
+
+    Returns:
+        bool: True if the version does not fulfill the rule. False otherwise.
+    """
+    compare_result = compare_versions(top_rule["version"], version)
+    if top_rule["operator"] == "version_lte":
+        return compare_result < 0
+    return compare_result < 1
+
+
+def find_conflicting_rules(version_rules):
+    """Finds the rules responsible for a conflict, to be reported to the user. Equals rules are checked first
+    against each other, then against the edges, and finally the edges against each other.
+
+    Args:
+        version_rules (list): list of version rules of a package
+
+    Returns:
+        list: conflicting version rules. Empty if the rules do not conflict.
+    """
+    equals_rules = [rule for rule in version_rules if rule["operator"] == "version_eq"]
+    if len({rule["version"] for rule in equals_rules}) > 1:
+        return equals_rules
+
+    bottom_rules = [rule for rule in version_rules if rule["operator"] in BOTTOM_OPERATORS]
+    top_rules = [rule for rule in version_rules if rule["operator"] in TOP_OPERATORS]
+
+    if equals_rules:
+        pinned_rule = equals_rules[-1]
+        for edge_rules, violates in ((bottom_rules, violates_bottom), (top_rules, violates_top)):
+            hits = [rule for rule in edge_rules if violates(pinned_rule["version"], rule)]
+            if hits:
+                return hits + [pinned_rule]
+
+    for edge_rule in version_rules:
+        if edge_rule["operator"] in TOP_OPERATORS:
+            hits = [rule for rule in bottom_rules if violates_bottom(edge_rule["version"], rule)]
+        elif edge_rule["operator"] in BOTTOM_OPERATORS:
+            hits = [rule for rule in top_rules if violates_top(edge_rule["version"], rule)]
+        else:
+            continue
+        if hits:
+            return hits + [edge_rule]
+
+    return []
+
+
+class VersionInterval:
+    """Versions allowed by the rules of a package, kept as the highest bottom edge, the lowest top edge and the pinned
+    equals versions. Each rule added narrows it, so a conflict is detected as soon as the rule causing it is added.
+    """
+
+    def __init__(self, version_rules=()):
+        """Constructor
+
+        Args:
+            version_rules (list, optional): initial version rules. Defaults to ().
+        """
+        self.bottom = None
+        self.top = None
+        self.pinned = None
+        self.pinned_versions = set()
+        self.empty = False
+        for rule in version_rules:
+            self.add(rule)
+
+    def add(self, rule):
+        """Narrows the interval with a version rule
+
+        Args:
+            rule (version_rule): version rule
+
+        Returns:
+            bool: True if the interval is empty, meaning the rules conflict. False otherwise.
+        """
+        operator = rule["operator"]
+        if operator == "version_eq":
+            self.pinned_versions.add(rule["version"])
+            self.pinned = rule
+        elif operator in BOTTOM_OPERATORS:
+            if self.bottom is None or self._is_tighter_bottom(rule, self.bottom):
+                self.bottom = rule
+        elif operator in TOP_OPERATORS:
+            if self.top is None or self._is_tighter_top(rule, self.top):
+                self.top = rule
+        else:
+            return self.empty
+
+        self.empty = self.empty or self._is_empty()
+        return self.empty
+
+    def allows(self, version):
+        """Checks if a version is inside the interval
+
+        Args:
+            version (str): debian version
+
+        Returns:
+            bool: True if the version fulfills all the rules. False otherwise.
+        """
+        if self.empty or self.pinned_versions - {version}:
+            return False
+        if self.bottom and violates_bottom(version, self.bottom):
+            return False
+        return not (self.top and violates_top(version, self.top))
+
+    @staticmethod
+    def _is_tighter_bottom(rule, bottom):
+        compare_result = compare_versions(rule["version"], bottom["version"])
+        return compare_result > 0 or (compare_result == 0 and rule["operator"] == "version_gt")
+
+    @staticmethod
+    def _is_tighter_top(rule, top):
+        compare_result = compare_versions(rule["version"], top["version"])
+        return compare_result < 0 or (compare_result == 0 and rule["operator"] == "version_lt")
+
+    def _is_empty(self):
+        if len(self.pinned_versions) > 1:
+            return True
+
+        if self.pinned:
+            if self.bottom and violates_bottom(self.pinned["version"], self.bottom):
+                return True
+            if self.top and violates_top(self.pinned["version"], self.top):
+                return True
+
+        if self.bottom and self.top:
+            return violates_bottom(self.top["version"], self.bottom) or violates_top(
+                self.bottom["version"], self.top
+            )
+        return False
@@ -0,0 +1,126 @@
+"""Module defining the pool of worker processes used to parallelize the dependency resolution"""
+from math import ceil
+from multiprocessing import Pool, cpu_count, current_process
+from os import sched_getaffinity
+
+from mobros.constants import (
+    CGROUP_V1_CPU_PERIOD_PATH,
+    CGROUP_V1_CPU_QUOTA_PATH,
+    CGROUP_V2_CPU_MAX_PATH,
+    PARALLEL_CHUNKS_PER_WORKER,
+    PARALLEL_MIN_BATCH_SIZE,
+)
+from mobros.types.mobros_global_data import GlobalData
+
+
+def _read_first_line(file_path):
+    with open(file_path, encoding="utf-8") as file_handler:
+        return file_handler.readline().strip()
+
+
+def get_cgroup_cpu_limit():
+    """Get the cpu limit of the cgroup mobros runs in, from its cpu quota. Supports cgroup v2 and v1.
+
+    Returns:
+        int: number of cpus the quota allows, rounded up. None if there is no quota.
+    """
+    try:
+        quota, period = _read_first_line(CGROUP_V2_CPU_MAX_PATH).split()
+        if quota == "max":
+            return None
+        return max(1, ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        quota = int(_read_first_line(CGROUP_V1_CPU_QUOTA_PATH))
+        period = int(_read_first_line(CGROUP_V1_CPU_PERIOD_PATH))
+        if quota > 0 and period > 0:
+            return max(1, ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+def get_available_cpus():
+    """Get the number of cpus mobros can use. Unlike cpu_count, it takes in consideration the cpu affinity and the
+    cgroup cpu quota, so in containers it is not the number of cpus of the host.
+
+    Returns:
+        int: number of usable cpus
+    """
+    try:
+        cpus = len(sched_getaffinity(0))
+    except AttributeError:
+        cpus = cpu_count()
+
+    cgroup_limit = get_cgroup_cpu_limit()
+    if cgroup_limit:
+        cpus = min(cpus, cgroup_limit)
+    return max(1, cpus)
+
+
+class WorkerPool:
+    """Pool of worker processes. Between start and stop the pool is kept alive and reused by every parallel execution.
+    Outside of it, each parallel execution forks its own pool.
+
+    The workers are forked the first time they are needed, so they inherit the state loaded up to that point.
+    """
+
+    _instance = None
+    _pool = None
+    _persistent = False
+
+    def __new__(cls):
+        """Singleton lock of instance"""
+        if cls._instance is None:
+            cls._instance = super(WorkerPool, cls).__new__(cls)
+
+        return cls._instance
+
+    @staticmethod
+    def get_processes():
+        """Get the number of worker processes, either the configured jobs or the available cpus
+
+        Returns:
+            int: number of worker processes
+        """
+        return GlobalData().get_worker_jobs() or get_available_cpus()
+
+    def start(self):
+        """Keeps the pool alive, to be reused, until stop is called"""
+        WorkerPool._persistent = True
+
+    def stop(self):
+        """Stops the workers of the persistent pool, if they were forked"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+        WorkerPool._pool = None
+        WorkerPool._persistent = False
+
+    def map(self, function, items):
+        """Executes a function for each item. Batches too small to repay sending them to the workers are executed
+        in process.
+
+        Args:
+            function (function): function to execute. Must be picklable.
+            items (iterable): arguments of each execution
+
+        Returns:
+            list: results of the function, in the order of the items
+        """
+        items = list(items)
+        processes = self.get_processes()
+        if processes <= 1 or len(items) < PARALLEL_MIN_BATCH_SIZE or current_process().daemon:
+            return [function(item) for item in items]
+
+        chunksize = max(1, ceil(len(items) / (processes * PARALLEL_CHUNKS_PER_WORKER)))
+        if not self._persistent:
+            with Pool(processes=min(processes, ceil(len(items) / chunksize))) as pool:
+                return pool.map(function, items, chunksize)
+
+        if self._pool is None:
+            WorkerPool._pool = Pool(processes=processes)
+        return self._pool.map(function, items, chunksize)
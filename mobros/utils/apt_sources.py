@@ -0,0 +1,144 @@
+"""Module to read the configured apt sources, to be able to update only a subset of them"""
+import fnmatch
+from os import listdir, path
+
+import mobros.utils.logger as logging
+from mobros.constants import APT_SOURCES_LIST_PATH, APT_SOURCES_PARTS_PATH
+
+DEB822_OPTIONS_TRANSLATION = {
+    "Architectures": "arch",
+    "Signed-By": "signed-by",
+    "Trusted": "trusted",
+}
+
+
+def parse_one_line_sources(content):
+    """Parses the apt sources in the one line format (sources.list and *.list files)
+
+    Args:
+        content (str): content of the sources file
+
+    Returns:
+        list: list of (uri, one line source entry)
+    """
+    entries = []
+    for line in content.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line.startswith("deb"):
+            continue
+
+        tokens = line.split()
+        uri_index = 1
+        if len(tokens) > 1 and tokens[1].startswith("["):
+            while uri_index < len(tokens) and not tokens[uri_index].endswith("]"):
+                uri_index += 1
+            uri_index += 1
+
+        # the uri must be followed by at least the suite
+        if uri_index + 1 >= len(tokens):
+            logging.debug("[Apt sources] Skipping malformed source entry: " + line)
+            continue
+
+        entries.append((tokens[uri_index], line))
+    return entries
+
+
+def parse_deb822_sources(content):
+    """Parses the apt sources in the deb822 format (*.sources files), translating them into the one line format
+
+    Args:
+        content (str): content of the sources file
+
+    Returns:
+        list: list of (uri, one line source entry)
+    """
+    entries = []
+    for stanza in content.split("\n\n"):
+        fields = {}
+        last_field = None
+        for line in stanza.splitlines():
+            if line.startswith("#") or not line.strip():
+                continue
+            if line[0].isspace() and last_field:
+                fields[last_field] += "\n" + line.strip()
+                continue
+            last_field, value = line.split(":", 1)
+            fields[last_field] = value.strip()
+
+        if not fields.get("URIs") or fields.get("Enabled", "yes").lower() == "no":
+            continue
+
+        options = []
+        for field, option in DEB822_OPTIONS_TRANSLATION.items():
+            if field in fields:
+                if "\n" in fields[field]:
+                    logging.debug(
+                        "[Apt sources] Unable to translate inline " + field + " of " + fields["URIs"] + ". Skipping it."
+                    )
+                    options = None
+                    break
+                options.append(option + "=" + ",".join(fields[field].split()))
+
+        if options is None:
+            continue
+
+        options_str = " [" + " ".join(options) + "]" if options else ""
+        for source_type in fields.get("Types", "deb").split():
+            for uri in fields["URIs"].split():
+                for suite in fields.get("Suites", "").split():
+                    entries.append(
+                        (
+                            uri,
+                            source_type + options_str + " " + uri + " " + suite + " " + fields.get("Components", ""),
+                        )
+                    )
+    return entries
+
+
+def read_source_entries(sources_list_path=APT_SOURCES_LIST_PATH, sources_parts_path=APT_SOURCES_PARTS_PATH):
+    """Reads all the configured apt sources
+
+    Args:
+        sources_list_path (str, optional): main sources file. Defaults to APT_SOURCES_LIST_PATH.
+        sources_parts_path (str, optional): sources folder. Defaults to APT_SOURCES_PARTS_PATH.
+
+    Returns:
+        list: list of (uri, one line source entry)
+    """
+    sources_files = [sources_list_path]
+    if path.isdir(sources_parts_path):
+        sources_files.extend(path.join(sources_parts_path, part) for part in sorted(listdir(sources_parts_path)))
+
+    entries = []
+    for sources_file in sources_files:
+        if not path.isfile(sources_file):
+            continue
+
+        with open(sources_file, "r", encoding="utf8") as stream:
+            content = stream.read()
+
+        if sources_file.endswith(".sources"):
+            entries.extend(parse_deb822_sources(content))
+        elif sources_file.endswith(".list"):
+            entries.extend(parse_one_line_sources(content))
+
+    return entries
+
+
+def filter_source_entries(entries, source_patterns):
+    """Filters the apt sources by their uri
+
+    Args:
+        entries (list): list of (uri, one line source entry)
+        source_patterns (list): uri patterns of the sources to keep
+
+    Returns:
+        list: one line source entries matching any of the patterns
+    """
+    selected = []
+    for uri, entry in entries:
+        for pattern in source_patterns:
+            if fnmatch.fnmatch(uri, pattern) or fnmatch.fnmatch(uri.rstrip("/"), pattern.rstrip("/")):
+                selected.append(entry)
+                break
+    return selected
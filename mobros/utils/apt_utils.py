@@ -1,11 +1,14 @@
 """Module that contains utilitary functions to deal with apt releated operations"""
 import sys
 from os import path
-from apt import debfile
 import mobros.utils.logger as logging
 from mobros.constants import OPERATION_TRANSLATION_TABLE
 from mobros.types.apt_cache_singleton import AptCache
+from mobros.types.candidate_cache import CandidateCache, canonicalize_version_rules
+from mobros.types.installed_state import InstalledState
 from mobros.types.mobros_global_data import GlobalData
+from mobros.types.reverse_dependency_index import ReverseDependencyIndex
+from mobros.types.version_index import VersionIndex
 from mobros.utils.utilitary import execute_shell_command
 from mobros.utils import version_utils
 from mobros.exceptions import InstallCandidateNotFoundException
@@ -35,9 +38,21 @@ def get_providing_packages(deb_name):
     cache = AptCache().get_cache()
     return cache.get_providing_packages(deb_name)
 
+def get_installed_provider(deb_name):
+    """Get the installed package from which the virtual is pointing to.
+
+    Args:
+        deb_name (str): package name (has to be virtual)
+
+    Returns:
+        str: name of the installed package that the virtual is pointing to or None if none is installed
+    """
+    cache = AptCache().get_cache()
+    return cache.get_installed_provider(deb_name)
+
 def find_candidate_online(deb_name, version_rules):
     """Function that is able to find the candidate version from the apt cache that passes
-    the version rules from all dependencies in the workspace
+    the version rules from all dependencies in the workspace. The outcome is cached for the package and its rules.
 
     Args:
         deb_name (str): debian package name
@@ -53,7 +68,39 @@ def find_candidate_online(deb_name, version_rules):
         msg += "Tip: Check if mobros was able to update your apt cache (apt update)! Either run mobros with sudo or execute 'apt update' beforehand"
         raise InstallCandidateNotFoundException(msg)
 
-    remaining_versions, top_rule_message, bottom_rule_message, equals_rule_mesage = version_utils.filter_versions_by_rules(avaiable_versions, version_rules, deb_name)
+    version_index = VersionIndex().get_ordered_index(deb_name, avaiable_versions)
+    rules_fingerprint, canonical_rules = canonicalize_version_rules(version_rules)
+    candidate_cache = CandidateCache()
+
+    cached_outcome = candidate_cache.get(deb_name, rules_fingerprint, version_index)
+    if cached_outcome is not None:
+        candidates, error_message = cached_outcome
+        if error_message is not None:
+            raise InstallCandidateNotFoundException(error_message)
+        return list(candidates)
+
+    try:
+        candidates = select_candidates(deb_name, canonical_rules, avaiable_versions, version_index)
+    except InstallCandidateNotFoundException as e:
+        candidate_cache.store(deb_name, rules_fingerprint, version_index, [], e.message)
+        raise
+
+    candidate_cache.store(deb_name, rules_fingerprint, version_index, candidates)
+    return list(candidates)
+
+def select_candidates(deb_name, version_rules, avaiable_versions, version_index):
+    """Function that filters the available versions of a package by the version rules
+
+    Args:
+        deb_name (str): debian package name
+        version_rules (list): list of all version rules from the workspace
+        avaiable_versions (list): available versions of the package, ordered from the newest
+        version_index (PackageVersionIndex): index of the available versions
+
+    Returns:
+        list: The candidate versions, ordered from the newest
+    """
+    remaining_versions, top_rule_message, bottom_rule_message, equals_rule_mesage = version_utils.filter_versions_by_rules(avaiable_versions, version_rules, deb_name, version_index)
 
     if equals_rule_mesage != "":
         raise InstallCandidateNotFoundException(equals_rule_mesage)
@@ -114,7 +161,6 @@ def check_from_virtual_a_solution(or_dependencies):
     virtual_translated_list= None
     virtual_detected=False
     g_data = GlobalData()
-    virtual_providing_installed = None
     for or_dep in or_dependencies:
 
         if is_virtual_package(or_dep.name):
@@ -124,12 +170,10 @@ def check_from_virtual_a_solution(or_dependencies):
                 virtual_translated_list = providing_packages
 
                 for pkg in providing_packages:
-                    if is_package_already_installed(pkg.name):
-                        virtual_providing_installed = pkg.name
-
                     if g_data.is_package_user_requested(pkg.name):
                         return CustomDebDependency(pkg.name, "", "")
 
+                virtual_providing_installed = get_installed_provider(or_dep.name)
                 if virtual_providing_installed:
                     return CustomDebDependency(virtual_providing_installed, "", "")
         else:
@@ -233,6 +277,19 @@ def inspect_package_dependencies(dependencies, deb_name, deb_version, upgrade_in
 
     return package_dependencies
 
+def open_local_deb(deb_path):
+    """Opens a local debian file through python-apt, which is only imported when local debians are used
+
+    Args:
+        deb_path (str): full path to local debian
+
+    Returns:
+        apt.debfile.DebPackage: the opened debian
+    """
+    from apt import debfile  # pylint: disable=C0415
+
+    return debfile.DebPackage(deb_path)
+
 def get_local_deb_name_version(deb_path):
     """Get local debian name and version
 
@@ -243,7 +300,7 @@ def get_local_deb_name_version(deb_path):
         [str: debian name, str: debian version] 
     """
     if path.isfile(deb_path):
-        deb_obj = debfile.DebPackage(deb_path)
+        deb_obj = open_local_deb(deb_path)
     else:
         logging.error("File " + deb_path + " not found")
         sys.exit(1)
@@ -260,7 +317,7 @@ def get_local_deb_info(deb_path):
         [str: debian name, str: debian version, list: list of dependencies] 
     """
 
-    deb_obj = debfile.DebPackage(deb_path)
+    deb_obj = open_local_deb(deb_path)
     dependencies = deb_obj.depends
     apt_dependencies = []
     for or_deps in dependencies:
@@ -353,13 +410,20 @@ def is_package_already_installed(deb_name, version=None):
     Returns:
         bool: True if package is installed. False otherwise
     """
-    cache = AptCache().get_cache()
-    package = cache.get(deb_name)
-    if package:
-        if version:
-            return package.is_installed and package.installed.version == version
-        return package.is_installed
-    return False
+    return InstalledState().is_installed(deb_name, version or None)
+
+def is_provided_by_installed_package(deb_name):
+    """Checks, from the installed state only, if the debian is a virtual package provided by an installed package.
+
+    Args:
+        deb_name (str): debian name
+
+    Returns:
+        bool: True if the debian is not installed itself but an installed package provides it. False otherwise
+    """
+    if is_package_already_installed(deb_name):
+        return False
+    return len(InstalledState().get_installed_providers(deb_name)) > 0
 
 def is_package_local_file(deb_name):
     """Checks if the package name is a path to a package
@@ -381,11 +445,7 @@ def get_package_installed_version(deb_name):
     Returns:
         str: installed version of the debian or None if not installed
     """
-    cache = AptCache().get_cache()
-    package = cache.get(deb_name)
-    if package and package.is_installed:
-        return package.installed.version
-    return None
+    return InstalledState().get_installed_version(deb_name)
 
 
 def get_package_available_versions(deb_name):
@@ -401,8 +461,7 @@ def get_package_available_versions(deb_name):
     package = cache.get(deb_name)
 
     if package is not None:
-
-        return clean_apt_versions(package.versions)
+        return list(VersionIndex().get_index(deb_name, package.versions, clean_apt_versions).versions)
 
     return []
 
@@ -416,18 +475,15 @@ def get_package_origin(deb_name):
     Returns:
         str: Package origin
     """
-    cache = AptCache().get_cache()
-    package = cache.get(deb_name)
-    if package:
-        if package.is_installed:
-            dirty_pkg_source = package.versions.get(package.installed.version).uri
-            clean_source = ""
-            if dirty_pkg_source:
-                dirty_pkg_source = dirty_pkg_source.replace('https://', '')
-                clean_source = dirty_pkg_source.split("/pool")[0]
-            return clean_source
+    dirty_pkg_source = AptCache().get_cache().get_installed_origin(deb_name)
+    if dirty_pkg_source is None:
+        return None
 
-    return None
+    clean_source = ""
+    if dirty_pkg_source:
+        dirty_pkg_source = dirty_pkg_source.replace('https://', '')
+        clean_source = dirty_pkg_source.split("/pool")[0]
+    return clean_source
 
 def find_candidates_online_fullfilling_dependency(deb_name, decisive_dependency_name, dep_version_rule):
     """Function that finds all candidates online that fullfill a dependency based on version rules
@@ -453,28 +509,33 @@ def find_candidates_online_fullfilling_dependency(deb_name, decisive_dependency_
 
     return candidate_list
 
-# pylint: disable=R1702
+def index_installed_reverse_dependencies():
+    """Function that builds the index of the installed packages by the packages they depend on, if not built yet."""
+    ReverseDependencyIndex().get_reverse_dependencies(AptCache().get_installed_cache(), "")
+
+
 def package_impacts_installed_dependencies(package_to_inspect):
     """Function that verifies if a package impacts an installed package"""
 
     deb_name = package_to_inspect[0]
     deb_version = package_to_inspect[1]["version"]
-    cache_installed = AptCache().get_installed_cache()
-
-    for cached_pkg in cache_installed: # pylint: disable=not-an-iterable
-        if cached_pkg.is_installed:
-            for dependency in cached_pkg.installed.dependencies:
-                # Do not forget to implement a good or handling here
-                for dep in dependency:
-                    if dep.name == deb_name:
-                        dep_version_rule = version_utils.create_version_rule(OPERATION_TRANSLATION_TABLE[str(dep.relation)], dep.version, "")
-                        if not is_package_already_installed(deb_name, deb_version) and version_utils.version_impacts_version_rules(deb_version, [dep_version_rule]):
-                            if not GlobalData().is_package_user_requested(cached_pkg.name):
-
-                                logging.warning("Package " + deb_name + "="+ deb_version+" impacts installed package " + cached_pkg.name + " " + cached_pkg.installed.version)
-                                logging.warning("which requires " + str(dep.name) + " (" + str(dep.relation) + " " + str(dep.version) + ")" )
-                                dependency_info = { "name": dep.name, "version": dep.version, "operation": OPERATION_TRANSLATION_TABLE[str(dep.relation)]}
-                                return {"name": cached_pkg.name, "version": cached_pkg.installed.version, "dependency": dependency_info}
+    reverse_dependencies = ReverseDependencyIndex().get_reverse_dependencies(
+        AptCache().get_installed_cache(), deb_name
+    )
+
+    if not reverse_dependencies or is_package_already_installed(deb_name, deb_version):
+        return None
+
+    for reverse_dep in reverse_dependencies:
+        operation = OPERATION_TRANSLATION_TABLE[reverse_dep.relation]
+        dep_version_rule = version_utils.create_version_rule(operation, reverse_dep.dependency_version, "")
+        if version_utils.version_impacts_version_rules(deb_version, [dep_version_rule]):
+            if not GlobalData().is_package_user_requested(reverse_dep.name):
+
+                logging.warning("Package " + deb_name + "="+ deb_version+" impacts installed package " + reverse_dep.name + " " + reverse_dep.version)
+                logging.warning("which requires " + deb_name + " (" + reverse_dep.relation + " " + str(reverse_dep.dependency_version) + ")" )
+                dependency_info = { "name": deb_name, "version": reverse_dep.dependency_version, "operation": operation}
+                return {"name": reverse_dep.name, "version": reverse_dep.version, "dependency": dependency_info}
     return None
 
 
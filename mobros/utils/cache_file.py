@@ -0,0 +1,93 @@
+"""Module with utilitary functions to persist the mobros caches between runs, shared by the apt snapshot, the rosdep
+translations and the workspace index"""
+from os import getpid, makedirs, path, remove, replace, stat
+
+import mobros.utils.logger as logging
+
+
+def update_files_fingerprint(fingerprint, tracked_files):
+    """Adds the path, size and modification time of files to a fingerprint. The missing files are left out.
+
+    Args:
+        fingerprint (hashlib.sha1): fingerprint to update
+        tracked_files (list): paths of the files the cache depends on
+    """
+    for tracked_file in tracked_files:
+        if path.isfile(tracked_file):
+            file_stat = stat(tracked_file)
+            fingerprint.update(
+                (tracked_file + "|" + str(file_stat.st_size) + "|" + str(file_stat.st_mtime_ns)).encode()
+            )
+
+
+def remove_cache_file(cache_path, log_prefix, description):
+    """Removes a cache file. Failing to remove it is not an error, the cache is only an optimization.
+
+    Args:
+        cache_path (str): path of the cache file
+        log_prefix (str): prefix of the debug logs, like [Rosdep cache]
+        description (str): name of the cache in the debug logs
+
+    Returns:
+        bool: True if the file was removed. False otherwise.
+    """
+    try:
+        remove(cache_path)
+        return True
+    except OSError as e:
+        logging.debug(log_prefix + " Unable to remove the " + description + " " + cache_path + ". " + str(e))
+        return False
+
+
+def load_cache_file(cache_path, load_function, log_prefix, description, errors=(OSError, ValueError)):
+    """Loads a cache file stored by a previous run. An invalid cache file is removed, not to be read again.
+
+    Args:
+        cache_path (str): path of the cache file
+        load_function (function): reads the cache from its path. Raises one of the errors if the cache is invalid.
+        log_prefix (str): prefix of the debug logs, like [Rosdep cache]
+        description (str): name of the cache in the debug logs
+        errors (tuple, optional): exceptions of an invalid cache. Defaults to (OSError, ValueError).
+
+    Returns:
+        object: the value returned by load_function or None if there is no valid cache file.
+    """
+    if not path.isfile(cache_path):
+        return None
+
+    try:
+        return load_function(cache_path)
+    except errors as e:
+        logging.debug(log_prefix + " Discarding invalid " + description + " " + cache_path + ". " + str(e))
+        remove_cache_file(cache_path, log_prefix, description)
+        return None
+
+
+def write_cache_file(cache_path, write_function, log_prefix, description, binary=False):
+    """Stores a cache file for the next runs. Written to a temporary file of the process first and then moved in place,
+    so concurrent runs never read a partial cache.
+
+    Args:
+        cache_path (str): path of the cache file
+        write_function (function): writes the cache to the opened file
+        log_prefix (str): prefix of the debug logs, like [Rosdep cache]
+        description (str): name of the cache in the debug logs
+        binary (bool, optional): open the file in binary mode. Defaults to False.
+
+    Returns:
+        bool: True if the cache was stored. False otherwise.
+    """
+    tmp_path = cache_path + "." + str(getpid()) + ".tmp"
+    try:
+        makedirs(path.dirname(cache_path), exist_ok=True)
+        if binary:
+            with open(tmp_path, "wb") as cache_file:
+                write_function(cache_file)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                write_function(cache_file)
+        replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        logging.debug(log_prefix + " Unable to store the " + description + ". " + str(e))
+        return False
@@ -0,0 +1,167 @@
+"""Module with utilitary functions to read debian control files, like the dpkg status file and the apt Packages lists"""
+
+try:
+    import apt_pkg
+except ImportError:
+    apt_pkg = None
+
+# dpkg states in which the package has no installed version
+DPKG_NOT_INSTALLED_STATES = ("not-installed", "config-files")
+DEPENDENCY_RELATION_TRANSLATION = {">>": ">", "<<": "<"}
+
+
+def get_native_architecture():
+    """Get the native architecture of the system, the one whose packages are named without the architecture suffix
+
+    Returns:
+        str: native architecture or None if it can not be determined
+    """
+    if apt_pkg is None:
+        return None
+
+    if "APT" not in apt_pkg.config:
+        apt_pkg.init_config()
+    return apt_pkg.config.find("APT::Architecture") or None
+
+
+def get_apt_architectures():
+    """Get the architectures apt handles, the native one and the foreign ones added to dpkg
+
+    Returns:
+        list: list of architectures, empty if they can not be determined
+    """
+    if apt_pkg is None:
+        return []
+
+    if "APT" not in apt_pkg.config:
+        apt_pkg.init_config()
+    return apt_pkg.get_architectures()
+
+
+def get_package_fullname(stanza, native_architecture):
+    """Get the name of the package of a stanza like apt names it, qualified with the architecture when foreign.
+
+    Args:
+        stanza (dict): fields of the stanza
+        native_architecture (str): native architecture of the system. None to never qualify the name.
+
+    Returns:
+        str: package name
+    """
+    name = stanza["Package"]
+    architecture = stanza.get("Architecture", "all")
+    if native_architecture and architecture not in ("all", native_architecture):
+        name += ":" + architecture
+    return name
+
+
+def read_stanzas(stream, fields=None):
+    """Streams the stanzas of a control file, line by line.
+
+    Args:
+        stream (iterable): lines of the control file
+        fields (tuple, optional): fields to keep. Defaults to None, keeping all of them.
+
+    Yields:
+        dict: field name to value of each stanza
+    """
+    stanza = {}
+    field = None
+
+    for line in stream:
+        if line[0] in " \t":
+            if field:
+                stanza[field] += " " + line.strip()
+            continue
+
+        if line in ("\n", "\r\n"):
+            if stanza:
+                yield stanza
+            stanza = {}
+            field = None
+            continue
+
+        field, _, value = line.partition(":")
+        if fields is None or field in fields:
+            stanza[field] = value.strip()
+        else:
+            field = None
+
+    if stanza:
+        yield stanza
+
+
+def is_installed_stanza(stanza):
+    """Checks if a dpkg status stanza is of an installed package. Stanzas without status are considered installed.
+
+    Args:
+        stanza (dict): fields of the stanza
+
+    Returns:
+        bool: True if the package has an installed version. False otherwise
+    """
+    if "Status" not in stanza:
+        return True
+    status = stanza["Status"].split()
+    return len(status) == 3 and status[2] not in DPKG_NOT_INSTALLED_STATES
+
+
+def parse_depends(depends):
+    """Parses a dependency field, like Depends or Conflicts
+
+    Args:
+        depends (str): dependency field, like "python3 (>= 3.8), libc6 | libc6-compat"
+
+    Returns:
+        list: list of or groups, each being a list of (name, relation, version)
+    """
+    dependencies = []
+    for group in depends.split(","):
+        or_group = []
+        for alternative in group.split("|"):
+            name, _, restriction = alternative.partition("(")
+            relation = version = ""
+            if restriction:
+                restriction = restriction.rstrip(") ").strip()
+                version = restriction.lstrip("<>=").strip()
+                relation = restriction[: len(restriction) - len(restriction.lstrip("<>="))]
+                relation = DEPENDENCY_RELATION_TRANSLATION.get(relation, relation)
+            name = name.split("[")[0].strip()
+            if name:
+                or_group.append((name, relation, version))
+        if or_group:
+            dependencies.append(or_group)
+    return dependencies
+
+
+def parse_provides(provides):
+    """Parses a Provides field
+
+    Args:
+        provides (str): provides field, like "python3-any (= 3.8), python3-api"
+
+    Returns:
+        list: names of the provided packages
+    """
+    provided = []
+    for entry in provides.split(","):
+        name = entry.split("(")[0].strip()
+        if name:
+            provided.append(name)
+    return provided
+
+
+def get_stanza_provides(stanza):
+    """Get the packages a stanza provides. Like apt, packages that are Multi-Arch allowed also provide the
+    :any qualified name of themselves and of the packages they provide.
+
+    Args:
+        stanza (dict): fields of the stanza
+
+    Returns:
+        list: names of the provided packages
+    """
+    provided = parse_provides(stanza.get("Provides", ""))
+    if stanza.get("Multi-Arch") == "allowed":
+        provided += [name + ":any" for name in [stanza["Package"]] + provided]
+    return provided
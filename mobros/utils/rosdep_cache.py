@@ -0,0 +1,245 @@
+"""Module to persist the rosdep translations between runs, not to call rosdep for names it already translated"""
+import hashlib
+import json
+import time
+from os import environ, listdir, path, pathsep
+
+import mobros.utils.logger as logging
+from mobros.constants import (
+    MOBROS_CACHE_PATH,
+    OS_RELEASE_PATH,
+    ROSDEP_CACHE_PREFIX,
+    ROSDEP_CACHE_SUFFIX,
+    ROSDEP_SOURCES_CACHE_DIR,
+    ROSDEP_SOURCES_LIST_PATH,
+    RosdepUpdateMode,
+)
+from mobros.utils.cache_file import load_cache_file, remove_cache_file, update_files_fingerprint, write_cache_file
+
+ROSDEP_CACHE_LOG_PREFIX = "[Rosdep cache]"
+
+
+def get_rosdep_sources_cache_path():
+    """Get the folder where rosdep update stores the rosdep sources. It is inside the ros home, like rosdep does.
+
+    Returns:
+        str: rosdep sources cache folder
+    """
+    ros_home = environ.get("ROS_HOME", path.join(path.expanduser("~"), ".ros"))
+    return path.join(ros_home, ROSDEP_SOURCES_CACHE_DIR)
+
+
+def get_rosdep_sources_list_paths():
+    """Get the folders with the rosdep sources lists. ROSDEP_SOURCE_PATH overrides them, like it does in rosdep.
+
+    Returns:
+        list: rosdep sources list folders
+    """
+    if environ.get("ROSDEP_SOURCE_PATH"):
+        return environ["ROSDEP_SOURCE_PATH"].split(pathsep)
+    return [ROSDEP_SOURCES_LIST_PATH]
+
+
+def get_rosdep_sources_age(sources_cache_path=None):
+    """Computes how long ago rosdep update refreshed the rosdep sources, based on the newest file of its cache.
+
+    Args:
+        sources_cache_path (str, optional): rosdep sources cache folder. Defaults to the one of the ros home.
+
+    Returns:
+        float: age in minutes of the rosdep sources. None if there is no sources cache.
+    """
+    if sources_cache_path is None:
+        sources_cache_path = get_rosdep_sources_cache_path()
+    if not path.isdir(sources_cache_path):
+        return None
+
+    newest_source = None
+    for cache_file in listdir(sources_cache_path):
+        source_mtime = path.getmtime(path.join(sources_cache_path, cache_file))
+        if newest_source is None or source_mtime > newest_source:
+            newest_source = source_mtime
+
+    if newest_source is None:
+        return None
+
+    return (time.time() - newest_source) / 60
+
+
+def is_rosdep_update_required(update_mode, max_age, sources_cache_path=None):
+    """Decides if the rosdep sources need to be updated based on the update policy
+
+    Args:
+        update_mode (RosdepUpdateMode): rosdep update mode
+        max_age (int): maximum age, in minutes, of the rosdep sources in auto mode
+        sources_cache_path (str, optional): rosdep sources cache folder. Defaults to the one of the ros home.
+
+    Returns:
+        bool: True if rosdep update should be executed. False otherwise.
+    """
+    if update_mode == RosdepUpdateMode.ALWAYS:
+        return True
+
+    if update_mode == RosdepUpdateMode.NEVER:
+        logging.debug("[Rosdep cache] Rosdep update disabled. Using the current rosdep sources.")
+        return False
+
+    sources_age = get_rosdep_sources_age(sources_cache_path)
+    if sources_age is None:
+        logging.debug("[Rosdep cache] No rosdep sources cache found. Rosdep update required.")
+        return True
+
+    if sources_age < max_age:
+        logging.debug(
+            "[Rosdep cache] Rosdep sources were updated "
+            + str(int(sources_age))
+            + " minutes ago (max age "
+            + str(max_age)
+            + "). Skipping rosdep update."
+        )
+        return False
+
+    return True
+
+
+def get_os_codename(os_release_path=OS_RELEASE_PATH):
+    """Get the codename of the operating system, which rosdep resolves the rules for
+
+    Args:
+        os_release_path (str, optional): os-release file. Defaults to OS_RELEASE_PATH.
+
+    Returns:
+        str: os codename. Empty if unknown.
+    """
+    if not path.isfile(os_release_path):
+        return ""
+
+    with open(os_release_path, encoding="utf-8") as os_release_file:
+        for line in os_release_file:
+            if line.startswith("VERSION_CODENAME="):
+                return line.split("=", 1)[1].strip().strip('"')
+    return ""
+
+
+def compute_rosdep_fingerprint(sources_cache_path=None, sources_list_paths=None):
+    """Computes a fingerprint of what the rosdep translations depend on: the ros distro, the os codename and the
+    rosdep sources. It changes whenever rosdep update or a new sources list touch them.
+
+    Args:
+        sources_cache_path (str, optional): rosdep sources cache folder. Defaults to the one of the ros home.
+        sources_list_paths (list, optional): rosdep sources list folders. Defaults to the system ones.
+
+    Returns:
+        str: hex digest identifying the current rosdep translations
+    """
+    if sources_cache_path is None:
+        sources_cache_path = get_rosdep_sources_cache_path()
+    if sources_list_paths is None:
+        sources_list_paths = get_rosdep_sources_list_paths()
+
+    fingerprint = hashlib.sha1()
+    fingerprint.update(
+        (
+            environ.get("ROS_DISTRO", "")
+            + "|" + environ.get("ROS_OS_OVERRIDE", "")
+            + "|" + get_os_codename()
+        ).encode()
+    )
+
+    tracked_files = []
+    for tracked_folder in [sources_cache_path, *sources_list_paths]:
+        if path.isdir(tracked_folder):
+            for tracked_file in sorted(listdir(tracked_folder)):
+                tracked_files.append(path.join(tracked_folder, tracked_file))
+
+    update_files_fingerprint(fingerprint, tracked_files)
+    return fingerprint.hexdigest()
+
+
+def get_translation_cache_path(fingerprint):
+    """Get the path where the translations of a given rosdep fingerprint are stored
+
+    Args:
+        fingerprint (str): rosdep fingerprint
+
+    Returns:
+        str: full path of the translation cache file
+    """
+    return path.join(MOBROS_CACHE_PATH, ROSDEP_CACHE_PREFIX + fingerprint + ROSDEP_CACHE_SUFFIX)
+
+
+def load_translation_cache(fingerprint):
+    """Loads the translations stored by previous runs with the same rosdep fingerprint
+
+    Args:
+        fingerprint (str): rosdep fingerprint
+
+    Returns:
+        dict: catkin package name to its list of debian package names, or None if rosdep has no rule for it.
+            Empty if nothing is stored.
+    """
+    translations = load_cache_file(
+        get_translation_cache_path(fingerprint), _read_translations, ROSDEP_CACHE_LOG_PREFIX, "translation cache"
+    )
+    return translations if translations is not None else {}
+
+
+def _read_translations(cache_path):
+    """Reads a stored translation cache
+
+    Args:
+        cache_path (str): path of the translation cache file
+
+    Returns:
+        dict: catkin package name to its list of debian package names, or None if rosdep has no rule for it.
+
+    Raises:
+        ValueError: if the file is not a translation cache
+    """
+    with open(cache_path, encoding="utf-8") as cache_file:
+        translations = json.load(cache_file)
+    if not isinstance(translations, dict):
+        raise ValueError("Not a rosdep translation cache")
+    return translations
+
+
+def store_translation_cache(translations, fingerprint):
+    """Adds translations to the ones stored for the fingerprint, and removes the ones of older rosdep fingerprints.
+
+    Args:
+        translations (dict): catkin package name to its list of debian package names, or None if rosdep has no
+            rule for it.
+        fingerprint (str): rosdep fingerprint
+    """
+    if not translations:
+        return
+
+    cache_path = get_translation_cache_path(fingerprint)
+    stored_translations = load_translation_cache(fingerprint)
+    stored_translations.update(translations)
+    remove_translation_caches(keep_path=cache_path)
+    write_cache_file(
+        cache_path,
+        lambda cache_file: json.dump(stored_translations, cache_file),
+        ROSDEP_CACHE_LOG_PREFIX,
+        "translation cache",
+    )
+
+
+def remove_translation_caches(keep_path=None):
+    """Removes the stored translation caches. Temporary files of concurrent runs are left alone.
+
+    Args:
+        keep_path (str, optional): translation cache to keep. Defaults to None.
+    """
+    if not path.isdir(MOBROS_CACHE_PATH):
+        return
+
+    for cache_file in listdir(MOBROS_CACHE_PATH):
+        cache_path = path.join(MOBROS_CACHE_PATH, cache_file)
+        if (
+            cache_file.startswith(ROSDEP_CACHE_PREFIX)
+            and cache_file.endswith(ROSDEP_CACHE_SUFFIX)
+            and cache_path != keep_path
+        ):
+            remove_cache_file(cache_path, ROSDEP_CACHE_LOG_PREFIX, "translation cache")
@@ -1,82 +1,20 @@
 """Module for tree operation utilitary"""
-from anytree import LevelOrderGroupIter, Node, PreOrderIter
-from pydpkg import Dpkg
-
 import mobros.utils.logger as logging
+from mobros.utils.version_compare import compare_versions
 
 
-def is_node_under_other(node, sub_node):
-    """Checks if node is a branch parent throughout the whole tree of a sub_node
+def is_node_under_other(dependency_graph, node_name, sub_node_name):
+    """Checks if a node is under other, throughout the whole dependency graph
 
     Args:
-        node (Node): upper node
-        sub_node (Node): sub node
+        dependency_graph (DependencyGraph): dependency graph of the dependency manager
+        node_name (str): lower node
+        sub_node_name (str): upper node
 
     Returns:
-        bool: True if node is indirectly/directly on top of sub_node
-    """
-    str_node = str(node)
-    str_sub_node_anchor = "/" + sub_node.name + "/"
-    return str_sub_node_anchor in str_node
-
-
-def overwrite_node_in_global_map(tree_map, node_name, parent_name, new_node, overwrite):
-    """Overwrite node in the map used by the dependency tree.
-
-    Args:
-        tree_map (map): Global map that registers all known nodes
-        node_name (str): name of the node that will be overwritten
-        parent_name (str): parent of the node that we want to overwrite
-        new_node (Node): Node that will be used to overwrite the old one
-    """
-    if overwrite:
-        for e in tree_map[node_name]:
-            if e.parent.name == parent_name:
-                tree_map[node_name].remove(e)
-                e.parent = None
-
-    tree_map[node_name].append(new_node)
-
-
-def clone_subtree(tree_map, tree_to_copy_from, new_node, overwrite=True):
-    """clones the whole subtree into another tree node.
-
-    Args:
-        tree_map (map): Global map that registers all known nodes
-        tree_to_copy_from (Node): node from where the sub tree will be cloned
-        new_node (Node): target node that will contain a clone of the source tree
-    """
-    local_map = {}
-    for layers in LevelOrderGroupIter(
-        tree_to_copy_from, filter_=lambda n: n.name != tree_to_copy_from.name
-    ):
-        for layer in layers:
-            if layer.parent.name == new_node.name:
-                local_map[layer.name] = Node(layer.name, new_node)
-            else:
-                local_map[layer.name] = Node(layer.name, local_map[layer.parent.name])
-
-            overwrite_node_in_global_map(
-                tree_map,
-                layer.name,
-                layer.parent.name,
-                local_map[layer.name],
-                overwrite,
-            )
-
-
-def remove_node_from_lost(tree_map, package_name, lost_nodes_root):
-    """_summary_
-
-    Args:
-        tree_map (map): Global map that registers all known nodes
-        package_name (str): Package name to be removed from the global tree map
-        lost_nodes_root (Node): Node root of all packages that are lost during the dependency scanning.
+        bool: True if sub_node is indirectly/directly on top of node
     """
-    for e in tree_map[package_name]:
-        if e.parent == lost_nodes_root:
-            e.parent = None
-            tree_map[package_name].remove(e)
+    return dependency_graph.is_upstream(sub_node_name, node_name)
 
 
 # pylint: disable=R0911
@@ -117,7 +55,7 @@ def check_if_needs_recalc_tree_branch(dep_name, version_rules, dependency_manage
         if rule["operator"] in ["version_lt", "version_lte"]:
             # A lower than B = -1
             # A higher than B = 1
-            compare_result = Dpkg.compare_versions(
+            compare_result = compare_versions(
                 rule["version"],
                 dependency_manager.install_candidates[dep_name]["version"],
             )
@@ -138,7 +76,7 @@ def check_if_needs_recalc_tree_branch(dep_name, version_rules, dependency_manage
                 return True
 
         if rule["operator"] in ["version_gt", "version_gte"]:
-            compare_result = Dpkg.compare_versions(
+            compare_result = compare_versions(
                 rule["version"],
                 dependency_manager.install_candidates[dep_name]["version"],
             )
@@ -173,7 +111,7 @@ def remove_tree_node_fingerprint(dep_name, version_rule, dependency_manager):
     )
 
     # removing all traces of dependency
-    dependency_manager.dependency_bank[dep_name].remove(version_rule)
+    dependency_manager.dependency_bank.remove_rule(dep_name, version_rule)
 
     # marked_for_removal= []
     # for install_candidate_compro in dependency_manager.possible_install_candidate_compromised:
@@ -191,73 +129,50 @@ def remove_tree_node_fingerprint(dep_name, version_rule, dependency_manager):
     #         removal_cand
     #     )
 
-    if dep_name in dependency_manager.possible_install_candidate_compromised:
-        dependency_manager.possible_install_candidate_compromised.remove(dep_name)
-
-    if dep_name in dependency_manager.possible_colision:
-        dependency_manager.possible_colision.remove(dep_name)
-    if dep_name in dependency_manager.node_map:
-        to_remove = []
-        for node_instance in dependency_manager.node_map[dep_name]:
-            if node_instance.parent.name != "/":
-                node_instance.parent = None
-                to_remove.append(node_instance)
-
-        for node_r in to_remove:
-            dependency_manager.node_map[dep_name].remove(node_r)
+    dependency_manager.possible_install_candidate_compromised.discard(dep_name)
+    dependency_manager.possible_colision.discard(dep_name)
+    dependency_manager.dependency_graph.remove_edge(get_rule_source(version_rule), dep_name)
 
-        if len(dependency_manager.node_map[dep_name]) == 0:
-            del dependency_manager.node_map[dep_name]
 
-
-# pylint: disable=R1702
 def schedule_recalc_subtree(deb_name, dependency_manager):
     """Function to prepare a subtree to be recalculated by downloading the essencial traces of the previous one.
+    Only the package and its descendants are visited.
 
     Args:
         deb_name (str): package name
     """
-    if deb_name in dependency_manager.node_map:
-        for node_i in dependency_manager.node_map[deb_name]:
-            for node in PreOrderIter(node_i):
-                if node.name in dependency_manager.install_candidates:
-                    del dependency_manager.install_candidates[node.name]
-
-                if (
-                    node.name
-                    in dependency_manager.possible_install_candidate_compromised
-                ):
-                    dependency_manager.possible_install_candidate_compromised.remove(
-                        node.name
-                    )
-                # from this point down is complete erradication of tree nodes. They need to be reintroduced by his dependencies.
-                if node.name != deb_name:
-                    for rule in dependency_manager.dependency_bank[node.name]:
-                        pkg_source = rule["from"]
-                        if "=" in rule["from"]:
-                            pkg_source = rule["from"].split("=")[0]
-
-                        if pkg_source == deb_name:
-                            remove_tree_node_fingerprint(
-                                node.name, rule, dependency_manager
-                            )
-
-
-def exists_in_tree_with_parent(dep_name, parent, tree_map):
-    """Check if node exists in tree with this specific parent
+    dependency_graph = dependency_manager.dependency_graph
+    if deb_name in dependency_graph:
+        for node_name in [deb_name, *dependency_graph.get_descendants(deb_name)]:
+            if node_name in dependency_manager.install_candidates:
+                del dependency_manager.install_candidates[node_name]
+
+            dependency_manager.possible_install_candidate_compromised.discard(node_name)
+
+        # from this point down is complete erradication of tree nodes. They need to be reintroduced by his dependencies.
+        # Only the direct dependencies have rules from the package.
+        for node_name in dependency_graph.get_children(deb_name):
+            if node_name == deb_name:
+                continue
+            package_rules = [
+                rule
+                for rule in dependency_manager.dependency_bank.get(node_name, [])
+                if get_rule_source(rule) == deb_name
+            ]
+            for rule in package_rules:
+                remove_tree_node_fingerprint(node_name, rule, dependency_manager)
+
+
+def get_rule_source(version_rule):
+    """Get the name of the package that introduced a version rule
 
     Args:
-        dep_name (str): dependency name aka node name
-        parent (str): parent name
+        version_rule (version_rule): version rule
 
     Returns:
-        bool: True if node exists with specific parent, False otherwise
+        str: package name, without the version
     """
-    if dep_name in tree_map:
-        for e in tree_map[dep_name]:
-            if e.parent.name == parent:
-                return True
-    return False
+    return version_rule["from"].split("=")[0]
 
 
 def register_sub_root_node(dependency_manager, package_name):
@@ -266,31 +181,7 @@ def register_sub_root_node(dependency_manager, package_name):
     Args:
         package_name (str): package name
     """
-    if package_name not in dependency_manager.node_map:
-        dependency_manager.node_map[package_name] = []
-
-    package_node = None
-    if not exists_in_tree_with_parent(
-        package_name, dependency_manager.root.name, dependency_manager.node_map
-    ):
-        if len(dependency_manager.node_map[package_name]) > 0:
-            package_node = Node(package_name, dependency_manager.root)
-            for node in dependency_manager.node_map[package_name]:
-                if node.children:
-                    # clone_subtree(self.node_map, node, new_node, overwrite=True)
-
-                    clone_subtree(
-                        dependency_manager.node_map, node, package_node, overwrite=True
-                    )
-                    break
-
-            remove_node_from_lost(
-                dependency_manager.node_map,
-                package_name,
-                dependency_manager.lost_nodes_group,
-            )
-
-        else:
-            package_node = Node(package_name, dependency_manager.root)
-
-        dependency_manager.node_map[package_name].append(package_node)
+    dependency_graph = dependency_manager.dependency_graph
+    if not dependency_graph.has_edge(dependency_graph.root, package_name):
+        dependency_graph.add_edge(dependency_graph.root, package_name)
+        dependency_graph.remove_edge(dependency_manager.lost_nodes_group, package_name)
@@ -5,13 +5,20 @@ import sys
 from io import StringIO
 from os import path, remove
 from subprocess import PIPE, CalledProcessError, Popen
-from multiprocessing import Pool, cpu_count
 import fnmatch
 import configparser
 from ruamel.yaml import YAML
 import mobros.utils.logger as logging
 from mobros.types.mobros_global_data import GlobalData
-from mobros.constants import MOBROS_CONFIG_PATH, MOBROS_CONFIG_SECTION, MOBROS_CONFIG_BLACKLIST_KEY
+from mobros.types.worker_pool import WorkerPool
+from mobros.utils import rosdep_cache
+from mobros.constants import (
+    MOBROS_CONFIG_PATH,
+    MOBROS_CONFIG_SECTION,
+    MOBROS_CONFIG_BLACKLIST_KEY,
+    MOBROS_CONFIG_APT_UPDATE_SECTION,
+    MOBROS_CONFIG_APT_UPDATE_SOURCES_KEY,
+)
 
 def __process_shell_stdout_lines(command, envs=None, shell_mode=False):
     """Function that on the execution of a commandline command, yelds on each output"""
@@ -120,6 +127,7 @@ def read_yaml_from_file(local_path, as_string=False):
 
 
 ROSDEP_RESULT_HEADER = "#apt"
+ROSDEP_KEY_HEADER = "#ROSDEP["
 ROSDEP_NEED_UPDATE_ANCHOR = "your rosdep installation has not been initialized yet"
 ROSDEP_NOT_FOUND = "no rosdep rule for"
 
@@ -145,6 +153,13 @@ def translate_package_name(rosdep_key):
     Returns:
         debian_pkg_name : list of debian package names
     """
+    fingerprint, cached_translations = load_cached_translations()
+    if rosdep_key in cached_translations:
+        if cached_translations[rosdep_key] is None:
+            logging.error("[rosdep translate] " + ROSDEP_NOT_FOUND + " " + rosdep_key)
+            sys.exit(1)
+        return cached_translations[rosdep_key]
+
     output_lines = execute_shell_command(
         ["rosdep", "resolve", rosdep_key], stop_on_error=True, log_output=False
     )
@@ -162,9 +177,98 @@ def translate_package_name(rosdep_key):
             + ". It is "
             + str(translation)
         )
+        store_cached_translations(fingerprint, {rosdep_key: translation})
 
     return translation
 
+
+def translate_package_names(rosdep_keys):
+    """Function that uses rosdep to translate catkin package names to debian package names, with a single rosdep
+    call for all of them. That way rosdep loads its sources cache once, instead of once per catkin package name.
+
+    Args:
+        rosdep_keys (list): catkin package names
+
+    Returns:
+        dict: catkin package name to its list of debian package names. The names rosdep has no rule for are left out.
+    """
+    rosdep_keys = list(dict.fromkeys(rosdep_keys))
+    fingerprint, cached_translations = load_cached_translations()
+    translations = {key: cached_translations[key] for key in rosdep_keys if key in cached_translations}
+
+    missing_keys = [key for key in rosdep_keys if key not in translations]
+    if missing_keys:
+        resolved_translations = resolve_rosdep_keys(missing_keys)
+        store_cached_translations(fingerprint, resolved_translations)
+        translations.update(resolved_translations)
+
+    logging.debug(
+        "[rosdep translate] Found translation for "
+        + str(len([translation for translation in translations.values() if translation is not None]))
+        + " of "
+        + str(len(rosdep_keys))
+        + " catkin package names, "
+        + str(len(rosdep_keys) - len(missing_keys))
+        + " of them cached"
+    )
+    return {key: translation for key, translation in translations.items() if translation is not None}
+
+
+def resolve_rosdep_keys(rosdep_keys):
+    """Function that calls rosdep once to translate catkin package names
+
+    Args:
+        rosdep_keys (list): catkin package names, without duplicates
+
+    Returns:
+        dict: catkin package name to its list of debian package names, or None if rosdep reported it has no rule for
+            it. The names rosdep did not report on are left out.
+    """
+    if not rosdep_keys:
+        return {}
+
+    # rosdep fails if one of the names has no rule, but it still prints the translation of all the others
+    output_lines = execute_shell_command(
+        ["rosdep", "resolve", *rosdep_keys], stop_on_error=False, log_output=False
+    )
+
+    # with more than one name, rosdep prints a #ROSDEP[name] header before the installer and translation of each one.
+    # A header without translation means there is no rule for the name.
+    translations = {}
+    rosdep_key = rosdep_keys[0]
+    for line in output_lines:
+        if line.startswith(ROSDEP_KEY_HEADER):
+            rosdep_key = line[len(ROSDEP_KEY_HEADER):-1]
+            translations[rosdep_key] = None
+        elif not line.startswith("#"):
+            translations[rosdep_key] = line.split()
+    return translations
+
+
+def load_cached_translations():
+    """Function that loads the rosdep translations stored by previous runs, if the translation cache is enabled
+
+    Returns:
+        tuple: fingerprint of the rosdep sources (None if the cache is disabled) and the cached translations (dict)
+    """
+    if not GlobalData().get_rosdep_translation_cache():
+        return None, {}
+
+    fingerprint = rosdep_cache.compute_rosdep_fingerprint()
+    return fingerprint, rosdep_cache.load_translation_cache(fingerprint)
+
+
+def store_cached_translations(fingerprint, translations):
+    """Function that stores rosdep translations for the next runs, if the translation cache is enabled
+
+    Args:
+        fingerprint (str): fingerprint of the rosdep sources. None if the cache is disabled.
+        translations (dict): catkin package name to its list of debian package names, or None if it has no rule.
+    """
+    if fingerprint is not None:
+        rosdep_cache.store_translation_cache(translations, fingerprint)
+
+
 def write_to_file(path_to_file, content):
     """Function to write a json dict into a file"""
 
@@ -191,7 +295,7 @@ def remove_file_if_exists(path_to_file):
         remove(path_to_file)
 
 def parrallel_execute_function(function_to_execute, multiplexer_list):
-    """Function that threads the execution of a function based on a list of arguments
+    """Function that threads the execution of a function based on a list of arguments, through the worker pool
 
     Args:
         function_to_execute (function): function to execute
@@ -200,16 +304,7 @@ def parrallel_execute_function(function_to_execute, multiplexer_list):
     Returns:
         list(list): List of lists with the results of the function execution
     """
-
-    with Pool(processes=cpu_count()) as pool:
-        # print(str(len(self._dependency_bank.items()))+ " vs filtered "+ str(len (list(filter(lambda x: (x[0] in self._possible_colision), self._dependency_bank.items())))))
-        subthreads_reports = pool.map(
-            function_to_execute,
-            multiplexer_list
-        )
-        pool.close()
-        pool.join()
-    return subthreads_reports
+    return WorkerPool().map(function_to_execute, multiplexer_list)
 
 def load_mobros_configuration():
     """Function that loads the mobros configuration from the configuration file"""
@@ -218,11 +313,18 @@ def load_mobros_configuration():
         conf_parser = configparser.ConfigParser()
         conf_parser.read(MOBROS_CONFIG_PATH)
 
-        config_blacklist_src = conf_parser.get(MOBROS_CONFIG_SECTION, MOBROS_CONFIG_BLACKLIST_KEY).split(",")
-        blacklist_patterns = []
-        blacklist_patterns.extend(config_blacklist_src)
+        if conf_parser.has_option(MOBROS_CONFIG_SECTION, MOBROS_CONFIG_BLACKLIST_KEY):
+            config_blacklist_src = conf_parser.get(MOBROS_CONFIG_SECTION, MOBROS_CONFIG_BLACKLIST_KEY).split(",")
+            blacklist_patterns = []
+            blacklist_patterns.extend(config_blacklist_src)
+
+            GlobalData().set_conflict_solving_blacklist(blacklist_patterns)
 
-        GlobalData().set_conflict_solving_blacklist(blacklist_patterns)
+        if conf_parser.has_option(MOBROS_CONFIG_APT_UPDATE_SECTION, MOBROS_CONFIG_APT_UPDATE_SOURCES_KEY):
+            config_update_src = conf_parser.get(
+                MOBROS_CONFIG_APT_UPDATE_SECTION, MOBROS_CONFIG_APT_UPDATE_SOURCES_KEY
+            ).split(",")
+            GlobalData().set_apt_update_sources([pattern.strip() for pattern in config_update_src if pattern.strip()])
 
 def is_blacklisted_origin(pkg_origin):
     """Function that checks if a package origin is blacklisted
@@ -0,0 +1,130 @@
+"""Module to compare debian versions, parsing each version only once into an ordering key"""
+from functools import lru_cache
+
+try:
+    import apt_pkg
+
+    # same initialization python-apt does when importing apt
+    if "APT" not in apt_pkg.config:
+        apt_pkg.init_config()
+    apt_pkg.init_system()
+except ImportError:
+    apt_pkg = None
+
+# weights of the non digit characters, following dpkg: '~' sorts before anything, even the end of the part,
+# then the end of the part, then letters and finally all the other characters.
+TILDE_WEIGHT = -1
+END_WEIGHT = 0
+NON_LETTER_OFFSET = 256
+END_OF_VERSION = (END_WEIGHT,)
+
+
+def _character_weight(character):
+    if character == "~":
+        return TILDE_WEIGHT
+    if character.isalpha():
+        return ord(character)
+    return ord(character) + NON_LETTER_OFFSET
+
+
+def _part_key(part):
+    """Builds the ordering key of an upstream version or revision. It is the alternation of the non digit
+    segments, as tuples of character weights, and of the digit segments, as integers.
+
+    Args:
+        part (str): upstream version or revision
+
+    Returns:
+        tuple: ordering key of the part
+    """
+    key = []
+    position = 0
+    length = len(part)
+    while position < length:
+        start = position
+        while position < length and not part[position].isdigit():
+            position += 1
+        non_digits = tuple(_character_weight(character) for character in part[start:position]) + END_OF_VERSION
+
+        start = position
+        while position < length and part[position].isdigit():
+            position += 1
+        digits = int(part[start:position] or 0)
+
+        key.append(non_digits)
+        key.append(digits)
+
+    # an empty part compares like '0', the same way dpkg considers '1.0' equal to '1.0-0'
+    if not key:
+        key = [END_OF_VERSION, 0]
+
+    key.append(END_OF_VERSION)
+    return tuple(key)
+
+
+@lru_cache(maxsize=None)
+def version_key(version):
+    """Parses a debian version into a totally ordered key. The keys are cached, so each version is only parsed once.
+
+    Args:
+        version (str): debian version ([epoch:]upstream_version[-debian_revision])
+
+    Returns:
+        tuple: ordering key of the version (epoch, upstream version key, revision key)
+    """
+    epoch = 0
+    upstream = version.strip()
+    if ":" in upstream:
+        epoch_str, upstream = upstream.split(":", 1)
+        epoch = int(epoch_str or 0)
+
+    revision = ""
+    if "-" in upstream:
+        upstream, revision = upstream.rsplit("-", 1)
+
+    return epoch, _part_key(upstream), _part_key(revision)
+
+
+def compare_versions_by_key(version_a, version_b):
+    """Compares two debian versions through their ordering keys
+
+    Args:
+        version_a (str): debian version
+        version_b (str): debian version
+
+    Returns:
+        int: 1 if version_a is newer, -1 if version_b is newer and 0 if both are the same version
+    """
+    if version_a == version_b:
+        return 0
+
+    key_a = version_key(version_a)
+    key_b = version_key(version_b)
+    return (key_a > key_b) - (key_a < key_b)
+
+
+def compare_versions(version_a, version_b):
+    """Compares two debian versions. Uses apt's comparison when python-apt is available.
+
+    Args:
+        version_a (str): debian version
+        version_b (str): debian version
+
+    Returns:
+        int: 1 if version_a is newer, -1 if version_b is newer and 0 if both are the same version
+    """
+    if apt_pkg is None:
+        return compare_versions_by_key(version_a, version_b)
+
+    result = apt_pkg.version_compare(version_a, version_b)
+    return (result > 0) - (result < 0)
+
+
+def sort_versions(version_list, reverse=False):
+    """Sorts a list of debian versions in place, parsing each version only once
+
+    Args:
+        version_list (list): list of versions to be ordered
+        reverse (bool, optional): order from the newest. Defaults to False.
+    """
+    version_list.sort(key=version_key, reverse=reverse)
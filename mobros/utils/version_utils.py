@@ -1,7 +1,6 @@
 """ Utilitary module to deal with version related operations"""
-from functools import cmp_to_key
-from pydpkg import Dpkg
 from mobros.utils import logger as logging
+from mobros.utils.version_compare import compare_versions, sort_versions, version_key
 from mobros.constants import OPERATION_TRANSLATION_TABLE_REVERSE
 
 def find_lowest_top_rule(version_rules):
@@ -77,11 +76,7 @@ def order_dpkg_versions(version_list, reverse=False):
         version_list (list): list of versions to be ordered
         reverse (bool, optional): defines if you want reverse ordering. Defaults to False.
     """
-
-    def compare(elem1, elem2):
-        return Dpkg.compare_versions(elem1, elem2)
-
-    version_list.sort(key=cmp_to_key(compare), reverse=reverse)
+    sort_versions(version_list, reverse=reverse)
 
 
 def order_rule_versions(version_list, reverse=False):
@@ -91,11 +86,7 @@ def order_rule_versions(version_list, reverse=False):
         version_rules_list (list): list of version rules to be ordered
         reverse (bool, optional): defines if you want reverse ordering. Defaults to False.
     """
-
-    def compare(elem1, elem2):
-        return Dpkg.compare_versions(elem1["version"], elem2["version"])
-
-    version_list.sort(key=cmp_to_key(compare), reverse=reverse)
+    version_list.sort(key=lambda rule: version_key(rule["version"]), reverse=reverse)
 
 
 def filter_through_bottom_rule(version_list, low_limit_rule, deb_name):
@@ -106,9 +97,6 @@ def filter_through_bottom_rule(version_list, low_limit_rule, deb_name):
         low_limit_rule (version_rule): version rule object (contains the version and the operation rule).
     """
 
-    def compare(elem1, elem2):
-        return Dpkg.compare_versions(elem1, elem2)
-
     lower_possible_version = low_limit_rule["version"]
     inclusion = low_limit_rule["included"]
     logging.debug(
@@ -129,11 +117,11 @@ def filter_through_bottom_rule(version_list, low_limit_rule, deb_name):
 
     if inclusion:
         remaining_versions = [
-            i for i in version_list if compare(i, lower_possible_version) >= 0
+            i for i in version_list if compare_versions(i, lower_possible_version) >= 0
         ]
     else:
         remaining_versions = [
-            i for i in version_list if compare(i, lower_possible_version) > 0
+            i for i in version_list if compare_versions(i, lower_possible_version) > 0
         ]
 
     logging.debug(
@@ -154,9 +142,6 @@ def filter_through_top_rule(version_list, high_limit_rule, deb_name):
         high_limit_rule (version_rule): version rule object (contains the version and the operation rule).
     """
 
-    def compare(elem1, elem2):
-        return Dpkg.compare_versions(elem1, elem2)
-
     highest_possible_version = high_limit_rule["version"]
     inclusion = high_limit_rule["included"]
 
@@ -178,11 +163,11 @@ def filter_through_top_rule(version_list, high_limit_rule, deb_name):
 
     if inclusion:
         remaining_versions = [
-            i for i in version_list if compare(highest_possible_version, i) >= 0
+            i for i in version_list if compare_versions(highest_possible_version, i) >= 0
         ]
     else:
         remaining_versions = [
-            i for i in version_list if compare(highest_possible_version, i) > 0
+            i for i in version_list if compare_versions(highest_possible_version, i) > 0
         ]
 
     logging.debug(
@@ -216,22 +201,24 @@ def find_equals_rule(version_rules):
     return True, equals_rule
 
 
-def filter_versions_by_rules(version_list, version_rules, deb_name):
+def filter_versions_by_rules(version_list, version_rules, deb_name, version_index=None):
     """Function to filter a list of versions by a list of version rules.
 
     Args:
         version_list (list): list of versions to be filtered
         version_rules (list): list of version rules to be applied
         deb_name (str): name of the package
+        version_index (PackageVersionIndex, optional): index of version_list, to filter it by ranks. Defaults to None.
 
     Returns:
         filtered_version_list (list): list of versions filtered by the version rules
     """
     equals_message = ""
+    known_versions = version_list if version_index is None else version_index
 
     found, equals_rule = find_equals_rule(version_rules)
     if found:
-        if equals_rule["version"] not in version_list:
+        if equals_rule["version"] not in known_versions:
             equals_message = "Unable to find a candidate for " + deb_name + "\n"
             equals_message += (
                 "Filter rule: "
@@ -255,10 +242,20 @@ def filter_versions_by_rules(version_list, version_rules, deb_name):
     remaining_versions = version_list
     top_rule_message = bottom_rule_message = "any"
 
-    if top_limit_rule:
-        remaining_versions = filter_through_top_rule(
-            version_list, top_limit_rule, deb_name
+    if version_index is not None:
+        remaining_versions = version_index.filter_by_limits(bottom_limit_rule, top_limit_rule)
+        logging.debug(
+            "[filter versions by rules] Pkg "
+            + deb_name
+            + ". After filter: "
+            + str(remaining_versions)
         )
+
+    if top_limit_rule:
+        if version_index is None:
+            remaining_versions = filter_through_top_rule(
+                version_list, top_limit_rule, deb_name
+            )
         top_rule_message = "<"
         if top_limit_rule["included"]:
             top_rule_message += "="
@@ -268,9 +265,10 @@ def filter_versions_by_rules(version_list, version_rules, deb_name):
         )
 
     if bottom_limit_rule:
-        remaining_versions = filter_through_bottom_rule(
-            remaining_versions, bottom_limit_rule, deb_name
-        )
+        if version_index is None:
+            remaining_versions = filter_through_bottom_rule(
+                remaining_versions, bottom_limit_rule, deb_name
+            )
         bottom_rule_message = ">"
         if bottom_limit_rule["included"]:
             bottom_rule_message += "="
@@ -280,31 +278,6 @@ def filter_versions_by_rules(version_list, version_rules, deb_name):
 
     return remaining_versions, top_rule_message, bottom_rule_message, equals_message
 
-def append_new_rules(dependency_bank, new_rules, key):
-    """ Appends the new values from a list of version rules into the dependency bank 
-
-    Args:
-        dependency_bank (dependency_bank): dependency manager's dependency bank
-        new_rules (list): list of version rules
-        key (str): dependency bank map key
-    """
-    for rule in new_rules:
-        found = False
-        if key in dependency_bank:
-            for known_rule in dependency_bank[key]:
-                if (
-                    rule["operator"] == known_rule["operator"]
-                    and rule["version"] == known_rule["version"]
-                    and rule["from"] == known_rule["from"]
-                ):
-                    found = True
-        else:
-            dependency_bank[key] = []
-
-        if not found:
-            dependency_bank[key].append(rule)
-
-
 def remove_rule_based_on_from(rules, from_to_delete):
     """returns a new version rules list without any elements from the inputed from_to_delete
 
@@ -377,7 +350,7 @@ def version_impacts_version_rules(comparing_version, rules):
         if rule["operator"] in ["version_lt", "version_lte"]:
             # A lower than B = -1
             # A higher than B = 1
-            compare_result = Dpkg.compare_versions(
+            compare_result = compare_versions(
                 rule["version"], comparing_version
             )
             if rule["operator"] == "version_lte" and compare_result < 0:
@@ -387,7 +360,7 @@ def version_impacts_version_rules(comparing_version, rules):
                 return True
 
         if rule["operator"] in ["version_gt", "version_gte"]:
-            compare_result = Dpkg.compare_versions(
+            compare_result = compare_versions(
                 rule["version"], comparing_version
             )
 
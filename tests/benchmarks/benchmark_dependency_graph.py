@@ -0,0 +1,175 @@
+"""Benchmark of the dependency graph, against the anytree tree that cloned the subtree of a package for each parent.
+
+Both are fed the dependencies of a real metapackage, read from a dpkg status file or a Packages list, in the
+order the resolver inspects them: wave by wave, starting at the metapackage.
+
+Usage: python3 -m tests.benchmarks.benchmark_dependency_graph [package] [status or Packages file]
+"""
+import sys
+import time
+import tracemalloc
+
+from anytree import LevelOrderGroupIter, Node, PreOrderIter
+
+from mobros.constants import DPKG_STATUS_PATH
+from mobros.types.dependency_graph import DependencyGraph
+from mobros.utils.deb_control import parse_depends, parse_provides, read_stanzas
+
+DEFAULT_METAPACKAGE = "build-essential"
+
+
+class AnytreeDependencyTree:
+    """The structure the dependency manager kept before the dependency graph. Every time a package gains a parent,
+    a new node is created for it and the subtree of one of its other nodes is cloned under it."""
+
+    def __init__(self):
+        self.root = Node("/")
+        self.node_map = {}
+        self.lost_nodes_group = Node("undentified", self.root)
+
+    def _exists_with_parent(self, dep_name, parent):
+        return any(node.parent.name == parent for node in self.node_map.get(dep_name, []))
+
+    def _clone_subtree(self, tree_to_copy_from, new_node):
+        local_map = {}
+        for layers in LevelOrderGroupIter(tree_to_copy_from, filter_=lambda n: n.name != tree_to_copy_from.name):
+            for layer in layers:
+                parent_name = layer.parent.name
+                if parent_name == new_node.name:
+                    local_map[layer.name] = Node(layer.name, new_node)
+                else:
+                    local_map[layer.name] = Node(layer.name, local_map[parent_name])
+                for node in self.node_map[layer.name]:
+                    if node.parent.name == parent_name:
+                        self.node_map[layer.name].remove(node)
+                        node.parent = None
+                self.node_map[layer.name].append(local_map[layer.name])
+
+    def register_root(self, package_name):
+        self.node_map[package_name] = [Node(package_name, self.root)]
+
+    def register_tree_node(self, package_name, dep_name):
+        self.node_map.setdefault(dep_name, [])
+        if package_name not in self.node_map:
+            self.node_map[package_name] = [Node(package_name, self.lost_nodes_group)]
+
+        for package_node in self.node_map[package_name]:
+            if not self._exists_with_parent(dep_name, package_name):
+                new_node = Node(dep_name, package_node)
+                for node in self.node_map[dep_name]:
+                    if node.children:
+                        self._clone_subtree(node, new_node)
+                        break
+                self.node_map[dep_name].append(new_node)
+
+    def count_nodes(self):
+        return sum(1 for _ in PreOrderIter(self.root))
+
+
+def load_dependencies(control_file_path):
+    """Reads the dependencies of every package of a control file, taking the first alternative that is known
+
+    Args:
+        control_file_path (str): dpkg status file or Packages list
+
+    Returns:
+        dict: package name to the names of its dependencies
+    """
+    depends = {}
+    providers = {}
+    with open(control_file_path, encoding="utf-8") as control_file:
+        for stanza in read_stanzas(control_file, ("Package", "Depends", "Pre-Depends", "Provides")):
+            fields = [stanza[field] for field in ("Pre-Depends", "Depends") if field in stanza]
+            depends.setdefault(stanza["Package"], parse_depends(", ".join(fields)) if fields else [])
+            for provided in parse_provides(stanza.get("Provides", "")):
+                providers.setdefault(provided, stanza["Package"])
+
+    dependencies = {}
+    for name, or_groups in depends.items():
+        dependencies[name] = []
+        for or_group in or_groups:
+            for alternative, _, _ in or_group:
+                alternative = alternative.split(":")[0]
+                alternative = alternative if alternative in depends else providers.get(alternative)
+                if alternative:
+                    if alternative not in dependencies[name]:
+                        dependencies[name].append(alternative)
+                    break
+    return dependencies
+
+
+def get_inspection_edges(dependencies, metapackage):
+    """Lists the dependency edges in the order the resolver registers them, inspecting the packages wave by wave
+
+    Args:
+        dependencies (dict): package name to the names of its dependencies
+        metapackage (str): user requested package
+
+    Returns:
+        list: (package, dependency) edges
+    """
+    edges = []
+    inspected = {metapackage}
+    wave = [metapackage]
+    while wave:
+        next_wave = []
+        for package_name in wave:
+            for dep_name in dependencies[package_name]:
+                edges.append((package_name, dep_name))
+                if dep_name not in inspected:
+                    inspected.add(dep_name)
+                    next_wave.append(dep_name)
+        wave = next_wave
+    return edges
+
+
+def measure(name, function):
+    """Prints the time and the peak of python allocations of a function. Measured in separate runs, as tracing
+    the allocations slows it down."""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(name.ljust(45) + "{:10.2f} ms {:10.1f} MiB".format(elapsed * 1000, peak / 2**20))
+    return result
+
+
+def main():
+    """Builds the dependency structure of the metapackage with the anytree tree and with the dependency graph"""
+    metapackage = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_METAPACKAGE
+    control_file_path = sys.argv[2] if len(sys.argv) > 2 else DPKG_STATUS_PATH
+
+    dependencies = load_dependencies(control_file_path)
+    if metapackage not in dependencies:
+        print("Package " + metapackage + " is not in " + control_file_path)
+        sys.exit(1)
+    edges = get_inspection_edges(dependencies, metapackage)
+
+    def build_tree():
+        tree = AnytreeDependencyTree()
+        tree.register_root(metapackage)
+        for package_name, dep_name in edges:
+            tree.register_tree_node(package_name, dep_name)
+        return tree
+
+    def build_graph():
+        graph = DependencyGraph()
+        graph.add_edge(graph.root, metapackage)
+        for package_name, dep_name in edges:
+            graph.add_edge(package_name, dep_name)
+        return graph
+
+    print("Metapackage: " + metapackage + ", packages: " + str(len({dep for _, dep in edges} | {metapackage}))
+          + ", dependency edges: " + str(len(edges)))
+    tree = measure("anytree with cloned subtrees", build_tree)
+    graph = measure("dependency graph", build_graph)
+    print("anytree nodes: " + str(tree.count_nodes()))
+    print("graph nodes: " + str(len(graph)) + ", graph edges: " + str(graph.count_edges()))
+
+
+if __name__ == "__main__":
+    main()
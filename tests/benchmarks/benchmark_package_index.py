@@ -0,0 +1,92 @@
+"""Benchmark of the lazy Packages lists index, against parsing the whole lists into a snapshot.
+
+Usage: python3 -m tests.benchmarks.benchmark_package_index
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from mobros.types.package_index import (
+    PACKAGE_INDEX_TRACKED_FIELDS,
+    PackagesListsIndex,
+    build_package_index,
+    get_packages_list_uri,
+)
+from mobros.utils.deb_control import read_stanzas
+
+PACKAGES = 60000
+TOUCHED_PACKAGES = 300
+LIST_FILE = "archive.ubuntu.com_ubuntu_dists_focal_main_binary-amd64_Packages"
+
+
+def generate_packages_list(list_path, amount, seed=0):
+    """Writes a Packages list with stanzas like the ones of the ubuntu and ros repositories"""
+    generator = random.Random(seed)
+    with open(list_path, "w", encoding="utf-8") as list_file:
+        for index in range(amount):
+            name = "package-" + str(index)
+            depends = ", ".join(
+                "package-" + str(generator.randrange(amount)) + " (>= " + str(generator.randint(0, 9)) + ".0-1)"
+                for _ in range(generator.randint(0, 8))
+            )
+            list_file.write("Package: " + name + "\n")
+            list_file.write("Architecture: amd64\n")
+            list_file.write("Version: " + str(generator.randint(0, 9)) + "." + str(generator.randint(0, 30)) + "-1\n")
+            if depends:
+                list_file.write("Depends: " + depends + "\n")
+            if generator.random() < 0.02:
+                list_file.write("Provides: virtual-" + str(generator.randrange(500)) + "\n")
+            list_file.write("Filename: pool/main/p/" + name + "/" + name + "_amd64.deb\n")
+            list_file.write("Description: generated package " + str(index) + "\n")
+            list_file.write(" with a long description" * 8 + "\n\n")
+
+
+def measure(name, function):
+    """Prints the time and the peak of python allocations of a function. Measured in separate runs, as tracing
+    the allocations slows it down."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(name.ljust(45) + "{:10.2f} ms {:10.1f} MiB".format(elapsed * 1000, peak / 2**20))
+    return elapsed
+
+
+def main():
+    """Compares loading the Packages lists eagerly and lazily, then looking up some packages"""
+    lists_path = tempfile.mkdtemp()
+    try:
+        list_path = os.path.join(lists_path, LIST_FILE)
+        generate_packages_list(list_path, PACKAGES)
+        touched = ["package-" + str(index) for index in random.Random(1).sample(range(PACKAGES), TOUCHED_PACKAGES)]
+
+        def eager():
+            with open(list_path, encoding="utf-8") as list_file:
+                uri = get_packages_list_uri(LIST_FILE)
+                available = [(stanza, uri) for stanza in read_stanzas(list_file, PACKAGE_INDEX_TRACKED_FIELDS)]
+            index = build_package_index(available, [], "amd64")
+            for name in touched:
+                index.get(name).versions[0].dependencies
+
+        def lazy():
+            index = PackagesListsIndex(lists_path, os.devnull, "amd64")
+            for name in touched:
+                index.get(name).versions[0].dependencies
+
+        print("Packages: " + str(PACKAGES) + ", looked up: " + str(TOUCHED_PACKAGES))
+        eager_time = measure("full parse into a snapshot", eager)
+        lazy_time = measure("memory mapped lists, lazy stanzas", lazy)
+        print("speedup: " + "{:.1f}x".format(eager_time / lazy_time))
+    finally:
+        shutil.rmtree(lists_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Micro-benchmark of the debian version comparison, against the pydpkg comparison used before.
+
+Usage: python3 -m tests.benchmarks.benchmark_version_compare
+"""
+import random
+import timeit
+from functools import cmp_to_key
+
+from pydpkg import Dpkg
+
+from mobros.utils.version_compare import compare_versions, compare_versions_by_key, sort_versions, version_key
+
+ROUNDS = 5
+
+
+def generate_versions(amount, seed=0):
+    """Generates debian versions like the ones found in the ros and mov.ai repositories"""
+    generator = random.Random(seed)
+    versions = set()
+    while len(versions) < amount:
+        version = (
+            str(generator.randint(0, 3))
+            + "."
+            + str(generator.randint(0, 20))
+            + "."
+            + str(generator.randint(0, 50))
+            + "-"
+            + str(generator.randint(0, 9))
+        )
+        if generator.random() < 0.3:
+            version += "focal." + str(generator.randint(20200101, 20231231)) + "." + str(generator.randint(0, 235959))
+        if generator.random() < 0.1:
+            version = "1:" + version
+        versions.add(version)
+    return list(versions)
+
+
+def benchmark(name, function):
+    """Prints the best time of some rounds of a function"""
+    best = min(timeit.repeat(function, number=1, repeat=ROUNDS))
+    print(name.ljust(45) + "{:10.2f} ms".format(best * 1000))
+    return best
+
+
+def main():
+    """Compares sorting and rule filtering between pydpkg and the version comparison module"""
+    versions = generate_versions(2000)
+    bound = versions[len(versions) // 2]
+
+    def dpkg_sort():
+        sorted(versions, key=cmp_to_key(Dpkg.compare_versions), reverse=True)
+
+    def key_sort():
+        sort_versions(list(versions), reverse=True)
+
+    def cold_key_sort():
+        version_key.cache_clear()
+        key_sort()
+
+    def dpkg_filter():
+        return [version for version in versions if Dpkg.compare_versions(version, bound) >= 0]
+
+    def key_filter():
+        return [version for version in versions if compare_versions_by_key(version, bound) >= 0]
+
+    def apt_filter():
+        return [version for version in versions if compare_versions(version, bound) >= 0]
+
+    print("Versions: " + str(len(versions)) + ", best of " + str(ROUNDS) + " rounds")
+    dpkg_sort_time = benchmark("sort - pydpkg (cmp_to_key)", dpkg_sort)
+    benchmark("sort - version keys (cold cache)", cold_key_sort)
+    key_sort_time = benchmark("sort - version keys (warm cache)", key_sort)
+    dpkg_filter_time = benchmark("filter - pydpkg", dpkg_filter)
+    key_filter_time = benchmark("filter - version keys", key_filter)
+    benchmark("filter - compare_versions", apt_filter)
+
+    print("sort speedup: " + "{:.1f}x".format(dpkg_sort_time / key_sort_time))
+    print("filter speedup: " + "{:.1f}x".format(dpkg_filter_time / key_filter_time))
+
+
+if __name__ == "__main__":
+    main()
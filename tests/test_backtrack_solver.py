@@ -0,0 +1,106 @@
+import unittest
+
+import mock
+
+from mobros.dependency_manager.backtrack_solver import BacktrackSolver, solve_dependency_tree
+from mobros.dependency_manager.dependency_manager import DependencyManager
+from mobros.exceptions import SolverTimeoutException
+from mobros.utils.version_utils import create_version_rule
+from tests.test_executers.mocks.mock_package import MockPackage
+
+mock_apt_packages = {}
+
+
+def register_mock_package(name, version, dependencies=()):
+    package = MockPackage(name, version)
+    for dep_name, relation, dep_version in dependencies:
+        package._register_dependency(dep_name, relation, dep_version)
+    mock_apt_packages.setdefault(name, {})[version] = package
+
+
+def mock_available_versions(deb_name):
+    return list(mock_apt_packages.get(deb_name, {}))
+
+
+def mock_inspect_package(deb_name, version, upgrade_installed):
+    return mock_apt_packages[deb_name][version].get_dependencies()
+
+
+# solver_app 2.0 can only use solver_lib_b 1.0, as its newest version needs an older solver_common than solver_lib_a
+register_mock_package("solver_app", "2.0.0-0", [("solver_lib_a", "any", ""), ("solver_lib_b", "any", "")])
+register_mock_package("solver_lib_a", "2.0.0-0", [("solver_common", "version_gte", "2.0.0-0")])
+register_mock_package("solver_lib_b", "2.0.0-0", [("solver_common", "version_lt", "2.0.0-0")])
+register_mock_package("solver_lib_b", "1.0.0-0", [("solver_common", "version_gte", "1.0.0-0")])
+register_mock_package("solver_common", "2.0.0-0")
+register_mock_package("solver_common", "1.0.0-0")
+
+# every version of solver_broken_lib needs a solver_common that does not exist
+register_mock_package("solver_broken_app", "1.0.0-0", [("solver_lib_a", "any", ""), ("solver_broken_lib", "any", "")])
+register_mock_package("solver_broken_lib", "2.0.0-0", [("solver_common", "version_gte", "3.0.0-0")])
+register_mock_package("solver_broken_lib", "1.0.0-0", [("solver_common", "version_gte", "3.0.0-0")])
+
+
+@mock.patch("mobros.utils.apt_utils.package_impacts_installed_dependencies", return_value=None)
+@mock.patch("mobros.utils.apt_utils.get_package_installed_version", return_value=None)
+@mock.patch("mobros.utils.apt_utils.inspect_package", side_effect=mock_inspect_package)
+@mock.patch("mobros.utils.apt_utils.get_package_available_versions", side_effect=mock_available_versions)
+class TestBacktrackSolver(unittest.TestCase):
+    def test_finds_newest_consistent_assignment(self, mock_versions, mock_inspect, mock_installed, mock_impacts):
+        solver = BacktrackSolver(False, 60)
+
+        self.assertTrue(solver.solve({"solver_app": [create_version_rule("any", "", "user")]}))
+        self.assertDictEqual(
+            solver.assignment,
+            {
+                "solver_app": "2.0.0-0",
+                "solver_lib_a": "2.0.0-0",
+                "solver_lib_b": "1.0.0-0",
+                "solver_common": "2.0.0-0",
+            },
+        )
+        self.assertGreater(solver.statistics["learned_conflicts"], 0)
+
+    def test_installed_version_is_preferred(self, mock_versions, mock_inspect, mock_installed, mock_impacts):
+        mock_installed.side_effect = lambda deb_name: "1.0.0-0" if deb_name == "solver_common" else None
+        solver = BacktrackSolver(False, 60)
+
+        self.assertTrue(solver.solve({"solver_lib_b": [create_version_rule("any", "", "user")]}))
+        self.assertDictEqual(solver.assignment, {"solver_lib_b": "2.0.0-0", "solver_common": "1.0.0-0"})
+
+    def test_unsolvable(self, mock_versions, mock_inspect, mock_installed, mock_impacts):
+        solver = BacktrackSolver(False, 60)
+
+        self.assertFalse(solver.solve({"solver_broken_app": [create_version_rule("any", "", "user")]}))
+        self.assertDictEqual(solver.assignment, {})
+        self.assertIn("solver_common", solver.describe_conflict())
+
+    def test_versions_impacting_installed_packages_are_discarded(
+        self, mock_versions, mock_inspect, mock_installed, mock_impacts
+    ):
+        impacting_package = ("solver_lib_b", {"version": "2.0.0-0"})
+        mock_impacts.side_effect = lambda package: {"name": "x"} if package == impacting_package else None
+        solver = BacktrackSolver(False, 60)
+
+        self.assertTrue(solver.solve({"solver_lib_b": [create_version_rule("any", "", "user")]}))
+        self.assertEqual(solver.assignment["solver_lib_b"], "1.0.0-0")
+
+    @mock.patch("mobros.dependency_manager.backtrack_solver.time.monotonic", side_effect=[0, 0, 100])
+    def test_time_budget(self, mock_monotonic, mock_versions, mock_inspect, mock_installed, mock_impacts):
+        solver = BacktrackSolver(False, 10)
+
+        with self.assertRaises(SolverTimeoutException):
+            solver.solve({"solver_app": [create_version_rule("any", "", "user")]})
+
+    @mock.patch("mobros.utils.apt_utils.is_package_already_installed", return_value=False)
+    def test_solution_registered_in_dependency_manager(
+        self, mock_is_installed, mock_versions, mock_inspect, mock_installed, mock_impacts
+    ):
+        dependency_manager = DependencyManager()
+        dependency_manager.register_root_package("solver_app", "2.0.0-0", "user")
+
+        solve_dependency_tree(dependency_manager, False, 60)
+
+        self.assertEqual(dependency_manager.get_version_of_candidate("solver_lib_b"), "1.0.0-0")
+        self.assertEqual(dependency_manager.get_version_of_candidate("solver_common"), "2.0.0-0")
+        self.assertTrue(dependency_manager.dependency_graph.is_upstream("solver_app", "solver_common"))
+        self.assertIsNone(dependency_manager.dependency_bank.get_conflict("solver_common"))
@@ -398,6 +398,34 @@ class TestDependencyManagerIntegration(unittest.TestCase):
         self.assertNotIn("a_sub_a", dep_manager.possible_colision)
         self.assertNotIn("a_sub_a", dep_manager.possible_install_candidate_compromised)
 
+    @mock.patch("mobros.utils.utilitary.parrallel_execute_function", side_effect=multiplexer_proxy_filter_impacts_installed_dep)
+    def test_unchanged_rules_are_not_reevaluated(self, mock_get_installed_version, mock_get_available_versions, mock_parrallel_execute_function):
+        dep_manager = DependencyManager()
+
+        package_a = MockPackage("a")
+        package_a._register_dependency("a_sub_a", "version_lt", "1.0.0-0")
+        dep_manager.register_package(package_a)
+        dep_manager.check_colisions()
+        dep_manager.calculate_installs()
+
+        self.assertEqual(dep_manager.pop_round_statistics(), {"colision_checks": 1, "candidates_calculated": 1, "evaluations_skipped": 0})
+        self.assertListEqual([candidate["name"] for candidate in dep_manager.pop_changed_candidates()], ["a_sub_a"])
+
+        # same rules registered again, from the same origin
+        dep_manager.dependency_bank.mark_dirty("a_sub_a")
+        dep_manager.check_colisions()
+        dep_manager.calculate_installs()
+        self.assertEqual(dep_manager.pop_round_statistics(), {"colision_checks": 0, "candidates_calculated": 0, "evaluations_skipped": 2})
+        self.assertListEqual(dep_manager.pop_changed_candidates(), [])
+
+        package_b = MockPackage("b")
+        package_b._register_dependency("a_sub_a", "version_lt", "0.0.0-5")
+        dep_manager.register_package(package_b)
+        dep_manager.check_colisions()
+        dep_manager.calculate_installs()
+        self.assertEqual(dep_manager.pop_round_statistics(), {"colision_checks": 1, "candidates_calculated": 1, "evaluations_skipped": 0})
+        self.assertListEqual([candidate["name"] for candidate in dep_manager.pop_changed_candidates()], ["a_sub_a"])
+
     @mock.patch("mobros.utils.utilitary.parrallel_execute_function", side_effect=multiplexer_proxy_filter_impacts_installed_dep)
     def test_tree_recalc_skip_event(self, mock_get_installed_version, mock_get_available_versions, mock_parrallel_execute_function):
         dep_manager = DependencyManager()
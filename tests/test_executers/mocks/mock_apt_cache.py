@@ -47,6 +47,8 @@ class MockAptInstalledCache:
         return self
     def get(self, name):
         return self
+    def get_installed_origin(self, name):
+        return self.installed.uri
 
 class MockAptCache:
     versions = {}
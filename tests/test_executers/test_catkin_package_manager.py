@@ -1,7 +1,7 @@
 import os
 import unittest
 import mock
-from mobros.commands.ros_install_build_deps.catkin_package import CatkinPackage
+from mobros.commands.ros_install_build_deps.catkin_package import CatkinPackage, read_package_manifest
 
 mock_rosdep_translate_map = {
     "ompl": ["ros-noetic-ompl"],
@@ -69,3 +69,27 @@ class TestCatkinPackageManager(unittest.TestCase):
             package_c.get_dependencies()["ros-noetic-movai-navigation"][0]["operator"],
             "",
         )
+
+    @mock.patch("mobros.utils.utilitary.translate_package_name", side_effect=mock_translation)
+    def test_package_with_translations(self, mock_translate):
+        TEST_RESOURCE_PATH_VALID = os.path.join(
+            os.getcwd(),
+            "tests",
+            "resources",
+            "test_dependencies",
+            "tree_simple_valid_deps",
+        )
+        PACKAGE_A = os.path.join(TEST_RESOURCE_PATH_VALID, "project_a", "package.xml")
+
+        manifest = read_package_manifest(PACKAGE_A)
+        self.assertEqual(manifest["name"], "package_a")
+
+        dependency_names = CatkinPackage.get_dependency_names(manifest)
+        self.assertIn("ompl", dependency_names)
+        self.assertEqual(len(dependency_names), len(set(dependency_names)))
+
+        translations = {name: mock_rosdep_translate_map.get(name, ["ros-noetic-" + name]) for name in dependency_names}
+        package_a = CatkinPackage(PACKAGE_A, translations=translations, manifest=manifest)
+
+        mock_translate.assert_not_called()
+        self.assertEqual(package_a.get_dependencies()["ros-noetic-ompl"][0]["version"], "1.5.2-6")
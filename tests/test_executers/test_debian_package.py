@@ -0,0 +1,47 @@
+import sys
+import unittest
+
+import mock
+
+from mobros.commands.ros_install_runtime_deps.debian_package import inspect_packages
+from mobros.types.mobros_global_data import GlobalData
+from mobros.types.worker_pool import WorkerPool
+
+
+def mock_inspect_package(deb_name, version, upgrade_installed):
+    if deb_name == "missing":
+        sys.exit(1)
+    return {deb_name + "_dep": [{"operator": "version_eq", "version": version, "from": deb_name + "=" + version}]}
+
+
+@mock.patch("mobros.utils.apt_utils.inspect_package", side_effect=mock_inspect_package)
+class TestInspectPackages(unittest.TestCase):
+    def tearDown(self):
+        WorkerPool().stop()
+        GlobalData().set_worker_jobs(None)
+
+    def test_wave_keeps_order(self, mock_inspect):
+        GlobalData().set_worker_jobs(2)
+        WorkerPool().start()
+        wave = [("pkg_" + str(index), "1.0.0-" + str(index)) for index in range(40)]
+
+        packages = inspect_packages(wave, False)
+
+        self.assertListEqual([package.get_name() for package in packages], [name for name, _ in wave])
+        self.assertEqual(packages[7].get_dependencies()["pkg_7_dep"][0]["from"], "pkg_7=1.0.0-7")
+
+    def test_exit_in_inspection(self, mock_inspect):
+        with self.assertRaises(SystemExit) as method_execution_exit:
+            inspect_packages([("pkg_a", "1.0.0-0"), ("missing", "1.0.0-0")], False)
+
+        self.assertEqual(method_execution_exit.exception.code, 1)
+
+    def test_exit_in_worker_inspection(self, mock_inspect):
+        GlobalData().set_worker_jobs(2)
+        WorkerPool().start()
+        wave = [("pkg_" + str(index), "1.0.0-0") for index in range(40)] + [("missing", "1.0.0-0")]
+
+        with self.assertRaises(SystemExit) as method_execution_exit:
+            inspect_packages(wave, False)
+
+        self.assertEqual(method_execution_exit.exception.code, 1)
@@ -1,10 +1,13 @@
 import argparse
+import tempfile
 import unittest
 import os
 import mock
 from mobros.commands.ros_install_build_deps.install_deps_executer import (
     InstallBuildDependsExecuter,
+    scan_workspace,
 )
+from mobros.types.mobros_global_data import GlobalData
 from tests.constants import DUMMY_AVAILABLE_VERSIONS
 
 mock_apt_packages = {}
@@ -27,6 +30,13 @@ def mock_inspect_package(deb_name, version):
     return package_dependencies[deb_name]
 
 
+def mock_translations(rosdep_keys):
+    return {rosdep_key: ["ros-noetic-mobros"] for rosdep_key in rosdep_keys}
+
+
+@mock.patch(
+    "mobros.utils.utilitary.translate_package_names", side_effect=mock_translations
+)
 @mock.patch(
     "mobros.commands.ros_install_runtime_deps.install_deps_executer.InstallRuntimeDependsExecuter.execute",
     return_value=None,
@@ -55,6 +65,19 @@ def mock_inspect_package(deb_name, version):
     return_value=None,
 )
 class TestInstallBuildDepsExecuter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path_patch = mock.patch(
+            "mobros.commands.ros_install_build_deps.workspace_index.MOBROS_CACHE_PATH", self.tmp_dir.name
+        )
+        self.cache_path_patch.start()
+
+    def tearDown(self):
+        self.cache_path_patch.stop()
+        self.tmp_dir.cleanup()
+        GlobalData().set_rosdep_translation_cache(False)
+        GlobalData().set_worker_jobs(None)
+
     def test_execute_happy_path(
         self,
         mock_get_pkg_installed_version,
@@ -64,6 +87,7 @@ class TestInstallBuildDepsExecuter(unittest.TestCase):
         mock_execute_cmd,
         mock_rosdep_translate,
         mock_mobros_install_execute,
+        mock_rosdep_translate_batch,
     ):
         TEST_RESOURCE_PATH_VALID = os.path.join(
             os.getcwd(),
@@ -73,13 +97,61 @@ class TestInstallBuildDepsExecuter(unittest.TestCase):
             "tree_simple_valid_deps",
         )
         argparse_args = argparse.Namespace(
-            workspace=TEST_RESOURCE_PATH_VALID, simulate=True
+            workspace=TEST_RESOURCE_PATH_VALID, simulate=True, jobs=2
         )
 
         executer = InstallBuildDependsExecuter()
         executer.execute(argparse_args)
 
         expected_install_args = argparse.Namespace(
-            y=True, pkg_list=["ros-noetic-mobros=1.2.0-3"], upgrade_installed=True
+            y=True, pkg_list=["ros-noetic-mobros=1.2.0-3"], upgrade_installed=True, jobs=2
         )
         mock_mobros_install_execute.assert_called_with(expected_install_args)
+        mock_rosdep_translate_batch.assert_called_once()
+        mock_rosdep_translate.assert_not_called()
+
+    def test_execute_without_rosdep_update(
+        self,
+        mock_get_pkg_installed_version,
+        mock_inspect_package,
+        mock_get_versions,
+        mock_is_pkg_installed,
+        mock_execute_cmd,
+        mock_rosdep_translate,
+        mock_mobros_install_execute,
+        mock_rosdep_translate_batch,
+    ):
+        TEST_RESOURCE_PATH_VALID = os.path.join(
+            os.getcwd(),
+            "tests",
+            "resources",
+            "test_dependencies",
+            "tree_simple_valid_deps",
+        )
+        argparse_args = argparse.Namespace(
+            workspace=TEST_RESOURCE_PATH_VALID, simulate=True, jobs=2, rosdep_update="never"
+        )
+
+        executer = InstallBuildDependsExecuter()
+        executer.execute(argparse_args)
+
+        rosdep_update_call = mock.call(["rosdep", "update"], stop_on_error=True, log_output=True)
+        self.assertNotIn(rosdep_update_call, mock_execute_cmd.mock_calls)
+        mock_mobros_install_execute.assert_called_once()
+
+
+@mock.patch("mobros.utils.utilitary.translate_package_names", side_effect=mock_translations)
+class TestScanWorkspace(unittest.TestCase):
+    def tearDown(self):
+        GlobalData().set_worker_jobs(None)
+
+    @mock.patch("mobros.types.worker_pool.PARALLEL_MIN_BATCH_SIZE", 1)
+    def test_scan_in_worker_pool(self, mock_rosdep_translate_batch):
+        GlobalData().set_worker_jobs(2)
+        workspace = os.path.join(os.getcwd(), "tests", "resources", "test_dependencies", "tree_simple_valid_deps")
+
+        packages = scan_workspace(workspace)
+
+        self.assertListEqual([package.get_name() for package in packages], ["package_c", "package_a", "package_b"])
+        self.assertEqual(packages[1].get_dependencies()["ros-noetic-mobros"][0]["from"], "package_a")
+        mock_rosdep_translate_batch.assert_called_once()
@@ -1,10 +1,13 @@
 import argparse
+import os
 import unittest
 
 import mock
 from mobros.commands.ros_install_runtime_deps.install_deps_executer import (
     InstallRuntimeDependsExecuter,
 )
+from mobros.types.apt_cache_singleton import AptCache
+from mobros.types.package_index import load_fixture_index
 from tests.test_executers.mocks.mock_package import MockPackage
 from tests.test_executers.mocks.mock_local_deb_package import DebPackage
 from mobros.utils.utilitary import read_from_file, write_to_file, remove_file_if_exists
@@ -14,6 +17,13 @@ from tests.constants import DUMMY_AVAILABLE_VERSIONS
 
 mock_apt_packages = {}
 
+PACKAGE_INDEX_FIXTURE = os.path.join(os.getcwd(), "tests", "resources", "package_index", "fixture.json")
+
+
+# the resolution lookups are mocked, the package index only needs to load without the host apt
+def load_fixture_package_index(apt_cache, backend=None):
+    return load_fixture_index(PACKAGE_INDEX_FIXTURE)
+
 import sys
 
 package_a = MockPackage("a")
@@ -78,6 +88,11 @@ def mock_inspect_package(deb_name, version, upgrade_installed):
     "os.getuid",
     return_value=0,
 )
+@mock.patch("mobros.types.apt_cache_singleton.is_apt_update_required", mock.Mock(return_value=False))
+@mock.patch.object(AptCache, "_load_index", staticmethod(load_fixture_package_index))
+@mock.patch.object(AptCache, "_installed_cache", None)
+@mock.patch.object(AptCache, "_cache", None)
+@mock.patch.object(AptCache, "_instance", None)
 class TestInstallDepsExecuter(unittest.TestCase):
     def test_execute_happy_path(
         self,
@@ -316,10 +331,10 @@ class TestInstallDepsExecuter(unittest.TestCase):
 
         install_order_result = read_from_file("packages.apt").split(" ")
         install_order_expected = queue.Queue()
-        install_order_expected.put("abca2_sub_b=0.0.1-11")
-        install_order_expected.put("abca2_sub_a=0.0.1-11")
         install_order_expected.put("abccc_sub_c=0.0.1-11")
         install_order_expected.put("abcc_sub_c=0.0.1-11")
+        install_order_expected.put("abca2_sub_b=0.0.1-11")
+        install_order_expected.put("abca2_sub_a=0.0.1-11")
         install_order_expected.put("abc_sub_a=0.0.1-11")
         install_order_expected.put("ab_sub_c=0.0.1-11")
         install_order_expected.put("ab_sub_b=0.0.1-11")
@@ -388,8 +403,37 @@ class TestInstallDepsExecuter(unittest.TestCase):
         if not install_order_expected.empty():
             self.fail()
 
+    @mock.patch("mobros.commands.ros_install_runtime_deps.install_deps_executer.WorkerPool.start")
+    @mock.patch("mobros.utils.apt_utils.index_installed_reverse_dependencies")
+    def test_reverse_dependencies_indexed_before_workers_start(
+        self,
+        mock_index_reverse_deps,
+        mock_worker_pool_start,
+        mock_getui,
+        mock_get_pkg_installed_version,
+        mock_inspect_package,
+        mock_get_versions,
+        mock_is_pkg_installed,
+        mock_execute_cmd,
+    ):
+        call_order = mock.Mock()
+        call_order.attach_mock(mock_index_reverse_deps, "index_installed_reverse_dependencies")
+        call_order.attach_mock(mock_worker_pool_start, "start")
+        argparse_args = argparse.Namespace(
+            y=True, pkg_list=["install", "ros-noetic-package-solo"], upgrade_installed=False
+        )
+        mock_apt_packages["ros-noetic-package-solo"] = {}
+        mock_apt_packages["ros-noetic-package-solo"]["2.0.0-8"] = package_ab_b
+
+        executer = InstallRuntimeDependsExecuter()
+        executer.execute(argparse_args)
+
+        self.assertEqual(
+            call_order.mock_calls[:2], [mock.call.index_installed_reverse_dependencies(), mock.call.start()]
+        )
+
     @mock.patch(
-    "apt.debfile.DebPackage",
+    "mobros.utils.apt_utils.open_local_deb",
     side_effect=DebPackage,
     )
     def test_execute_full_install_local_deb(
@@ -438,3 +482,28 @@ class TestInstallDepsExecuter(unittest.TestCase):
         ## this means the install order queue (whats expected) is bigger than the result
         if not install_order_expected.empty():
             self.fail()
+
+
+@mock.patch(
+    "mobros.types.installed_state.DPKG_STATUS_PATH",
+    os.path.join(os.getcwd(), "tests", "resources", "dpkg", "status"),
+)
+@mock.patch(
+    "mobros.commands.ros_install_runtime_deps.install_deps_executer.AptCache",
+)
+@mock.patch(
+    "os.getuid",
+    return_value=0,
+)
+class TestInstallDepsExecuterNothingToDo(unittest.TestCase):
+    def test_execute_nothing_to_do_skips_apt_cache(self, mock_getui, mock_apt_cache):
+        argparse_args = argparse.Namespace(
+            y=True, pkg_list=["install", "my_app=0.0.0-1", "python3", "python3-any=1.0.0-0"], upgrade_installed=False
+        )
+
+        executer = InstallRuntimeDependsExecuter()
+        with self.assertRaises(SystemExit) as context:
+            executer.execute(argparse_args)
+
+        self.assertEqual(context.exception.code, 0)
+        mock_apt_cache.assert_not_called()
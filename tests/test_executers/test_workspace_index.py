@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from mobros.commands.ros_install_build_deps.catkin_package import read_package_manifest
+from mobros.commands.ros_install_build_deps.workspace_index import (
+    find_package_manifests,
+    load_workspace_index,
+    read_workspace_manifests,
+)
+
+PACKAGE_XML = """<?xml version="1.0"?>
+<package format="2">
+  <name>{name}</name>
+  <version>0.0.1</version>
+  <build_depend version_gte="{version}">ompl</build_depend>
+</package>
+"""
+
+
+def write_package(workspace, folder, name, version="1.0.0-0"):
+    package_folder = os.path.join(workspace, folder)
+    os.makedirs(package_folder, exist_ok=True)
+    package_path = os.path.join(package_folder, "package.xml")
+    with open(package_path, "w", encoding="utf-8") as package_file:
+        package_file.write(PACKAGE_XML.format(name=name, version=version))
+    return package_path
+
+
+class TestWorkspaceIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.workspace = self.tmp_dir.name
+
+        write_package(self.workspace, "src/package_b", "package_b")
+        write_package(self.workspace, "src/package_a", "package_a")
+        write_package(self.workspace, "src/ignored/package_c", "package_c")
+        open(os.path.join(self.workspace, "src", "ignored", "CATKIN_IGNORE"), "w", encoding="utf-8").close()
+        write_package(self.workspace, "install/share/package_a", "package_a")
+        write_package(self.workspace, "src/.git/package_d", "package_d")
+        write_package(self.workspace, "src/tools/build/package_f", "package_f")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_walk_is_pruned(self):
+        manifest_paths = find_package_manifests(self.workspace)
+
+        self.assertListEqual(
+            manifest_paths,
+            [
+                os.path.join(self.workspace, "src", "package_a", "package.xml"),
+                os.path.join(self.workspace, "src", "package_b", "package.xml"),
+                os.path.join(self.workspace, "src", "tools", "build", "package_f", "package.xml"),
+            ],
+        )
+
+    @mock.patch(
+        "mobros.commands.ros_install_build_deps.workspace_index.read_package_manifest",
+        side_effect=read_package_manifest,
+    )
+    def test_only_changed_manifests_are_parsed(self, mock_read_manifest):
+        index_path = os.path.join(self.workspace, "index", "workspace-index.json")
+
+        manifests = read_workspace_manifests(self.workspace, index_path)
+        self.assertListEqual([manifest["name"] for manifest in manifests], ["package_a", "package_b", "package_f"])
+        self.assertEqual(mock_read_manifest.call_count, 3)
+        self.assertEqual(len(load_workspace_index(index_path)), 3)
+
+        manifests = read_workspace_manifests(self.workspace, index_path)
+        self.assertListEqual(manifests[0]["dependencies"], [["ompl", {"version_gte": "1.0.0-0"}]])
+        self.assertEqual(mock_read_manifest.call_count, 3)
+
+        package_b_path = write_package(self.workspace, "src/package_b", "package_b", "2.0.0-0")
+        os.utime(package_b_path, ns=(1, 1))
+        write_package(self.workspace, "src/package_e", "package_e")
+        manifests = read_workspace_manifests(self.workspace, index_path)
+
+        self.assertListEqual(
+            [manifest["name"] for manifest in manifests], ["package_a", "package_b", "package_e", "package_f"]
+        )
+        self.assertEqual(manifests[1]["dependencies"], [("ompl", {"version_gte": "2.0.0-0"})])
+        self.assertEqual(mock_read_manifest.call_count, 5)
+
+    def test_invalid_index_is_discarded(self):
+        index_path = os.path.join(self.workspace, "workspace-index.json")
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            index_file.write('{"version": 0}')
+
+        self.assertDictEqual(load_workspace_index(index_path), {})
+        self.assertFalse(os.path.exists(index_path))
+
+    def test_malformed_entries_are_parsed_again(self):
+        index_path = os.path.join(self.workspace, "workspace-index.json")
+        package_a_path = os.path.join(self.workspace, "src", "package_a", "package.xml")
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            json.dump({"version": 1, "manifests": {package_a_path: {"size": 1}}}, index_file)
+
+        self.assertDictEqual(load_workspace_index(index_path), {})
+        manifests = read_workspace_manifests(self.workspace, index_path)
+        self.assertEqual(manifests[0]["name"], "package_a")
+
+    @mock.patch("mobros.utils.cache_file.remove", side_effect=PermissionError)
+    def test_undeletable_invalid_index(self, mock_remove):
+        index_path = os.path.join(self.workspace, "workspace-index.json")
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            index_file.write("{not json")
+
+        self.assertDictEqual(load_workspace_index(index_path), {})
+        mock_remove.assert_called_once_with(index_path)
@@ -0,0 +1,151 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+import mock
+
+try:
+    import apt
+except ImportError:
+    apt = None
+
+from mobros.constants import APT_UPDATE_MAX_ATTEMPTS, AptUpdateMode
+from mobros.exceptions import AptCacheInitializationException
+from mobros.types.apt_cache_singleton import (
+    AptCache,
+    get_apt_lists_age,
+    is_apt_update_required,
+    stamp_apt_update,
+    wait_for_apt_lock,
+)
+
+HOLD_LOCK_SCRIPT = """
+import fcntl, sys, time
+with open(sys.argv[1], "a") as lock_file:
+    fcntl.lockf(lock_file, fcntl.LOCK_EX)
+    print("locked", flush=True)
+    time.sleep(float(sys.argv[2]))
+"""
+
+
+def hold_lock(lock_path, seconds):
+    holder = subprocess.Popen(
+        [sys.executable, "-c", HOLD_LOCK_SCRIPT, lock_path, str(seconds)], stdout=subprocess.PIPE, text=True
+    )
+    holder.stdout.readline()
+    return holder
+
+
+class TestAptUpdatePolicy(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path_patch = mock.patch("mobros.types.apt_cache_singleton.MOBROS_CACHE_PATH", self.tmp_dir.name)
+        self.cache_path_patch.start()
+
+    def tearDown(self):
+        self.cache_path_patch.stop()
+        self.tmp_dir.cleanup()
+
+    def test_apt_lists_age(self):
+        with tempfile.TemporaryDirectory() as lists_path:
+            self.assertIsNone(get_apt_lists_age(lists_path))
+
+            release_file = os.path.join(lists_path, "ppa_main_InRelease")
+            with open(release_file, "w", encoding="utf8") as release:
+                release.write("Origin: ppa\n")
+            two_hours_ago = time.time() - 7200
+            os.utime(release_file, (two_hours_ago, two_hours_ago))
+
+            self.assertAlmostEqual(get_apt_lists_age(lists_path), 120, delta=1)
+
+    def test_apt_lists_age_after_update(self):
+        with tempfile.TemporaryDirectory() as lists_path:
+            stamp_apt_update()
+            self.assertIsNone(get_apt_lists_age(lists_path))
+
+            # apt dates the Release files with the publication of the repository, not with the update
+            release_file = os.path.join(lists_path, "ppa_main_InRelease")
+            with open(release_file, "w", encoding="utf8") as release:
+                release.write("Origin: ppa\n")
+            two_days_ago = time.time() - 2 * 24 * 60 * 60
+            os.utime(release_file, (two_days_ago, two_days_ago))
+
+            self.assertLess(get_apt_lists_age(lists_path), 1)
+            self.assertFalse(is_apt_update_required(AptUpdateMode.AUTO, 30, lists_path))
+
+    def test_apt_update_required(self):
+        with tempfile.TemporaryDirectory() as lists_path:
+            self.assertTrue(is_apt_update_required(AptUpdateMode.AUTO, 30, lists_path))
+            self.assertFalse(is_apt_update_required(AptUpdateMode.NEVER, 30, lists_path))
+
+            with open(os.path.join(lists_path, "ppa_main_Release"), "w", encoding="utf8") as release:
+                release.write("Origin: ppa\n")
+
+            self.assertFalse(is_apt_update_required(AptUpdateMode.AUTO, 30, lists_path))
+            self.assertTrue(is_apt_update_required(AptUpdateMode.ALWAYS, 30, lists_path))
+            self.assertTrue(is_apt_update_required(AptUpdateMode.AUTO, 0, lists_path))
+
+
+class TestAptLockWait(unittest.TestCase):
+    def test_wait_for_free_lock(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.assertLess(wait_for_apt_lock(1, os.path.join(tmp_dir, "lock")), 0.1)
+
+    def test_wait_for_released_lock(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_path = os.path.join(tmp_dir, "lock")
+            holder = hold_lock(lock_path, 0.5)
+            waited = wait_for_apt_lock(5, lock_path)
+            holder.wait()
+
+            self.assertGreater(waited, 0.2)
+            self.assertLess(waited, 2)
+
+    def test_wait_for_lock_timeout(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_path = os.path.join(tmp_dir, "lock")
+            holder = hold_lock(lock_path, 2)
+            with self.assertRaises(AptCacheInitializationException):
+                wait_for_apt_lock(0.2, lock_path)
+            holder.kill()
+            holder.wait()
+
+
+@unittest.skipIf(apt is None, "python-apt is not installed")
+@mock.patch("mobros.types.apt_cache_singleton.AptCache._update_with_shell")
+@mock.patch("mobros.types.apt_cache_singleton.wait_for_apt_lock", return_value=0)
+@mock.patch("mobros.types.apt_cache_singleton.write_selected_sources_list", return_value=None)
+class TestAptUpdate(unittest.TestCase):
+    def test_lock_always_taken_by_apt(self, mock_sources_list, mock_wait_lock, mock_update_with_shell):
+        apt_cache = mock.Mock()
+        apt_cache.update.side_effect = apt.cache.LockFailedException("lock taken")
+
+        AptCache._update(apt_cache, 300)
+
+        self.assertEqual(apt_cache.update.call_count, APT_UPDATE_MAX_ATTEMPTS)
+        mock_update_with_shell.assert_called_once_with(None)
+
+    @mock.patch("mobros.types.apt_cache_singleton.stamp_apt_update")
+    def test_update_is_stamped(self, mock_stamp, mock_sources_list, mock_wait_lock, mock_update_with_shell):
+        apt_cache = mock.Mock()
+
+        AptCache._update(apt_cache, 300)
+
+        apt_cache.update.assert_called_once_with(sources_list=None)
+        mock_stamp.assert_called_once_with()
+        mock_update_with_shell.assert_not_called()
+
+    @mock.patch("mobros.types.apt_cache_singleton.time.monotonic", side_effect=[0, 0, 10, 10, 10])
+    def test_lock_failures_past_deadline(
+        self, mock_monotonic, mock_sources_list, mock_wait_lock, mock_update_with_shell
+    ):
+        apt_cache = mock.Mock()
+        apt_cache.update.side_effect = apt.cache.LockFailedException("lock taken")
+
+        AptCache._update(apt_cache, 5)
+
+        self.assertEqual(apt_cache.update.call_count, 1)
+        mock_update_with_shell.assert_called_once_with(None)
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import time
+import unittest
+
+import mock
+
+from mobros.types.apt_snapshot import AptSnapshot, compute_index_fingerprint, find_snapshot, get_snapshot_path
+
+ROS_PKG_RECORD = (
+    10,
+    "1.0.0-2",
+    "https://artifacts.cloud.mov.ai/repository/ppa-main/pool/main/r/ros-pkg.deb",
+    (
+        ("1.0.0-3", (("Depends", (("python3", ">=", "3.8"), ("python3-dev", "", ""))),)),
+        ("1.0.0-2", (("Depends", (("python3", "", ""),)), ("Conflicts", (("ros-old", "<", "1.0.0-0"),)))),
+    ),
+)
+PYTHON_RECORD = (11, None, None, (("3.8.10-1", ()),))
+
+
+def build_test_snapshot():
+    records = {"ros-pkg": ROS_PKG_RECORD, "python3": PYTHON_RECORD}
+    provides = {"ros-virtual": (("ros-pkg", 10),)}
+    return AptSnapshot(AptSnapshot.serialize(records, ["ros-pkg"], provides))
+
+
+class TestAptSnapshot(unittest.TestCase):
+    def test_snapshot_lookups(self):
+        snapshot = build_test_snapshot()
+
+        self.assertIsNone(snapshot.get("missing"))
+        self.assertIn("python3", snapshot)
+
+        package = snapshot.get("ros-pkg")
+        self.assertTrue(package.is_installed)
+        self.assertEqual(package.installed.version, "1.0.0-2")
+        self.assertEqual(package.id, 10)
+        self.assertListEqual([str(v) for v in package.versions], ["ros-pkg=1.0.0-3", "ros-pkg=1.0.0-2"])
+        self.assertIsNone(package.versions.get("0.0.0-1"))
+
+        dependencies = package.versions.get("1.0.0-3").dependencies
+        self.assertEqual(len(dependencies), 1)
+        self.assertEqual([dep.name for dep in dependencies[0]], ["python3", "python3-dev"])
+        self.assertEqual(dependencies[0][0].relation, ">=")
+        self.assertEqual(dependencies[0][0].rawtype, "Depends")
+
+        conflicts = package.installed.get_dependencies("Conflicts")
+        self.assertEqual(conflicts[0][0].name, "ros-old")
+        self.assertTrue(package.installed.uri.endswith("ros-pkg.deb"))
+
+        self.assertFalse(snapshot.get("python3").is_installed)
+        self.assertTrue(snapshot.is_virtual_package("ros-virtual"))
+        self.assertFalse(snapshot.is_virtual_package("ros-pkg"))
+        self.assertEqual([pkg.name for pkg in snapshot.get_providing_packages("ros-virtual")], ["ros-pkg"])
+        self.assertEqual([pkg.name for pkg in snapshot.get_installed_packages()], ["ros-pkg"])
+
+    def test_snapshot_installed_lookups(self):
+        records = {"ros-pkg": ROS_PKG_RECORD, "python3": PYTHON_RECORD}
+        provides = {"ros-virtual": (("python3", 11), ("ros-pkg", 10)), "py-virtual": (("python3", 11),)}
+        snapshot = AptSnapshot(AptSnapshot.serialize(records, ["ros-pkg"], provides))
+
+        self.assertTrue(snapshot.is_installed("ros-pkg"))
+        self.assertFalse(snapshot.is_installed("python3"))
+        self.assertEqual(snapshot.get_installed_provider("ros-virtual"), "ros-pkg")
+        self.assertIsNone(snapshot.get_installed_provider("py-virtual"))
+        self.assertIsNone(snapshot.get_installed_provider("ros-pkg"))
+
+    def test_snapshot_save_load(self):
+        snapshot = build_test_snapshot()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot_path = os.path.join(tmp_dir, "test.snapshot")
+            snapshot.save(snapshot_path)
+            loaded = AptSnapshot.load(snapshot_path)
+
+            self.assertEqual(len(loaded), 2)
+            self.assertEqual(loaded.get("ros-pkg").installed.version, "1.0.0-2")
+
+    def test_snapshot_invalid_buffer(self):
+        with self.assertRaises(ValueError):
+            AptSnapshot(b"NOTASNAP" + bytes(8))
+
+    @mock.patch("mobros.utils.cache_file.remove", side_effect=PermissionError)
+    def test_undeletable_invalid_snapshot(self, mock_remove):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with mock.patch("mobros.types.apt_snapshot.MOBROS_CACHE_PATH", tmp_dir):
+                snapshot_path = get_snapshot_path("fingerprint")
+                with open(snapshot_path, "wb") as snapshot_file:
+                    snapshot_file.write(b"NOTASNAP" + bytes(8))
+
+                self.assertIsNone(find_snapshot("fingerprint"))
+                mock_remove.assert_called_once_with(snapshot_path)
+
+    def test_index_fingerprint_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lists_path = os.path.join(tmp_dir, "lists")
+            os.mkdir(lists_path)
+            status_path = os.path.join(tmp_dir, "status")
+            list_file = os.path.join(lists_path, "ppa_main_Packages")
+
+            with open(status_path, "w", encoding="utf8") as status_file:
+                status_file.write("Package: ros-pkg\n")
+            with open(list_file, "w", encoding="utf8") as packages_file:
+                packages_file.write("Package: ros-pkg\n")
+
+            fingerprint = compute_index_fingerprint(lists_path, status_path)
+            self.assertEqual(fingerprint, compute_index_fingerprint(lists_path, status_path))
+
+            with open(os.path.join(lists_path, "lock"), "w", encoding="utf8") as lock_file:
+                lock_file.write("")
+            self.assertEqual(fingerprint, compute_index_fingerprint(lists_path, status_path))
+
+            future = time.time() + 10
+            os.utime(list_file, (future, future))
+            self.assertNotEqual(fingerprint, compute_index_fingerprint(lists_path, status_path))
+
+    def test_index_fingerprint_follows_apt_configuration(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            status_path = os.path.join(tmp_dir, "status")
+            preferences_path = os.path.join(tmp_dir, "preferences.d")
+            os.mkdir(preferences_path)
+            config_paths = (os.path.join(tmp_dir, "preferences"), preferences_path)
+
+            with mock.patch("mobros.types.apt_snapshot.get_apt_architectures", return_value=["amd64"]):
+                fingerprint = compute_index_fingerprint(tmp_dir, status_path, config_paths)
+                self.assertEqual(fingerprint, compute_index_fingerprint(tmp_dir, status_path, config_paths))
+
+                with open(os.path.join(preferences_path, "ros"), "w", encoding="utf8") as pin_file:
+                    pin_file.write("Package: ros-*\nPin: origin packages.ros.org\nPin-Priority: 1001\n")
+                pinned_fingerprint = compute_index_fingerprint(tmp_dir, status_path, config_paths)
+                self.assertNotEqual(fingerprint, pinned_fingerprint)
+
+            with mock.patch("mobros.types.apt_snapshot.get_apt_architectures", return_value=["amd64", "i386"]):
+                self.assertNotEqual(pinned_fingerprint, compute_index_fingerprint(tmp_dir, status_path, config_paths))
@@ -0,0 +1,72 @@
+import unittest
+
+import mock
+
+from mobros.dependency_manager.dependency_manager import DependencyManager
+from mobros.exceptions import InstallCandidateNotFoundException
+from mobros.types.candidate_cache import CandidateCache, canonicalize_version_rules
+from mobros.types.mobros_global_data import GlobalData
+from mobros.types.worker_pool import WorkerPool
+from mobros.utils import apt_utils
+from mobros.utils.version_utils import create_version_rule
+from tests.test_executers.mocks.mock_package import MockPackage
+
+AVAILABLE_VERSIONS = ["2.0.0-0", "1.5.0-0", "1.0.0-0"]
+
+
+class TestCandidateCache(unittest.TestCase):
+    def test_canonicalize_version_rules(self):
+        rule_a = create_version_rule("version_gte", "1.0.0-0", "pkg_a")
+        rule_b = create_version_rule("version_lt", "2.0.0-0", "pkg_b")
+        rule_c = {"operator": "", "version": None, "from": "pkg_c"}
+
+        fingerprint, canonical_rules = canonicalize_version_rules([rule_a, rule_b, rule_c, rule_a])
+        self.assertEqual(fingerprint, canonicalize_version_rules([rule_c, rule_b, rule_a])[0])
+        self.assertEqual(len(fingerprint), 3)
+        self.assertListEqual(canonical_rules, [rule_c, rule_a, rule_b])
+
+    @mock.patch("mobros.utils.apt_utils.get_package_available_versions", return_value=AVAILABLE_VERSIONS)
+    def test_find_candidate_online_cached(self, mock_get_versions):
+        rules = [
+            create_version_rule("version_gte", "1.0.0-0", "pkg_a"),
+            create_version_rule("version_lt", "2.0.0-0", "pkg_b"),
+        ]
+        hits, misses = CandidateCache().get_statistics()
+
+        self.assertListEqual(apt_utils.find_candidate_online("cached_pkg", rules), ["1.5.0-0", "1.0.0-0"])
+        self.assertListEqual(apt_utils.find_candidate_online("cached_pkg", list(reversed(rules))), ["1.5.0-0", "1.0.0-0"])
+        self.assertEqual(CandidateCache().get_statistics(), (hits + 1, misses + 1))
+
+        impossible_rules = [create_version_rule("version_gt", "3.0.0-0", "pkg_c")]
+        for _ in range(2):
+            with self.assertRaises(InstallCandidateNotFoundException) as context:
+                apt_utils.find_candidate_online("cached_pkg", impossible_rules)
+            self.assertIn("from pkg_c", context.exception.message)
+        self.assertEqual(CandidateCache().get_statistics(), (hits + 2, misses + 2))
+
+    def test_find_candidate_online_new_versions(self):
+        rules = [create_version_rule("version_gte", "1.0.0-0", "pkg_a")]
+        with mock.patch("mobros.utils.apt_utils.get_package_available_versions", return_value=AVAILABLE_VERSIONS):
+            self.assertEqual(apt_utils.find_candidate_online("updated_pkg", rules)[0], "2.0.0-0")
+        with mock.patch("mobros.utils.apt_utils.get_package_available_versions", return_value=["3.0.0-0"] + AVAILABLE_VERSIONS):
+            self.assertEqual(apt_utils.find_candidate_online("updated_pkg", rules)[0], "3.0.0-0")
+
+    @mock.patch("mobros.utils.apt_utils.get_package_available_versions", return_value=AVAILABLE_VERSIONS)
+    def test_worker_lookups_are_counted(self, mock_get_versions):
+        dep_manager = DependencyManager()
+        dep_manager.skip_installed = True
+        package = MockPackage("worker_pkg")
+        for index in range(20):
+            package._register_dependency("worker_dep_" + str(index), "version_gte", "1.0.0-0")
+        dep_manager.register_package(package)
+        hits, misses = CandidateCache().get_statistics()
+
+        GlobalData().set_worker_jobs(2)
+        WorkerPool().start()
+        try:
+            dep_manager.calculate_installs()
+        finally:
+            WorkerPool().stop()
+            GlobalData().set_worker_jobs(None)
+
+        self.assertEqual(CandidateCache().get_statistics(), (hits, misses + 20))
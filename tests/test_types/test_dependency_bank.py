@@ -0,0 +1,77 @@
+import unittest
+
+from mobros.types.dependency_bank import DependencyBank
+from mobros.utils.version_utils import create_version_rule
+
+
+class TestDependencyBank(unittest.TestCase):
+    def test_add_rules_deduplicates(self):
+        bank = DependencyBank()
+        bank.add_rules("python3", [create_version_rule("version_gte", "3.8.0-0", "my_app=1.0.0-0")])
+        bank.add_rules(
+            "python3",
+            [
+                create_version_rule("version_gte", "3.8.0-0", "my_app=1.0.0-0"),
+                create_version_rule("version_gte", "3.8.0-0", "my_tool=2.0.0-0"),
+            ],
+        )
+
+        self.assertIn("python3", bank)
+        self.assertEqual(len(bank["python3"]), 2)
+        self.assertEqual(bank.count_registered_constraints("python3", [create_version_rule("version_gte", "3.8.0-0", "")]), 2)
+        self.assertEqual(bank.count_registered_constraints("unknown", [create_version_rule("version_gte", "3.8.0-0", "")]), 0)
+
+    def test_origin_index(self):
+        bank = DependencyBank()
+        bank.add_rules("python3", [create_version_rule("version_gte", "3.8.0-0", "my_app=1.0.0-0")])
+        bank.add_rules("libc6", [create_version_rule("version_lt", "3.0.0-0", "my_app=1.0.0-0")])
+        bank.add_rules("my_app", [create_version_rule("version_eq", "1.0.0-0", "user")])
+
+        self.assertTrue(bank.has_rule_from("my_app", "user"))
+        self.assertFalse(bank.has_rule_from("python3", "user"))
+        self.assertListEqual(sorted(bank.get_packages_from("my_app=1.0.0-0")), ["libc6", "python3"])
+
+        bank.remove_rule("libc6", create_version_rule("version_lt", "3.0.0-0", "my_app=1.0.0-0"))
+        self.assertListEqual(bank.get_packages_from("my_app=1.0.0-0"), ["python3"])
+        self.assertListEqual(bank["libc6"], [])
+
+        del bank["python3"]
+        self.assertListEqual(bank.get_packages_from("my_app=1.0.0-0"), [])
+
+    def test_remove_rules_from(self):
+        bank = DependencyBank()
+        bank.add_rules(
+            "python3",
+            [
+                create_version_rule("version_eq", "3.8.2-0", "Installed"),
+                create_version_rule("version_gte", "3.8.0-0", "my_app=1.0.0-0"),
+            ],
+        )
+
+        bank.remove_rules_from("python3", "Installed")
+        self.assertListEqual(bank["python3"], [create_version_rule("version_gte", "3.8.0-0", "my_app=1.0.0-0")])
+        self.assertFalse(bank.has_rule_from("python3", "Installed"))
+        self.assertEqual(bank.count_registered_constraints("python3", [create_version_rule("version_eq", "3.8.2-0", "")]), 0)
+
+    def test_setitem_reindexes(self):
+        bank = DependencyBank()
+        bank.add_rules("python3", [create_version_rule("version_eq", "3.8.2-0", "Installed")])
+        bank.add_rules("libc6", [])
+
+        bank["python3"] = [create_version_rule("version_gte", "3.8.0-0", "user")]
+        self.assertFalse(bank.has_rule_from("python3", "Installed"))
+        self.assertTrue(bank.has_rule_from("python3", "user"))
+        self.assertListEqual(list(bank.keys()), ["python3", "libc6"])
+
+    def test_dirty_items(self):
+        bank = DependencyBank()
+        bank.add_rules("python3", [create_version_rule("version_gte", "3.8.0-0", "my_app")])
+        bank.add_rules("libc6", [create_version_rule("version_lt", "3.0.0-0", "my_app")])
+        bank.add_rules("zlib", [])
+
+        bank.mark_dirty("zlib")
+        bank.mark_dirty("python3")
+        bank.colision_dirty.clear()
+
+        self.assertListEqual(bank.dirty_items(bank.colision_dirty), [])
+        self.assertListEqual([name for name, _ in bank.dirty_items(bank.candidate_dirty)], ["python3", "zlib"])
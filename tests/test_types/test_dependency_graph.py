@@ -0,0 +1,108 @@
+import unittest
+
+from anytree import PreOrderIter
+
+from mobros.types.dependency_graph import DependencyGraph
+
+
+def build_ros_graph():
+    graph = DependencyGraph()
+    graph.add_edge("/", "ros-noetic-desktop")
+    graph.add_edge("ros-noetic-desktop", "ros-noetic-roscpp")
+    graph.add_edge("ros-noetic-desktop", "ros-noetic-rviz")
+    graph.add_edge("ros-noetic-rviz", "ros-noetic-roscpp")
+    graph.add_edge("ros-noetic-roscpp", "ros-noetic-rosconsole")
+    graph.add_edge("ros-noetic-rosconsole", "libboost-dev")
+    graph.add_edge("ros-noetic-rviz", "libboost-dev")
+    return graph
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def test_shared_dependencies_are_stored_once(self):
+        graph = build_ros_graph()
+
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(graph.count_edges(), 7)
+        self.assertListEqual(graph.get_parents("ros-noetic-roscpp"), ["ros-noetic-desktop", "ros-noetic-rviz"])
+        self.assertListEqual(graph.get_children("unknown"), [])
+
+    def test_level_order_by_shortest_path(self):
+        graph = build_ros_graph()
+
+        self.assertListEqual(
+            list(graph.level_order()),
+            [
+                ["/"],
+                ["ros-noetic-desktop"],
+                ["ros-noetic-roscpp", "ros-noetic-rviz"],
+                ["ros-noetic-rosconsole", "libboost-dev"],
+            ],
+        )
+
+    def test_walk_and_remove_edge(self):
+        graph = build_ros_graph()
+        self.assertListEqual(
+            graph.walk("ros-noetic-roscpp"), ["ros-noetic-roscpp", "ros-noetic-rosconsole", "libboost-dev"]
+        )
+
+        graph.remove_edge("ros-noetic-roscpp", "ros-noetic-rosconsole")
+        self.assertFalse(graph.has_edge("ros-noetic-roscpp", "ros-noetic-rosconsole"))
+        self.assertIn("ros-noetic-rosconsole", graph)
+        self.assertListEqual(graph.walk("ros-noetic-roscpp"), ["ros-noetic-roscpp"])
+        self.assertListEqual(graph.walk("unknown"), [])
+
+    def test_cycles_are_walked_once(self):
+        graph = DependencyGraph()
+        graph.add_edge("/", "libc6")
+        graph.add_edge("libc6", "libgcc-s1")
+        graph.add_edge("libgcc-s1", "libc6")
+
+        self.assertListEqual(list(graph.level_order()), [["/"], ["libc6"], ["libgcc-s1"]])
+        self.assertListEqual(graph.walk("libgcc-s1"), ["libgcc-s1", "libc6"])
+        self.assertTrue(graph.is_upstream("libc6", "libc6"))
+
+    def test_tree_expands_repeated_subtrees_once(self):
+        tree = build_ros_graph().to_tree()
+
+        names = [node.name for node in PreOrderIter(tree)]
+        self.assertListEqual(
+            names,
+            [
+                "/",
+                "ros-noetic-desktop",
+                "ros-noetic-roscpp",
+                "ros-noetic-rosconsole",
+                "libboost-dev",
+                "ros-noetic-rviz",
+                "ros-noetic-roscpp (...)",
+                "libboost-dev",
+            ],
+        )
+
+    def test_upstream_queries(self):
+        graph = build_ros_graph()
+
+        self.assertTrue(graph.is_upstream("ros-noetic-desktop", "libboost-dev"))
+        self.assertTrue(graph.is_upstream("ros-noetic-rviz", "ros-noetic-rosconsole"))
+        self.assertFalse(graph.is_upstream("libboost-dev", "ros-noetic-rviz"))
+        self.assertFalse(graph.is_upstream("ros-noetic-roscpp", "ros-noetic-roscpp"))
+        self.assertSetEqual(
+            graph.get_ancestors("ros-noetic-rosconsole"),
+            {"/", "ros-noetic-desktop", "ros-noetic-rviz", "ros-noetic-roscpp"},
+        )
+
+    def test_edge_changes_refresh_cached_descendants(self):
+        graph = build_ros_graph()
+        self.assertSetEqual(graph.get_descendants("ros-noetic-rosconsole"), {"libboost-dev"})
+        self.assertNotIn("liblog4cxx", graph.get_descendants("ros-noetic-desktop"))
+        self.assertSetEqual(
+            graph.get_descendants("ros-noetic-rviz"), {"ros-noetic-roscpp", "ros-noetic-rosconsole", "libboost-dev"}
+        )
+
+        graph.add_edge("ros-noetic-rosconsole", "liblog4cxx")
+        self.assertIn("liblog4cxx", graph.get_descendants("ros-noetic-desktop"))
+        self.assertIn("liblog4cxx", graph.get_descendants("ros-noetic-rviz"))
+
+        graph.remove_edge("ros-noetic-rviz", "ros-noetic-roscpp")
+        self.assertSetEqual(graph.get_descendants("ros-noetic-rviz"), {"libboost-dev"})
+        self.assertTrue(graph.is_upstream("ros-noetic-desktop", "liblog4cxx"))
@@ -0,0 +1,34 @@
+import os
+import unittest
+
+import mock
+
+from mobros.types.installed_state import InstalledState, parse_dpkg_status
+
+DPKG_STATUS_FIXTURE = os.path.join(os.getcwd(), "tests", "resources", "dpkg", "status")
+
+
+class TestInstalledState(unittest.TestCase):
+    def test_parse_dpkg_status(self):
+        packages, providers = parse_dpkg_status(DPKG_STATUS_FIXTURE, "amd64")
+
+        self.assertListEqual(sorted(packages), ["libfoo:i386", "my_app", "python3"])
+        self.assertEqual(packages["python3"], ("3.8.2-0", "python3-minimal (= 3.8.2-0)"))
+        self.assertDictEqual(providers, {"python3-any": ["python3"], "python3-api": ["python3"]})
+
+    @mock.patch("mobros.types.installed_state.DPKG_STATUS_PATH", DPKG_STATUS_FIXTURE)
+    @mock.patch("mobros.types.installed_state.get_native_architecture", return_value="amd64")
+    def test_installed_state(self, mock_native_architecture):
+        installed_state = InstalledState()
+
+        self.assertEqual(installed_state.get_installed_version("my_app"), "0.0.0-1")
+        self.assertIsNone(installed_state.get_installed_version("python2"))
+        self.assertTrue(installed_state.is_installed("python3", "3.8.2-0"))
+        self.assertFalse(installed_state.is_installed("python3", "3.9.0-0"))
+        self.assertTrue(installed_state.is_installed("libfoo:i386"))
+        self.assertFalse(installed_state.is_installed("libfoo"))
+        self.assertListEqual(
+            installed_state.get_dependencies("my_app"),
+            [[("python3", ">=", "1.0.0-0")], [("libc6", "<", "3.0.0-0"), ("libc6-compat", "", "")]],
+        )
+        self.assertListEqual(installed_state.get_installed_providers("python3-api"), ["python3"])
@@ -0,0 +1,145 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+
+from mobros.constants import PackageIndexBackend
+from mobros.exceptions import PackageIndexException
+from mobros.types.apt_cache_singleton import AptCache
+from mobros.types.mobros_global_data import GlobalData
+from mobros.types.package_index import (
+    PACKAGE_ID_LIST_SHIFT,
+    PackagesListsIndex,
+    load_fixture_index,
+    load_packages_lists_index,
+)
+from mobros.types.package_index_interface import PackageIndex
+from mobros.utils import apt_utils
+
+PACKAGE_INDEX_FIXTURE = os.path.join(os.getcwd(), "tests", "resources", "package_index", "fixture.json")
+DPKG_STATUS_FIXTURE = os.path.join(os.getcwd(), "tests", "resources", "dpkg", "status")
+
+PACKAGES_LIST = """Package: python3
+Architecture: amd64
+Version: 3.9.0-0
+Depends: python3-minimal (= 3.9.0-0)
+Filename: pool/main/p/python3/python3_3.9.0-0_amd64.deb
+
+Package: python3
+Architecture: amd64
+Version: 3.8.2-0
+Filename: pool/main/p/python3/python3_3.8.2-0_amd64.deb
+
+Package: python3-yaml
+Architecture: amd64
+Version: 5.3.1-1
+Provides: python3-yaml-abi
+Filename: pool/main/p/python3-yaml/python3-yaml_5.3.1-1_amd64.deb
+"""
+
+
+class TestPackageIndex(unittest.TestCase):
+    def test_load_fixture_index(self):
+        index = load_fixture_index(PACKAGE_INDEX_FIXTURE)
+        self.assertIsInstance(index, PackageIndex)
+
+        app = index.get("ros-noetic-my-app")
+        self.assertListEqual([version.version for version in app.versions], ["1.1.0-1", "1.0.0-1"])
+        self.assertFalse(app.is_installed)
+        dependencies = app.versions.get("1.0.0-1").dependencies
+        self.assertEqual([[(dep.name, dep.relation, dep.version) for dep in or_deps] for or_deps in dependencies],
+                         [[("ros-noetic-my-lib", ">=", "1.0.0-0")], [("python3-yaml", "", ""), ("python3-any", "", "")]])
+
+        lib = index.get("ros-noetic-my-lib")
+        self.assertEqual(lib.installed.version, "1.0.0-0")
+        self.assertEqual(lib.installed.uri, "artifacts/repository/pool/ros-noetic-my-lib_1.0.0-0.deb")
+        self.assertEqual(index.get_installed_origin("ros-noetic-my-lib"), lib.installed.uri)
+        self.assertIsNone(index.get_installed_origin("ros-noetic-my-app"))
+        conflicts = lib.versions.get("1.2.0-0").get_dependencies("Conflicts")
+        self.assertEqual((conflicts[0][0].name, conflicts[0][0].relation), ("ros-noetic-old-lib", "<"))
+
+        self.assertTrue(index.is_virtual_package("python3-any"))
+        self.assertTrue(index.is_virtual_package("python3:any"))
+        self.assertFalse(index.is_virtual_package("python3"))
+        self.assertListEqual([pkg.name for pkg in index.get_providing_packages("python3-any")], ["python3"])
+        self.assertEqual(index.get_installed_provider("python3-any"), "python3")
+        self.assertListEqual(sorted(pkg.name for pkg in index.get_installed_packages()), ["python3", "ros-noetic-my-lib"])
+
+    def test_load_packages_lists_index(self):
+        lists_path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(lists_path, "archive.ubuntu.com_ubuntu_dists_focal_main_binary-amd64_Packages"), "w", encoding="utf8") as stream:
+                stream.write(PACKAGES_LIST)
+
+            with mock.patch("mobros.types.package_index.get_native_architecture", return_value="amd64"):
+                index = load_packages_lists_index(lists_path, DPKG_STATUS_FIXTURE)
+        finally:
+            shutil.rmtree(lists_path)
+
+        self.assertIsInstance(index, PackageIndex)
+        python3 = index.get("python3")
+        self.assertListEqual([version.version for version in python3.versions], ["3.9.0-0", "3.8.2-0"])
+        self.assertEqual(python3.installed.version, "3.8.2-0")
+        self.assertEqual(python3.installed.uri, "archive.ubuntu.com/ubuntu/pool/main/p/python3/python3_3.8.2-0_amd64.deb")
+        self.assertEqual(apt_utils.clean_apt_versions(python3.versions), ["3.9.0-0", "3.8.2-0"])
+        self.assertTrue(index.get("my_app").is_installed)
+        # packages only installed are numbered after the lists, by their position in the dpkg status
+        self.assertEqual(index.get("my_app").id, 1 << PACKAGE_ID_LIST_SHIFT)
+        self.assertEqual(index.get("libfoo:i386").id, (1 << PACKAGE_ID_LIST_SHIFT) + 2)
+        self.assertIsNone(index.get("python2"))
+        self.assertIn("libfoo:i386", index)
+        self.assertTrue(index.is_virtual_package("python3-yaml-abi"))
+        self.assertFalse(index.is_virtual_package("python3-yaml"))
+        # only the candidate version provides, like in apt
+        self.assertFalse(index.is_virtual_package("python3-any"))
+        self.assertListEqual(sorted(pkg.name for pkg in index.get_installed_packages()), ["libfoo:i386", "my_app", "python3"])
+
+    def test_load_compressed_packages_lists(self):
+        lists_path = tempfile.mkdtemp()
+        try:
+            with gzip.open(os.path.join(lists_path, "archive.ubuntu.com_ubuntu_dists_focal_main_binary-amd64_Packages.gz"), "wt", encoding="utf8") as stream:
+                stream.write(PACKAGES_LIST)
+            index = PackagesListsIndex(lists_path, os.devnull, "amd64")
+        finally:
+            shutil.rmtree(lists_path)
+
+        python3 = index.get("python3")
+        self.assertListEqual([version.version for version in python3.versions], ["3.9.0-0", "3.8.2-0"])
+        dependencies = python3.versions.get("3.9.0-0").dependencies
+        self.assertEqual([[(dep.name, dep.relation, dep.version) for dep in or_deps] for or_deps in dependencies],
+                         [[("python3-minimal", "=", "3.9.0-0")]])
+        self.assertTrue(index.is_virtual_package("python3-yaml-abi"))
+
+    @mock.patch("mobros.types.package_index.lz4", None)
+    def test_unsupported_compressed_packages_lists(self):
+        lists_path = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(lists_path, "archive.ubuntu.com_ubuntu_dists_focal_main_binary-amd64_Packages.lz4"), "wb") as stream:
+                stream.write(b"not read")
+            with self.assertRaises(PackageIndexException) as context:
+                PackagesListsIndex(lists_path, os.devnull, "amd64")
+        finally:
+            shutil.rmtree(lists_path)
+
+        self.assertIn("archive.ubuntu.com_ubuntu_dists_focal_main_binary-amd64_Packages.lz4", context.exception.message)
+
+
+@mock.patch.object(GlobalData, "_package_index_fixture", PACKAGE_INDEX_FIXTURE)
+@mock.patch.object(GlobalData, "_package_index_backend", PackageIndexBackend.FIXTURE)
+@mock.patch.object(AptCache, "_installed_cache", None)
+@mock.patch.object(AptCache, "_cache", None)
+@mock.patch.object(AptCache, "_instance", None)
+class TestFixtureBackend(unittest.TestCase):
+    def test_resolve_from_fixture(self):
+        self.assertListEqual(apt_utils.get_package_available_versions("ros-noetic-my-lib"), ["1.2.0-0", "1.0.0-0"])
+        self.assertTrue(apt_utils.is_virtual_package("python3-any"))
+        self.assertTrue(apt_utils.is_package_already_installed("ros-noetic-my-lib", "1.0.0-0"))
+        self.assertEqual(apt_utils.get_package_installed_version("python3"), "3.8.2-0")
+        self.assertEqual(apt_utils.get_package_origin("ros-noetic-my-lib"), "artifacts/repository")
+
+        dependencies = apt_utils.inspect_package("ros-noetic-my-app", "1.1.0-1", True)
+        self.assertListEqual(list(dependencies), ["ros-noetic-my-lib"])
+        self.assertEqual(dependencies["ros-noetic-my-lib"][0]["operator"], "version_gte")
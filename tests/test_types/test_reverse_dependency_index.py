@@ -0,0 +1,24 @@
+import unittest
+
+from mobros.types.reverse_dependency_index import ReverseDependencyIndex
+from tests.test_executers.mocks.mock_apt_cache import MockAptInstalledCache, MockPkgDependency
+
+
+class TestReverseDependencyIndex(unittest.TestCase):
+    def test_reverse_dependencies(self):
+        installed_packages = [
+            MockAptInstalledCache("my_app", "0.0.0-1", [[MockPkgDependency("python3", ">=", "3.8.0-0")]]),
+            MockAptInstalledCache(
+                "my_tool",
+                "1.0.0-1",
+                [[MockPkgDependency("python3", "", "")], [MockPkgDependency("libc6", "<", "3.0.0-0")]],
+            ),
+        ]
+
+        reverse_dependencies = ReverseDependencyIndex().get_reverse_dependencies(installed_packages, "python3")
+        self.assertEqual([(dep.name, dep.version) for dep in reverse_dependencies], [("my_app", "0.0.0-1"), ("my_tool", "1.0.0-1")])
+        self.assertEqual(reverse_dependencies[0].relation, ">=")
+        self.assertEqual(reverse_dependencies[0].dependency_version, "3.8.0-0")
+
+        self.assertEqual(len(ReverseDependencyIndex().get_reverse_dependencies(installed_packages, "libc6")), 1)
+        self.assertListEqual(ReverseDependencyIndex().get_reverse_dependencies(installed_packages, "unknown"), [])
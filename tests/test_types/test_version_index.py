@@ -0,0 +1,60 @@
+import unittest
+
+from mobros.types.version_index import PackageVersionIndex, VersionIndex
+from mobros.utils.version_utils import create_version_rule, filter_versions_by_rules
+
+ORDERED_VERSIONS = ["2.0.0-8", "2.0.0-7", "1.10.0-1", "1.2.0-3", "0.9.0-1"]
+
+
+class TestPackageVersionIndex(unittest.TestCase):
+    def test_ranks(self):
+        index = PackageVersionIndex(ORDERED_VERSIONS)
+
+        self.assertEqual(index.rank("2.0.0-8"), 4)
+        self.assertEqual(index.rank("0.9.0-1"), 0)
+        self.assertIsNone(index.rank("3.0.0-0"))
+        self.assertIn("1.2.0-3", index)
+
+    def test_count_newer(self):
+        index = PackageVersionIndex(ORDERED_VERSIONS)
+
+        self.assertEqual(index.count_newer("2.0.0-7"), 1)
+        self.assertEqual(index.count_newer("2.0.0-7", included=True), 2)
+        self.assertEqual(index.count_newer("1.5.0-0"), 3)
+        self.assertEqual(index.count_newer("3.0.0-0"), 0)
+        self.assertEqual(index.count_newer("0.1.0-0"), 5)
+
+    def test_filter_by_rules_matches_list_filter(self):
+        index = PackageVersionIndex(ORDERED_VERSIONS)
+        rule_sets = [
+            [create_version_rule("version_gte", "1.2.0-3", "a")],
+            [create_version_rule("version_gt", "1.2.0-3", "a")],
+            [create_version_rule("version_lt", "2.0.0-7", "a"), create_version_rule("version_gt", "1.0.0-0", "b")],
+            [create_version_rule("version_lte", "2.0.0-7", "a"), create_version_rule("version_gte", "1.10.0-1", "b")],
+            [create_version_rule("version_lte", "1.0.0-0", "a"), create_version_rule("version_gte", "1.10.0-1", "b")],
+            [create_version_rule("version_eq", "1.10.0-1", "a")],
+            [create_version_rule("version_eq", "1.11.0-1", "a")],
+            [create_version_rule("any", "", "a")],
+        ]
+
+        for rules in rule_sets:
+            self.assertEqual(
+                filter_versions_by_rules(ORDERED_VERSIONS, rules, "pkg", index),
+                filter_versions_by_rules(ORDERED_VERSIONS, rules, "pkg"),
+            )
+
+    def test_version_index_reuse(self):
+        apt_versions = ["pkg=1.0.0-1", "pkg=2.0.0-1"]
+        clean_calls = []
+
+        def clean(versions):
+            clean_calls.append(versions)
+            return ["2.0.0-1", "1.0.0-1"]
+
+        index = VersionIndex().get_index("test-version-index-pkg", apt_versions, clean)
+        self.assertIs(index, VersionIndex().get_index("test-version-index-pkg", apt_versions, clean))
+        self.assertIs(index, VersionIndex().get_ordered_index("test-version-index-pkg", ["2.0.0-1", "1.0.0-1"]))
+        self.assertEqual(len(clean_calls), 1)
+
+        other_index = VersionIndex().get_ordered_index("test-version-index-pkg", ["3.0.0-1"])
+        self.assertListEqual(other_index.versions, ["3.0.0-1"])
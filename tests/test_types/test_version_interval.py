@@ -0,0 +1,74 @@
+import unittest
+
+from mobros.types.dependency_bank import DependencyBank
+from mobros.types.version_interval import VersionInterval, find_conflicting_rules
+from mobros.utils.version_utils import create_version_rule
+
+
+class TestVersionInterval(unittest.TestCase):
+    def test_tightest_edges_are_kept(self):
+        interval = VersionInterval(
+            [
+                create_version_rule("version_gte", "1.0.0-0", "a"),
+                create_version_rule("version_gt", "1.2.0-0", "b"),
+                create_version_rule("version_gte", "1.2.0-0", "c"),
+                create_version_rule("version_lt", "3.0.0-0", "d"),
+                create_version_rule("version_lte", "2.0.0-0", "e"),
+                create_version_rule("any", "", "f"),
+            ]
+        )
+
+        self.assertFalse(interval.empty)
+        self.assertEqual(interval.bottom["from"], "b")
+        self.assertEqual(interval.top["from"], "e")
+
+    def test_conflict_detected_when_rule_is_added(self):
+        interval = VersionInterval([create_version_rule("version_gte", "1.0.0-0", "a")])
+        self.assertFalse(interval.add(create_version_rule("version_lte", "1.0.0-0", "b")))
+        self.assertTrue(interval.add(create_version_rule("version_lt", "1.0.0-0", "c")))
+        self.assertTrue(interval.add(create_version_rule("version_lte", "5.0.0-0", "d")))
+
+    def test_multi_equals(self):
+        rules = [
+            create_version_rule("version_eq", "1.0.0-0", "a"),
+            create_version_rule("version_gte", "1.0.0-0", "b"),
+            create_version_rule("version_eq", "1.0.0-1", "c"),
+        ]
+        self.assertTrue(VersionInterval(rules).empty)
+        self.assertListEqual([rule["from"] for rule in find_conflicting_rules(rules)], ["a", "c"])
+
+    def test_equals_out_of_edges(self):
+        rules = [
+            create_version_rule("version_gt", "1.0.0-0", "a"),
+            create_version_rule("version_gte", "2.0.0-0", "b"),
+            create_version_rule("version_eq", "1.0.0-0", "Installed"),
+            create_version_rule("version_gte", "0.5.0-0", "c"),
+        ]
+        self.assertTrue(VersionInterval(rules).empty)
+        self.assertListEqual([rule["from"] for rule in find_conflicting_rules(rules)], ["a", "b", "Installed"])
+
+    def test_edges_conflict(self):
+        rules = [
+            create_version_rule("version_gte", "2.0.0-0", "a"),
+            create_version_rule("version_lt", "2.0.0-0", "b"),
+        ]
+        self.assertTrue(VersionInterval(rules).empty)
+        self.assertListEqual([rule["from"] for rule in find_conflicting_rules(rules)], ["b", "a"])
+        self.assertListEqual(find_conflicting_rules(rules[:1]), [])
+
+    def test_bank_conflict_cleared_on_removal(self):
+        bank = DependencyBank()
+        bank.add_rules(
+            "python3",
+            [
+                create_version_rule("version_eq", "3.8.2-0", "Installed"),
+                create_version_rule("version_gte", "3.9.0-0", "my_app=1.0.0-0"),
+            ],
+        )
+        conflict = bank.get_conflict("python3")
+        self.assertEqual(conflict["name"], "python3")
+        self.assertListEqual([rule["from"] for rule in conflict["rules"]], ["my_app=1.0.0-0", "Installed"])
+
+        bank.remove_rules_from("python3", "Installed")
+        self.assertIsNone(bank.get_conflict("python3"))
+        self.assertIsNone(bank.get_conflict("unknown"))
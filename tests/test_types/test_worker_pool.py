@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from mobros.types.mobros_global_data import GlobalData
+from mobros.types.worker_pool import WorkerPool, get_available_cpus, get_cgroup_cpu_limit
+
+MISSING_PATH = "/nonexistent/cpu.max"
+
+
+def square(value):
+    return value * value
+
+
+def worker_pid(_):
+    return os.getpid()
+
+
+class TestCgroupCpuLimit(unittest.TestCase):
+    def _write(self, directory, name, content):
+        file_path = os.path.join(directory, name)
+        with open(file_path, "w", encoding="utf-8") as file_handler:
+            file_handler.write(content)
+        return file_path
+
+    def test_cgroup_v2_quota(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cpu_max = self._write(directory, "cpu.max", "150000 100000\n")
+            with mock.patch("mobros.types.worker_pool.CGROUP_V2_CPU_MAX_PATH", cpu_max):
+                self.assertEqual(get_cgroup_cpu_limit(), 2)
+
+    def test_cgroup_v2_unlimited(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cpu_max = self._write(directory, "cpu.max", "max 100000\n")
+            with mock.patch("mobros.types.worker_pool.CGROUP_V2_CPU_MAX_PATH", cpu_max):
+                self.assertIsNone(get_cgroup_cpu_limit())
+
+    def test_cgroup_v1_quota(self):
+        with tempfile.TemporaryDirectory() as directory:
+            quota = self._write(directory, "cpu.cfs_quota_us", "200000\n")
+            period = self._write(directory, "cpu.cfs_period_us", "100000\n")
+            with mock.patch("mobros.types.worker_pool.CGROUP_V2_CPU_MAX_PATH", MISSING_PATH), mock.patch(
+                "mobros.types.worker_pool.CGROUP_V1_CPU_QUOTA_PATH", quota
+            ), mock.patch("mobros.types.worker_pool.CGROUP_V1_CPU_PERIOD_PATH", period):
+                self.assertEqual(get_cgroup_cpu_limit(), 2)
+
+    @mock.patch("mobros.types.worker_pool.get_cgroup_cpu_limit", return_value=2)
+    @mock.patch("mobros.types.worker_pool.sched_getaffinity", return_value=set(range(64)))
+    def test_available_cpus_bounded_by_quota(self, mock_affinity, mock_cgroup_limit):
+        self.assertEqual(get_available_cpus(), 2)
+
+
+class TestWorkerPool(unittest.TestCase):
+    def tearDown(self):
+        WorkerPool().stop()
+        GlobalData().set_worker_jobs(None)
+
+    def test_small_batch_runs_in_process(self):
+        GlobalData().set_worker_jobs(4)
+        self.assertListEqual(WorkerPool().map(worker_pid, range(3)), [os.getpid()] * 3)
+
+    def test_single_job_runs_in_process(self):
+        GlobalData().set_worker_jobs(1)
+        self.assertListEqual(WorkerPool().map(worker_pid, range(64)), [os.getpid()] * 64)
+
+    def test_persistent_pool_is_reused(self):
+        GlobalData().set_worker_jobs(2)
+        WorkerPool().start()
+
+        self.assertListEqual(WorkerPool().map(square, range(64)), [value * value for value in range(64)])
+        first_workers = set(WorkerPool().map(worker_pid, range(64)))
+        second_workers = set(WorkerPool().map(worker_pid, range(64)))
+
+        self.assertNotIn(os.getpid(), first_workers)
+        # either map may run on a single worker, but no worker is spawned past the two of the pool
+        self.assertLessEqual(len(first_workers | second_workers), 2)
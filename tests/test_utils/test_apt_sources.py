@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+from mobros.utils.apt_sources import filter_source_entries, read_source_entries
+
+ONE_LINE_SOURCES = """
+# ros repository
+deb [arch=amd64 signed-by=/usr/share/keyrings/ros.gpg] http://packages.ros.org/ros/ubuntu focal main
+deb https://artifacts.cloud.mov.ai/repository/ppa-main main main # internal
+deb
+deb [arch=amd64 http://unclosed.example.com/ubuntu focal main
+deb http://nosuite.example.com/ubuntu
+"""
+
+DEB822_SOURCES = """Types: deb
+# snapshot mirror
+URIs: http://archive.ubuntu.com/ubuntu
+Suites: focal focal-updates
+Components: main universe
+Signed-By: /usr/share/keyrings/ubuntu-archive-keyring.gpg
+
+Types: deb
+URIs: http://disabled.example.com/ubuntu
+Suites: focal
+Components: main
+Enabled: no
+"""
+
+
+class TestAptSources(unittest.TestCase):
+    def test_read_and_filter_source_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sources_list = os.path.join(tmp_dir, "sources.list")
+            sources_parts = os.path.join(tmp_dir, "sources.list.d")
+            os.mkdir(sources_parts)
+            with open(sources_list, "w", encoding="utf8") as stream:
+                stream.write(ONE_LINE_SOURCES)
+            with open(os.path.join(sources_parts, "ubuntu.sources"), "w", encoding="utf8") as stream:
+                stream.write(DEB822_SOURCES)
+
+            entries = read_source_entries(sources_list, sources_parts)
+
+        self.assertListEqual(
+            [uri for uri, _ in entries],
+            [
+                "http://packages.ros.org/ros/ubuntu",
+                "https://artifacts.cloud.mov.ai/repository/ppa-main",
+                "http://archive.ubuntu.com/ubuntu",
+                "http://archive.ubuntu.com/ubuntu",
+            ],
+        )
+        self.assertEqual(
+            entries[3][1],
+            "deb [signed-by=/usr/share/keyrings/ubuntu-archive-keyring.gpg] "
+            "http://archive.ubuntu.com/ubuntu focal-updates main universe",
+        )
+
+        selected = filter_source_entries(entries, ["https://artifacts.cloud.mov.ai/*", "http://packages.ros.org/ros/ubuntu/"])
+        self.assertListEqual(
+            selected,
+            [
+                "deb [arch=amd64 signed-by=/usr/share/keyrings/ros.gpg] http://packages.ros.org/ros/ubuntu focal main",
+                "deb https://artifacts.cloud.mov.ai/repository/ppa-main main main",
+            ],
+        )
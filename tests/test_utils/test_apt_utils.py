@@ -1,3 +1,4 @@
+import os
 
 import unittest
 import mock
@@ -12,6 +13,7 @@ from mobros.constants import OPERATION_TRANSLATION_TABLE
 INSTALLED_PKG_DEPENDENCIES_PY_1_0 = [MockPkgDependency("python3","=","1.0.0-0")]
 PKG_NAME= "my_app"
 PKG_VERSION = "0.0.0-1"
+DPKG_STATUS_FIXTURE = os.path.join(os.getcwd(), "tests", "resources", "dpkg", "status")
 
 INSTALLED_PKG_DEPENDENCIES_PY_GT_1_0 = [MockPkgDependency("python3",">","1.0.0-0")]
 INSTALLED_PKG_DEPENDENCIES_PY_GTE_1_1 = [MockPkgDependency("python3",">=","1.1.0-0")]
@@ -151,10 +153,11 @@ class TestAptUtils(unittest.TestCase):
         clean_version_list = apt_utils.get_package_available_versions("python2")
         self.assertListEqual(clean_version_list, ["0.0.0-2","0.0.0-1"])
     
-    @mock.patch("mobros.types.apt_cache_singleton.AptCache.__new__", return_value=MockAptInstalledCache(PKG_NAME, PKG_VERSION, [INSTALLED_PKG_DEPENDENCIES_PY_1_0]))
-    def test_get_package_installed_version(self, mock_apt_cache_new):
-        version= apt_utils.get_package_installed_version("python2")
+    @mock.patch("mobros.types.installed_state.DPKG_STATUS_PATH", DPKG_STATUS_FIXTURE)
+    def test_get_package_installed_version(self):
+        version= apt_utils.get_package_installed_version(PKG_NAME)
         self.assertEqual(version, PKG_VERSION)
+        self.assertIsNone(apt_utils.get_package_installed_version("python2"))
     
     def test_is_package_local_file(self):
         self.assertTrue(apt_utils.is_package_local_file("./ros.deb"))
@@ -162,19 +165,26 @@ class TestAptUtils(unittest.TestCase):
         self.assertFalse(apt_utils.is_package_local_file("/opt/noetic/ros.tar"))
         self.assertFalse(apt_utils.is_package_local_file("ros-noetic-movai-ros"))
 
-    @mock.patch("mobros.types.apt_cache_singleton.AptCache.__new__", return_value=MockAptInstalledCache(PKG_NAME, PKG_VERSION, [INSTALLED_PKG_DEPENDENCIES_PY_1_0]))
-    def test_is_package_already_installed(self, mock_apt_cache_new):
-        self.assertTrue(apt_utils.is_package_already_installed("python2"))
-        self.assertFalse(apt_utils.is_package_already_installed("python2", "0.0.1-1"))
-        self.assertTrue(apt_utils.is_package_already_installed("python2",PKG_VERSION))
+    @mock.patch("mobros.types.installed_state.DPKG_STATUS_PATH", DPKG_STATUS_FIXTURE)
+    def test_is_package_already_installed(self):
+        self.assertTrue(apt_utils.is_package_already_installed(PKG_NAME))
+        self.assertFalse(apt_utils.is_package_already_installed(PKG_NAME, "0.0.1-1"))
+        self.assertTrue(apt_utils.is_package_already_installed(PKG_NAME,PKG_VERSION))
+        self.assertFalse(apt_utils.is_package_already_installed("python2"))
+
+    @mock.patch("mobros.types.installed_state.DPKG_STATUS_PATH", DPKG_STATUS_FIXTURE)
+    def test_is_provided_by_installed_package(self):
+        self.assertTrue(apt_utils.is_provided_by_installed_package("python3-any"))
+        self.assertFalse(apt_utils.is_provided_by_installed_package("python3"))
+        self.assertFalse(apt_utils.is_provided_by_installed_package("python2"))
     
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-1"))
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-1"))
     def test_get_local_deb_info(self, mock_deb_Package_new):
         deb_name, deb_version, dependencies = apt_utils.get_local_deb_info("/opt/ros/noetic/ros.deb")
         self.assertEqual(deb_name, "ros-noetic-ros")
         self.assertEqual(deb_version, "1.1.1-1")
         
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-1"))
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-1"))
     def test_get_local_deb_name_version_not_found(self, mock_deb_Package_new):
         
         with self.assertRaises(SystemExit) as method_execution_exit:
@@ -182,7 +192,7 @@ class TestAptUtils(unittest.TestCase):
 
         self.assertEqual(method_execution_exit.exception.code, 1)
         
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-1"))
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-1"))
     def test_get_local_deb_name_version_not_found(self, mock_deb_Package_new):
         
         with self.assertRaises(SystemExit) as method_execution_exit:
@@ -191,37 +201,40 @@ class TestAptUtils(unittest.TestCase):
         self.assertEqual(method_execution_exit.exception.code, 1)
     
     @mock.patch("os.path.isfile", return_value= True)
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-0"))
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-0"))
     def test_get_local_deb_name_version(self, mock_isfile,mock_deb_Package_new):
         
         deb_name, deb_version = apt_utils.get_local_deb_name_version("/opt/ros/noetic/ros.deb")
         self.assertEqual(deb_name, "ros-noetic-ros")
         self.assertEqual(deb_version, "1.1.1-0")
         
+    @mock.patch("mobros.utils.apt_utils.get_installed_provider", return_value=None)
     @mock.patch("mobros.utils.apt_utils.dependency_has_candidate", return_value = True)
     @mock.patch("mobros.utils.apt_utils.get_providing_packages", return_value = [MockPkgDependency("sub_virtual1","", "",10),MockPkgDependency("sub_virtual2","", "",80)]) 
     @mock.patch("mobros.utils.apt_utils.is_virtual_package", return_value = True)
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-0"))
-    def test_check_from_virtual_a_solution_id_sort1(self, mock_deb_Package_new, mock_is_virtual, mock_get_prodividng_packages, mock_has_candidate):
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-0"))
+    def test_check_from_virtual_a_solution_id_sort1(self, mock_deb_Package_new, mock_is_virtual, mock_get_prodividng_packages, mock_has_candidate, mock_installed_provider):
         dependency = MockPkgDependency("virtual_ros", "", "")
         result = apt_utils.check_from_virtual_a_solution([dependency])
         self.assertEqual(result.name, "sub_virtual2")
         
+    @mock.patch("mobros.utils.apt_utils.get_installed_provider", return_value=None)
     @mock.patch("mobros.utils.apt_utils.dependency_has_candidate", return_value = True)
     @mock.patch("mobros.utils.apt_utils.get_providing_packages", return_value = [MockPkgDependency("sub_virtual1","", "",100),MockPkgDependency("sub_virtual2","", "",80)]) 
     @mock.patch("mobros.utils.apt_utils.is_virtual_package", return_value = True)
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-0"))
-    def test_check_from_virtual_a_solution_id_sort2(self, mock_deb_Package_new, mock_is_virtual, mock_get_prodividng_packages, mock_has_candidate):
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-0"))
+    def test_check_from_virtual_a_solution_id_sort2(self, mock_deb_Package_new, mock_is_virtual, mock_get_prodividng_packages, mock_has_candidate, mock_installed_provider):
         dependency = MockPkgDependency("virtual_ros", "", "")
         result = apt_utils.check_from_virtual_a_solution([dependency])
         self.assertEqual(result.name, "sub_virtual1")
 
+    @mock.patch("mobros.utils.apt_utils.get_installed_provider", return_value=None)
     @mock.patch("mobros.types.mobros_global_data.GlobalData.__new__", return_value= GlobalData())
     @mock.patch("mobros.utils.apt_utils.dependency_has_candidate", return_value = True)
     @mock.patch("mobros.utils.apt_utils.get_providing_packages", return_value = [MockPkgDependency("sub_virtual1","", "",100),MockPkgDependency("ros-movai","", "",80)]) 
     @mock.patch("mobros.utils.apt_utils.is_virtual_package", return_value = True)
-    @mock.patch("apt.debfile.DebPackage.__new__", return_value= DebPackage("ros-noetic-ros", "1.1.1-0"))
-    def test_check_from_virtual_a_solution_user_input(self, mock_deb_Package_new, mock_is_virtual, mock_get_prodividng_packages, mock_has_candidate, mock_global_data):
+    @mock.patch("mobros.utils.apt_utils.open_local_deb", return_value=DebPackage("ros-noetic-ros", "1.1.1-0"))
+    def test_check_from_virtual_a_solution_user_input(self, mock_deb_Package_new, mock_is_virtual, mock_get_prodividng_packages, mock_has_candidate, mock_global_data, mock_installed_provider):
         dependency = MockPkgDependency("virtual_ros", "", "")
         result = apt_utils.check_from_virtual_a_solution([dependency])
         self.assertEqual(result.name, "ros-movai")
@@ -0,0 +1,61 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from mobros.utils.cache_file import load_cache_file, update_files_fingerprint, write_cache_file
+
+
+def read_json(cache_path):
+    with open(cache_path, encoding="utf-8") as cache_file:
+        return json.load(cache_file)
+
+
+def files_fingerprint(tracked_files):
+    fingerprint = hashlib.sha1()
+    update_files_fingerprint(fingerprint, tracked_files)
+    return fingerprint.hexdigest()
+
+
+class TestCacheFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "cache", "test.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_write_load_cache_file(self):
+        self.assertTrue(write_cache_file(self.cache_path, lambda f: json.dump({"a": 1}, f), "[Test]", "test cache"))
+
+        self.assertListEqual(os.listdir(os.path.dirname(self.cache_path)), ["test.json"])
+        self.assertDictEqual(load_cache_file(self.cache_path, read_json, "[Test]", "test cache"), {"a": 1})
+
+    def test_invalid_cache_file_is_removed(self):
+        write_cache_file(self.cache_path, lambda f: f.write("{not json"), "[Test]", "test cache")
+
+        self.assertIsNone(load_cache_file(self.cache_path, read_json, "[Test]", "test cache"))
+        self.assertFalse(os.path.exists(self.cache_path))
+        self.assertIsNone(load_cache_file(self.cache_path, read_json, "[Test]", "test cache"))
+
+    @mock.patch("mobros.utils.cache_file.replace", side_effect=PermissionError)
+    def test_unwritable_cache_file(self, mock_replace):
+        self.assertFalse(write_cache_file(self.cache_path, lambda f: f.write("{}"), "[Test]", "test cache"))
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_files_fingerprint(self):
+        tracked_file = os.path.join(self.tmp_dir.name, "tracked")
+        missing_file = os.path.join(self.tmp_dir.name, "missing")
+        fingerprint = files_fingerprint([tracked_file, missing_file])
+
+        with open(tracked_file, "w", encoding="utf-8") as f:
+            f.write("tracked")
+        updated_fingerprint = files_fingerprint([tracked_file, missing_file])
+        self.assertNotEqual(fingerprint, updated_fingerprint)
+        self.assertEqual(updated_fingerprint, files_fingerprint([tracked_file, missing_file]))
+
+        os.utime(tracked_file, ns=(0, 0))
+        self.assertNotEqual(updated_fingerprint, files_fingerprint([tracked_file, missing_file]))
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import time
+import unittest
+
+import mock
+
+from mobros.constants import RosdepUpdateMode
+from mobros.types.mobros_global_data import GlobalData
+from mobros.utils.rosdep_cache import (
+    compute_rosdep_fingerprint,
+    get_os_codename,
+    get_rosdep_sources_age,
+    is_rosdep_update_required,
+    load_translation_cache,
+    store_translation_cache,
+)
+from mobros.utils.utilitary import translate_package_name, translate_package_names
+
+ROSDEP_BATCH_OUTPUT = [
+    "#ROSDEP[ompl]",
+    "#apt",
+    "ros-noetic-ompl",
+    "#ROSDEP[unknown_key]",
+]
+
+
+class TestRosdepCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path_patch = mock.patch("mobros.utils.rosdep_cache.MOBROS_CACHE_PATH", self.tmp_dir.name)
+        self.cache_path_patch.start()
+
+    def tearDown(self):
+        self.cache_path_patch.stop()
+        self.tmp_dir.cleanup()
+        GlobalData().set_rosdep_translation_cache(False)
+
+    def test_fingerprint_follows_rosdep_sources(self):
+        sources_cache = os.path.join(self.tmp_dir.name, "sources.cache")
+        sources_list = os.path.join(self.tmp_dir.name, "sources.list.d")
+        os.makedirs(sources_cache)
+        os.makedirs(sources_list)
+        with open(os.path.join(sources_list, "20-default.list"), "w", encoding="utf-8") as sources_file:
+            sources_file.write("yaml https://raw.githubusercontent.com/ros/rosdistro/master/rosdep/base.yaml\n")
+
+        fingerprint = compute_rosdep_fingerprint(sources_cache, [sources_list])
+        self.assertEqual(fingerprint, compute_rosdep_fingerprint(sources_cache, [sources_list]))
+
+        with open(os.path.join(sources_cache, "index"), "w", encoding="utf-8") as index_file:
+            index_file.write("#autogenerated by rosdep, do not edit\n")
+        updated_fingerprint = compute_rosdep_fingerprint(sources_cache, [sources_list])
+        self.assertNotEqual(fingerprint, updated_fingerprint)
+
+        with mock.patch.dict(os.environ, {"ROS_DISTRO": "other-distro"}):
+            self.assertNotEqual(updated_fingerprint, compute_rosdep_fingerprint(sources_cache, [sources_list]))
+
+    def test_rosdep_update_policy(self):
+        sources_cache = os.path.join(self.tmp_dir.name, "sources.cache")
+        self.assertIsNone(get_rosdep_sources_age(sources_cache))
+        self.assertTrue(is_rosdep_update_required(RosdepUpdateMode.AUTO, 60, sources_cache))
+        self.assertFalse(is_rosdep_update_required(RosdepUpdateMode.NEVER, 60, sources_cache))
+
+        os.makedirs(sources_cache)
+        index_path = os.path.join(sources_cache, "index")
+        with open(index_path, "w", encoding="utf-8") as index_file:
+            index_file.write("#autogenerated by rosdep, do not edit\n")
+        self.assertFalse(is_rosdep_update_required(RosdepUpdateMode.AUTO, 60, sources_cache))
+        self.assertTrue(is_rosdep_update_required(RosdepUpdateMode.ALWAYS, 60, sources_cache))
+
+        two_hours_ago = time.time() - 2 * 60 * 60
+        os.utime(index_path, (two_hours_ago, two_hours_ago))
+        self.assertGreater(get_rosdep_sources_age(sources_cache), 119)
+        self.assertTrue(is_rosdep_update_required(RosdepUpdateMode.AUTO, 60, sources_cache))
+
+    def test_os_codename(self):
+        os_release_path = os.path.join(self.tmp_dir.name, "os-release")
+        with open(os_release_path, "w", encoding="utf-8") as os_release_file:
+            os_release_file.write('NAME="Ubuntu"\nVERSION_CODENAME=focal\n')
+
+        self.assertEqual(get_os_codename(os_release_path), "focal")
+        self.assertEqual(get_os_codename(os.path.join(self.tmp_dir.name, "missing")), "")
+
+    def test_store_and_load(self):
+        store_translation_cache({"ompl": ["ros-noetic-ompl"]}, "old")
+        store_translation_cache({"ompl": ["ros-noetic-ompl"], "unknown_key": None}, "new")
+        store_translation_cache({"boost": ["libboost-dev"]}, "new")
+
+        self.assertDictEqual(load_translation_cache("old"), {})
+        self.assertDictEqual(
+            load_translation_cache("new"),
+            {"ompl": ["ros-noetic-ompl"], "unknown_key": None, "boost": ["libboost-dev"]},
+        )
+
+    def test_invalid_cache_is_discarded(self):
+        store_translation_cache({"ompl": ["ros-noetic-ompl"]}, "new")
+        with open(os.path.join(self.tmp_dir.name, os.listdir(self.tmp_dir.name)[0]), "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        self.assertDictEqual(load_translation_cache("new"), {})
+        self.assertListEqual(os.listdir(self.tmp_dir.name), [])
+
+    @mock.patch("mobros.utils.cache_file.remove", side_effect=PermissionError)
+    def test_undeletable_caches(self, mock_remove):
+        store_translation_cache({"ompl": ["ros-noetic-ompl"]}, "old")
+        with open(os.path.join(self.tmp_dir.name, os.listdir(self.tmp_dir.name)[0]), "w", encoding="utf-8") as f:
+            f.write("{not json")
+
+        self.assertDictEqual(load_translation_cache("old"), {})
+        store_translation_cache({"boost": ["libboost-dev"]}, "new")
+
+        self.assertEqual(mock_remove.call_count, 2)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 2)
+        self.assertDictEqual(load_translation_cache("new"), {"boost": ["libboost-dev"]})
+
+    @mock.patch("mobros.utils.rosdep_cache.compute_rosdep_fingerprint", return_value="fingerprint")
+    @mock.patch("mobros.utils.utilitary.execute_shell_command", return_value=ROSDEP_BATCH_OUTPUT)
+    def test_translations_are_cached(self, mock_execute, mock_fingerprint):
+        GlobalData().set_rosdep_translation_cache(True)
+
+        self.assertDictEqual(translate_package_names(["ompl", "unknown_key"]), {"ompl": ["ros-noetic-ompl"]})
+        self.assertDictEqual(translate_package_names(["ompl", "unknown_key"]), {"ompl": ["ros-noetic-ompl"]})
+        self.assertEqual(mock_execute.call_count, 1)
+
+        self.assertListEqual(translate_package_name("ompl"), ["ros-noetic-ompl"])
+        with self.assertRaises(SystemExit) as method_execution_exit:
+            translate_package_name("unknown_key")
+        self.assertEqual(method_execution_exit.exception.code, 1)
+        self.assertEqual(mock_execute.call_count, 1)
+
+        mock_fingerprint.return_value = "updated_fingerprint"
+        translate_package_names(["ompl"])
+        self.assertEqual(mock_execute.call_count, 2)
+
+    @mock.patch("mobros.utils.utilitary.execute_shell_command", return_value=ROSDEP_BATCH_OUTPUT)
+    def test_cache_disabled(self, mock_execute):
+        translate_package_names(["ompl", "unknown_key"])
+        translate_package_names(["ompl", "unknown_key"])
+
+        self.assertEqual(mock_execute.call_count, 2)
+        self.assertListEqual(os.listdir(self.tmp_dir.name), [])
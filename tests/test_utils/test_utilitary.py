@@ -1,11 +1,18 @@
+import tempfile
 import unittest
 from os import remove, geteuid
-from os.path import dirname, exists, realpath
+from os.path import dirname, exists, join, realpath
 
 import mock
 
 from mobros.constants import TEST_RESOURCE_SHELL_SCRIPT
-from mobros.utils.utilitary import execute_bash_script, execute_shell_command, is_blacklisted_origin
+from mobros.utils.utilitary import (
+    execute_bash_script,
+    execute_shell_command,
+    is_blacklisted_origin,
+    load_mobros_configuration,
+    translate_package_names,
+)
 from mobros.types.mobros_global_data import GlobalData
 
 dir_path = dirname(realpath(__file__))
@@ -65,3 +72,61 @@ class TestUtilitary(unittest.TestCase):
 
         self.assertFalse(is_blacklisted_origin("internet.moving.ai/repository/ppa-testing"))
         self.assertFalse(is_blacklisted_origin("internet.moving.ai/repository/production"))
+
+    @mock.patch(
+        "mobros.utils.utilitary.execute_shell_command",
+        return_value=[
+            "#ROSDEP[ompl]",
+            "#apt",
+            "ros-noetic-ompl",
+            "#ROSDEP[unknown_key]",
+            "#ROSDEP[boost]",
+            "#apt",
+            "libboost-all-dev libboost-dev",
+        ],
+    )
+    def test_translate_package_names(self, mock_execute):
+        translations = translate_package_names(["ompl", "unknown_key", "boost", "ompl"])
+
+        mock_execute.assert_called_once_with(
+            ["rosdep", "resolve", "ompl", "unknown_key", "boost"], stop_on_error=False, log_output=False
+        )
+        self.assertDictEqual(
+            translations, {"ompl": ["ros-noetic-ompl"], "boost": ["libboost-all-dev", "libboost-dev"]}
+        )
+
+    @mock.patch("mobros.utils.utilitary.execute_shell_command", return_value=["#apt", "ros-noetic-ompl"])
+    def test_translate_single_package_name(self, mock_execute):
+        self.assertDictEqual(translate_package_names(["ompl"]), {"ompl": ["ros-noetic-ompl"]})
+
+
+class TestMobrosConfiguration(unittest.TestCase):
+    def setUp(self):
+        GlobalData().set_conflict_solving_blacklist([])
+        GlobalData().set_apt_update_sources([])
+
+    def tearDown(self):
+        GlobalData().set_conflict_solving_blacklist([])
+        GlobalData().set_apt_update_sources([])
+
+    def load_configuration(self, content):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_path = join(tmp_dir, "config")
+            with open(config_path, "w", encoding="utf-8") as config_file:
+                config_file.write(content)
+            with mock.patch("mobros.utils.utilitary.MOBROS_CONFIG_PATH", config_path):
+                load_mobros_configuration()
+
+    def test_apt_update_only_configuration(self):
+        self.load_configuration("[apt-update]\nsources=https://artifacts.cloud.mov.ai/*, http://packages.ros.org/*\n")
+
+        self.assertListEqual(
+            GlobalData().get_apt_update_sources(), ["https://artifacts.cloud.mov.ai/*", "http://packages.ros.org/*"]
+        )
+        self.assertListEqual(GlobalData().get_conflict_solving_blacklist(), [])
+
+    def test_conflict_solving_configuration(self):
+        self.load_configuration("[conflict-solving]\nblacklistSource=ppa-main,ppa-dev\n")
+
+        self.assertListEqual(GlobalData().get_conflict_solving_blacklist(), ["ppa-main", "ppa-dev"])
+        self.assertListEqual(GlobalData().get_apt_update_sources(), [])
@@ -0,0 +1,43 @@
+import unittest
+
+from pydpkg import Dpkg
+
+from mobros.utils.version_compare import (
+    compare_versions,
+    compare_versions_by_key,
+    sort_versions,
+    version_key,
+)
+
+VERSION_PAIRS = [
+    ("1.0.0-1", "1.0.0-1", 0),
+    ("1.0", "1.0-0", 0),
+    ("0:1.0.0-1", "1.0.0-1", 0),
+    ("1.0.0-10", "1.0.0-9", 1),
+    ("1.10.0-1", "1.9.0-1", 1),
+    ("1:0.1.0-1", "9.9.9-9", 1),
+    ("1.0~rc1-1", "1.0-1", -1),
+    ("1.0~rc1-1", "1.0~-1", 1),
+    ("1.0.0-1", "1.0.0-1ubuntu1", -1),
+    ("1.0a-1", "1.0+-1", -1),
+    ("1.0-1~20.04", "1.0-1", -1),
+    ("2.0.0-0", "2.0.0", 0),
+    ("0~5", "0", -1),
+]
+
+
+class TestVersionCompare(unittest.TestCase):
+    def test_compare_versions(self):
+        for version_a, version_b, expected in VERSION_PAIRS:
+            self.assertEqual(compare_versions_by_key(version_a, version_b), expected, version_a + " vs " + version_b)
+            self.assertEqual(compare_versions_by_key(version_b, version_a), -expected, version_b + " vs " + version_a)
+            self.assertEqual(compare_versions(version_a, version_b), expected, version_a + " vs " + version_b)
+            self.assertEqual(Dpkg.compare_versions(version_a, version_b), expected, version_a + " vs " + version_b)
+
+    def test_version_key_cached(self):
+        self.assertIs(version_key("3.2.1-0"), version_key("3.2.1-0"))
+
+    def test_sort_versions(self):
+        versions = ["1.0-1", "1:0.1-1", "1.0~rc1-1", "1.10-1", "1.9-1"]
+        sort_versions(versions, reverse=True)
+        self.assertListEqual(versions, ["1:0.1-1", "1.10-1", "1.9-1", "1.0-1", "1.0~rc1-1"])